@@ -0,0 +1,127 @@
+"""Measure per-event overhead of the Responses stream adapter.
+
+Normalizes a recorded stream (JSON lines of raw Responses events, e.g. captured
+with ``--record``) or, by default, a synthetic 50,000-event stream shaped like
+one: mostly text deltas, with reasoning, tool-call argument deltas and
+lifecycle events the adapter ignores. Events are fed both as dicts and as
+attribute objects, the shape SDK clients yield.
+
+Run from the repository root: python -m benchmarks.bench_adapter_events [--events N] [--stream PATH] [--record PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+from streamlit_ai_elements.chat import adapters
+from streamlit_ai_elements.chat.adapters import ResponsesStreamAdapter, StreamingAdapterRequest
+from streamlit_ai_elements.chat.types import ChatBackendConfig, make_event
+
+
+def synthetic_stream(count: int) -> list[dict[str, Any]]:
+    events: list[dict[str, Any]] = [{"type": "response.created", "response": {"id": "resp_bench"}}]
+    call = 0
+    while len(events) < count:
+        index = len(events)
+        if index % 500 == 0:
+            call += 1
+            events.append(
+                {
+                    "type": "response.output_item.added",
+                    "output_index": call,
+                    "item": {"type": "function_call", "id": f"fc_{call}", "call_id": f"call_{call}", "name": "sandbox"},
+                }
+            )
+        elif index % 500 < 40:
+            events.append({"type": "response.function_call_arguments.delta", "item_id": f"fc_{call}", "output_index": call, "delta": '"x", '})
+        elif index % 500 == 40:
+            events.append({"type": "response.function_call_arguments.done", "item_id": f"fc_{call}", "output_index": call, "item": {}})
+        elif index % 10 == 0:
+            events.append({"type": "response.reasoning_summary_text.delta", "delta": f"step {index} "})
+        elif index % 97 == 0:
+            events.append({"type": "response.in_progress"})
+        else:
+            events.append({"type": "response.output_text.delta", "delta": f"tok{index % 97:02d} "})
+    return events[:count]
+
+
+def as_sdk_object(value: Any) -> Any:
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: as_sdk_object(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [as_sdk_object(item) for item in value]
+    return value
+
+
+class _RecordedResponses:
+    def __init__(self, events: list[Any]) -> None:
+        self._events = events
+
+    def create(self, **kwargs: Any) -> Any:
+        return iter(self._events)
+
+
+def bench_adapter(events: list[Any]) -> tuple[float, int]:
+    client = SimpleNamespace(responses=_RecordedResponses(events))
+    request = StreamingAdapterRequest(config=ChatBackendConfig(model="bench"), instructions="", messages=[])
+    started = time.perf_counter()
+    emitted = sum(1 for _ in ResponsesStreamAdapter().stream(client, request))
+    return time.perf_counter() - started, emitted
+
+
+def bench_normalization(events: list[Any]) -> float:
+    """Dispatch and field access only: ``make_event`` is swapped for a bare dict so event ids do not dominate."""
+
+    def bare_event(event_type: str, **payload: Any) -> dict[str, Any]:
+        return {"type": event_type, **payload}
+
+    with patch.object(adapters, "make_event", bare_event):
+        elapsed, _ = bench_adapter(events)
+    return elapsed
+
+
+def bench_make_event(events: list[Any]) -> float:
+    """Floor: building one timeline event per raw event, with no field access or dispatch."""
+
+    started = time.perf_counter()
+    for _ in events:
+        make_event("text_delta", delta="tok", backend_response_id="resp_bench")
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--stream", help="JSON lines file of recorded raw events")
+    parser.add_argument("--record", help="write the synthetic stream to this JSON lines file and exit")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.stream:
+        with open(args.stream, encoding="utf-8") as handle:
+            events = [json.loads(line) for line in handle if line.strip()]
+    else:
+        events = synthetic_stream(args.events)
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(event) + "\n" for event in events)
+        return
+
+    objects = [as_sdk_object(event) for event in events]
+    print(f"{len(events)} raw events (best of {args.repeat})")
+    for label, stream in (("dict events", events), ("SDK objects", objects)):
+        elapsed, emitted = min(bench_adapter(stream) for _ in range(args.repeat))
+        print(f"  {label:<12} {elapsed * 1000:8.1f} ms  {elapsed / len(stream) * 1e6:6.2f} us/event  ({emitted} emitted)")
+        elapsed = min(bench_normalization(stream) for _ in range(args.repeat))
+        print(f"    normalize  {elapsed * 1000:8.1f} ms  {elapsed / len(stream) * 1e6:6.2f} us/event  (without make_event)")
+    floor = min(bench_make_event(events) for _ in range(args.repeat))
+    print(f"  make_event   {floor * 1000:8.1f} ms  {floor / len(events) * 1e6:6.2f} us/event  (floor)")
+
+
+if __name__ == "__main__":
+    main()
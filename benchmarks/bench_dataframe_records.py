@@ -0,0 +1,72 @@
+"""Compare the to_json/json.loads round-trip with direct column-wise records.
+
+Run from the repository root: python -m benchmarks.bench_dataframe_records [--rows N] [--columns N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from streamlit_ai_elements.runtime_resources import dataframe_records
+
+
+def make_frame(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    data: dict[str, object] = {}
+    for index in range(columns):
+        kind = index % 5
+        if kind == 0:
+            values = rng.normal(size=rows)
+            values[::17] = np.nan
+            data[f"float_{index}"] = values
+        elif kind == 1:
+            data[f"int_{index}"] = rng.integers(0, 1_000_000, size=rows)
+        elif kind == 2:
+            data[f"text_{index}"] = [f"label-{value}" for value in rng.integers(0, 500, size=rows)]
+        elif kind == 3:
+            data[f"day_{index}"] = pd.date_range("2020-01-01", periods=rows, freq="h")
+        else:
+            data[f"flag_{index}"] = rng.integers(0, 2, size=rows).astype(bool)
+    return pd.DataFrame(data)
+
+
+def bench_json_round_trip(df: pd.DataFrame, preview_rows: int) -> float:
+    """The previous materialization: two ``to_json`` calls parsed back with ``json.loads``."""
+
+    started = time.perf_counter()
+    rows = json.loads(df.head(len(df)).to_json(orient="records", date_format="iso"))
+    preview = json.loads(df.head(preview_rows).to_json(orient="records", date_format="iso"))
+    assert len(rows) == len(df) and len(preview) == preview_rows
+    return time.perf_counter() - started
+
+
+def bench_column_records(df: pd.DataFrame, preview_rows: int) -> float:
+    started = time.perf_counter()
+    records = dataframe_records(df)
+    rows, preview = records, records[:preview_rows]
+    assert len(rows) == len(df) and len(preview) == preview_rows
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.columns)
+    round_trip = min(bench_json_round_trip(df, 5) for _ in range(args.repeat))
+    column_records = min(bench_column_records(df, 5) for _ in range(args.repeat))
+    print(f"{args.rows}x{args.columns} frame, best of {args.repeat}")
+    print(f"  to_json + json.loads   {round_trip * 1000:9.1f} ms")
+    print(f"  column-wise records    {column_records * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
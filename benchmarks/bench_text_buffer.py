@@ -0,0 +1,64 @@
+"""Compare str concatenation with TextBuffer for long streamed turns.
+
+Run from the repository root: python -m benchmarks.bench_text_buffer [--deltas N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from streamlit_ai_elements.chat.types import ChatMessage, append_event, create_session_state, make_event
+
+
+class _StrMessage:
+    """Stand-in for the previous ``ChatMessage`` with plain ``str`` fields."""
+
+    def __init__(self) -> None:
+        self.content = ""
+        self.reasoning = ""
+
+
+def bench_str_attribute(deltas: list[str]) -> float:
+    message = _StrMessage()
+    started = time.perf_counter()
+    for delta in deltas:
+        message.reasoning += delta
+    assert len(message.reasoning) == sum(map(len, deltas))
+    return time.perf_counter() - started
+
+
+def bench_text_buffer(deltas: list[str]) -> float:
+    message = ChatMessage(id="msg_bench", role="assistant")
+    started = time.perf_counter()
+    for delta in deltas:
+        message.append_reasoning(delta)
+    assert len(message.reasoning) == sum(map(len, deltas))
+    return time.perf_counter() - started
+
+
+def bench_session_reducer(deltas: list[str]) -> float:
+    session = create_session_state()
+    append_event(session, make_event("message_started", message_id="msg_bench", role="assistant"))
+    events = [make_event("reasoning_delta", message_id="msg_bench", delta=delta) for delta in deltas]
+    started = time.perf_counter()
+    for event in events:
+        append_event(session, event)
+    assert len(session.messages[0].reasoning) == sum(map(len, deltas))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--deltas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    deltas = [f"tok{index % 97:02d} " for index in range(args.deltas)]
+    print(f"{args.deltas} reasoning deltas")
+    print(f"  str attribute +=      {bench_str_attribute(deltas) * 1000:9.1f} ms")
+    print(f"  append_reasoning      {bench_text_buffer(deltas) * 1000:9.1f} ms")
+    print(f"  append_event reducer  {bench_session_reducer(deltas) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
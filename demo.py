@@ -24,22 +24,23 @@ except ImportError:
 st.set_page_config(page_title="AI Elements Chat", layout="centered")
 
 
-def build_demo_resources(uploaded_file) -> tuple[dict[str, ai.RuntimeResource], pd.DataFrame | None]:
+def build_demo_resources(uploaded_file) -> dict[str, ai.RuntimeResource]:
     if uploaded_file is None:
-        return {}, None
-
-    uploaded_file.seek(0)
-    dataframe = pd.read_csv(uploaded_file)
-    return (
-        ai.resources(
-            dataset=ai.resource.dataframe(
-                dataframe,
-                description=f"User-uploaded CSV file: {uploaded_file.name}",
-                max_rows=1000,
-                sample_rows=5,
-            )
-        ),
-        dataframe,
+        return {}
+
+    def read_upload() -> pd.DataFrame:
+        uploaded_file.seek(0)
+        return pd.read_csv(uploaded_file)
+
+    # Parsed once per upload instead of on every rerun.
+    return ai.resources(
+        dataset=ai.resource.lazy_dataframe(
+            read_upload,
+            key=("upload", uploaded_file.file_id),
+            description=f"User-uploaded CSV file: {uploaded_file.name}",
+            max_rows=1000,
+            sample_rows=5,
+        )
     )
 
 
@@ -65,10 +66,11 @@ with st.sidebar:
     st.divider()
     uploaded_csv = st.file_uploader("Upload CSV Data", type=["csv"])
 
-resources, uploaded_df = build_demo_resources(uploaded_csv)
+resources = build_demo_resources(uploaded_csv)
 
 with st.sidebar:
-    if uploaded_df is not None:
+    if resources:
+        uploaded_df = resources["dataset"].payload.load()
         st.caption("Available to the assistant as runtime resource `dataset`.")
         st.caption(f"{len(uploaded_df):,} rows x {len(uploaded_df.columns)} columns")
         with st.expander("Preview Data", expanded=False):
@@ -2,12 +2,16 @@ import * as echarts from "echarts";
 
 import {
   cleanupRoot,
+  deliverRowPage,
   getRendererRoot,
   hash,
+  hydrateRuntime,
   renderError,
+  renderKey,
+  rowRequester,
   safeTimers,
 } from "@ai-elements/shared";
-import type { RendererCleanup, RendererComponent } from "@ai-elements/shared";
+import type { RendererCleanup, RendererComponent, RowPage } from "@ai-elements/shared";
 
 interface SandboxRendererData {
   js?: string;
@@ -17,6 +21,7 @@ interface SandboxRendererData {
   context?: Record<string, unknown>;
   resources?: Record<string, unknown>;
   libraries?: string[];
+  row_page?: RowPage;
 }
 
 const ERROR_STYLE =
@@ -35,7 +40,9 @@ export default function renderSandbox(
     return undefined;
   }
 
-  const dataHash = hash(JSON.stringify(data));
+  deliverRowPage(root, data.row_page);
+
+  const dataHash = hash(renderKey(data));
   if (root.dataset.h === dataHash) {
     return root._cleanup;
   }
@@ -48,15 +55,17 @@ export default function renderSandbox(
 
   const timers = safeTimers(root, gen);
   root.innerHTML = "";
+  const runtime = hydrateRuntime(data);
   const sandboxContext = {
     container: root,
     echarts,
     setStateValue,
     setTriggerValue,
-    data: data.data ?? {},
-    resources: data.resources ?? {},
-    resource: data.resource ?? null,
-    rows: data.rows ?? [],
+    requestRows: rowRequester(root, setTriggerValue),
+    data: runtime.data,
+    resources: runtime.resources,
+    resource: runtime.resource,
+    rows: runtime.rows,
     context: data.context ?? {},
     requestAnimationFrame: timers.requestAnimationFrame,
     setInterval: timers.setInterval,
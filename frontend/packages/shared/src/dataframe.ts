@@ -0,0 +1,238 @@
+/**
+ * Accessors for dataframe resources shipped in the columnar or Arrow
+ * frontend formats.
+ */
+
+export type TypedColumnDtype =
+  | "int8"
+  | "int16"
+  | "int32"
+  | "uint8"
+  | "uint16"
+  | "uint32"
+  | "float32"
+  | "float64";
+
+export interface EncodedTypedColumn {
+  dtype: TypedColumnDtype;
+  base64: string;
+}
+
+export type EncodedColumn = unknown[] | EncodedTypedColumn;
+export type ColumnValues = ArrayLike<unknown>;
+export type DataframeRow = Record<string, unknown>;
+
+export interface DataframePayload {
+  kind: "dataframe";
+  format?: "rows" | "columns" | "arrow";
+  columns?: { name: string; dtype: string }[];
+  row_count?: number;
+  rows?: DataframeRow[];
+  column_data?: Record<string, EncodedColumn>;
+  arrow_key?: string;
+  [key: string]: unknown;
+}
+
+/** The subset of an apache-arrow `Table` that the renderers rely on. */
+export interface ArrowTableLike {
+  schema: { fields: { name: string }[] };
+  numRows: number;
+  getChild(name: string): ArrowVectorLike | null;
+}
+
+interface ArrowVectorLike extends Iterable<unknown> {
+  nullCount: number;
+  toArray(): ArrayLike<unknown>;
+}
+
+export interface HydratedRuntime {
+  resources: Record<string, unknown>;
+  resource: unknown;
+  data: unknown;
+  rows: unknown[];
+}
+
+const TYPED_ARRAYS = {
+  int8: Int8Array,
+  int16: Int16Array,
+  int32: Int32Array,
+  uint8: Uint8Array,
+  uint16: Uint16Array,
+  uint32: Uint32Array,
+  float32: Float32Array,
+  float64: Float64Array,
+} as const;
+
+export function isArrowTable(value: unknown): value is ArrowTableLike {
+  return (
+    typeof value === "object" &&
+    value !== null &&
+    typeof (value as { getChild?: unknown }).getChild === "function" &&
+    typeof (value as { schema?: unknown }).schema === "object"
+  );
+}
+
+/**
+ * JSON for change detection. Arrow tables are skipped: their payloads carry
+ * an `arrow_version` that changes with the data.
+ */
+export function stringifyData(data: unknown): string {
+  return JSON.stringify(data, (_, value) => (isArrowTable(value) ? undefined : value));
+}
+
+/** Change-detection key for renderer data; row pages never cause a re-render. */
+export function renderKey(data: object): string {
+  return stringifyData({ ...data, row_page: undefined });
+}
+
+function isDataframePayload(value: unknown): value is DataframePayload {
+  return (
+    typeof value === "object" &&
+    value !== null &&
+    (value as { kind?: unknown }).kind === "dataframe"
+  );
+}
+
+/** Decode one column: typed-array columns become views over a decoded buffer. */
+export function decodeColumn(column: EncodedColumn): ColumnValues {
+  if (Array.isArray(column)) {
+    return column;
+  }
+  const binary = atob(column.base64);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i += 1) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return new TYPED_ARRAYS[column.dtype](bytes.buffer);
+}
+
+/**
+ * An array that builds its contents on first use, so `rows` stays free for
+ * renderers that only read the columns.
+ */
+export function lazyArray<T>(build: () => T[]): T[] {
+  const target: T[] = [];
+  let built = false;
+  const ensure = (): T[] => {
+    if (!built) {
+      built = true;
+      // Assign by index: spreading 100k+ items into push() overflows the stack.
+      const items = build();
+      target.length = items.length;
+      for (let index = 0; index < items.length; index++) {
+        target[index] = items[index];
+      }
+    }
+    return target;
+  };
+
+  return new Proxy(target, {
+    get: (_, property) => Reflect.get(ensure(), property),
+    has: (_, property) => Reflect.has(ensure(), property),
+    ownKeys: () => Reflect.ownKeys(ensure()),
+    getOwnPropertyDescriptor: (_, property) =>
+      Reflect.getOwnPropertyDescriptor(ensure(), property),
+  });
+}
+
+/** Columns of an Arrow table; typed arrays unless the column has nulls. */
+export function arrowColumnValues(table: ArrowTableLike): Record<string, ColumnValues> {
+  const columnValues: Record<string, ColumnValues> = {};
+  for (const field of table.schema.fields) {
+    const vector = table.getChild(field.name);
+    if (vector) {
+      columnValues[field.name] = vector.nullCount ? Array.from(vector) : vector.toArray();
+    }
+  }
+  return columnValues;
+}
+
+function payloadColumnValues(
+  payload: DataframePayload,
+  data: Record<string, unknown>,
+): Record<string, ColumnValues> | null {
+  if (payload.format === "columns" && payload.column_data) {
+    const columnValues: Record<string, ColumnValues> = {};
+    for (const [name, column] of Object.entries(payload.column_data)) {
+      columnValues[name] = decodeColumn(column);
+    }
+    return columnValues;
+  }
+  if (payload.format === "arrow" && payload.arrow_key) {
+    const table = data[payload.arrow_key];
+    return isArrowTable(table) ? arrowColumnValues(table) : null;
+  }
+  return null;
+}
+
+/**
+ * Give a columnar or Arrow dataframe payload the same shape as a row payload.
+ *
+ * `data` is the component data, which holds the Arrow tables that payloads
+ * reference through `arrow_key`. Adds `columnValues` (columns by name,
+ * typed arrays for numeric columns) and a lazily built `rows` array in which
+ * non-finite numbers are `null`, as in the row format. Row payloads are
+ * returned unchanged.
+ */
+export function hydrateDataframe(
+  payload: DataframePayload,
+  data: Record<string, unknown> = {},
+): DataframePayload {
+  const columnValues = payloadColumnValues(payload, data);
+  if (!columnValues) {
+    return payload;
+  }
+
+  const names = Object.keys(columnValues);
+  const length = names.length ? columnValues[names[0]].length : 0;
+
+  const rows = lazyArray<DataframeRow>(() => {
+    const built: DataframeRow[] = new Array(length);
+    for (let index = 0; index < length; index += 1) {
+      const row: DataframeRow = {};
+      for (const name of names) {
+        const value = columnValues[name][index];
+        row[name] = typeof value === "number" && !Number.isFinite(value) ? null : value;
+      }
+      built[index] = row;
+    }
+    return built;
+  });
+
+  return { ...payload, columnValues, rows };
+}
+
+/** Hydrate any value that may be a dataframe payload. */
+export function hydrateResource<T>(value: T, data: Record<string, unknown> = {}): T {
+  return isDataframePayload(value) ? (hydrateDataframe(value, data) as T) : value;
+}
+
+/** Hydrate every dataframe payload in a resources mapping. */
+export function hydrateResources(
+  resources: Record<string, unknown>,
+  data: Record<string, unknown> = {},
+): Record<string, unknown> {
+  const hydrated: Record<string, unknown> = {};
+  for (const [name, value] of Object.entries(resources)) {
+    hydrated[name] = hydrateResource(value, data);
+  }
+  return hydrated;
+}
+
+/** Hydrate the `resources` / `resource` / `data` / `rows` runtime of a JS renderer. */
+export function hydrateRuntime(data: {
+  resources?: Record<string, unknown>;
+  resource?: unknown;
+  data?: unknown;
+  rows?: unknown[];
+}): HydratedRuntime {
+  const componentData = data as Record<string, unknown>;
+  const resource = hydrateResource(data.resource ?? null, componentData);
+  const resourceRows = (resource as { rows?: unknown } | null)?.rows;
+  return {
+    resources: hydrateResources(data.resources ?? {}, componentData),
+    resource,
+    data: hydrateResource(data.data ?? {}, componentData),
+    rows: data.rows?.length ? data.rows : Array.isArray(resourceRows) ? resourceRows : [],
+  };
+}
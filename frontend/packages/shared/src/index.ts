@@ -2,6 +2,9 @@
  * Shared utilities for Streamlit AI Elements renderers.
  */
 
+export * from "./dataframe";
+export * from "./paging";
+
 export type RendererCleanup = () => void;
 export type RendererCallback<TArgs extends unknown[] = []> = (...args: TArgs) => void;
 
@@ -0,0 +1,83 @@
+/**
+ * `requestRows` for JS renderers: asks Python for a page of a dataframe
+ * resource through a `row_request` trigger and resolves when the page comes
+ * back as `data.row_page` on the next render.
+ */
+
+export interface RowFilter {
+  column: string;
+  op?: "==" | "!=" | "<" | "<=" | ">" | ">=" | "in" | "not in" | "contains" | "startswith" | "isnull" | "notnull";
+  value?: unknown;
+}
+
+export interface RowRequestOptions {
+  offset?: number;
+  limit?: number;
+  columns?: string[];
+  filters?: RowFilter[];
+  sort?: string | { column: string; descending?: boolean }[];
+}
+
+export interface RowPage {
+  id: number;
+  resource: string;
+  offset?: number;
+  limit?: number;
+  total_rows?: number;
+  columns?: string[];
+  rows?: Record<string, unknown>[];
+  error?: string;
+}
+
+interface PendingRequest {
+  resolve: (page: RowPage) => void;
+  reject: (error: Error) => void;
+}
+
+export interface PagingRoot extends HTMLElement {
+  _rowRequests?: Map<number, PendingRequest>;
+  _rowRequestId?: number;
+}
+
+export type RequestRows = (resource: string, options?: RowRequestOptions) => Promise<RowPage>;
+
+export function rowRequester(
+  root: PagingRoot,
+  setTriggerValue: ((...args: unknown[]) => void) | undefined,
+): RequestRows {
+  return (resource, options = {}) =>
+    new Promise<RowPage>((resolve, reject) => {
+      if (typeof setTriggerValue !== "function") {
+        reject(new Error("Row paging is not available here."));
+        return;
+      }
+      const pending = (root._rowRequests ??= new Map());
+      const id = (root._rowRequestId = (root._rowRequestId ?? 0) + 1);
+      pending.set(id, { resolve, reject });
+      setTriggerValue("row_request", { ...options, id, resource });
+    });
+}
+
+/**
+ * Settle the request `page` answers. Older requests are rejected: Streamlit
+ * keeps only the latest trigger value, so they will not be answered.
+ */
+export function deliverRowPage(root: PagingRoot, page: RowPage | null | undefined): void {
+  const pending = root._rowRequests;
+  if (!page || !pending) {
+    return;
+  }
+  for (const [id, request] of pending) {
+    if (id > page.id) {
+      continue;
+    }
+    pending.delete(id);
+    if (id < page.id) {
+      request.reject(new Error("Row request superseded by a newer one."));
+    } else if (page.error) {
+      request.reject(new Error(page.error));
+    } else {
+      request.resolve(page);
+    }
+  }
+}
@@ -9,24 +9,43 @@ Rendering modes built on Streamlit Component V2:
 """
 
 import streamlit as st
+import hashlib as _hashlib
 import json as _json
 from pathlib import Path as _Path
+from typing import Any as _Any, Mapping as _Mapping
 
 from .runtime_resources import (
+    LazyDataFrame,
+    PayloadCacheInfo,
     RuntimeResource,
     build_javascript_runtime as _build_javascript_runtime,
+    clear_payload_cache,
     inject_vega_lite_resource_data as _inject_vega_lite_resource_data,
+    lookup_resource as _lookup_resource,
+    payload_cache_info,
     resolve_frontend_resources,
     resource,
     resources,
+    set_payload_cache_limit,
 )
+from .row_paging import ROW_REQUEST_EVENT as _ROW_REQUEST_EVENT, page_resource_rows as _page_resource_rows
+from .sql_resources import SQLQueryError, SQLQueryResult, run_sql_query
+from .vega_lite_data import prepare_vega_lite_data as _prepare_vega_lite_data
 
 __version__ = "0.1.0"
 __all__ = [
     "RuntimeResource",
+    "LazyDataFrame",
     "resource",
     "resources",
     "resolve_frontend_resources",
+    "PayloadCacheInfo",
+    "payload_cache_info",
+    "clear_payload_cache",
+    "set_payload_cache_limit",
+    "SQLQueryError",
+    "SQLQueryResult",
+    "run_sql_query",
     "js_raw",
     "vega_lite",
     "sandbox",
@@ -35,9 +54,15 @@ __all__ = [
     "AssistantChunk",
     "ChatBackendConfig",
     "ChatMessage",
+    "DeltaBatchingPolicy",
+    "SSEChatClient",
+    "SSEClientError",
     "StreamingSessionState",
     "ToolCallCard",
+    "ToolExecutionPolicy",
     "append_user_message",
+    "astream_assistant_turn",
+    "astream_chat_turn",
     "chat_container",
     "chat_message",
     "chat_reasoning",
@@ -77,6 +102,50 @@ def _ensure(name: str, **kwargs):
     return _registry[name]
 
 
+def _row_paging(
+    prefix: str,
+    key: str | None,
+    render_inputs: dict[str, _Any],
+    resources: dict[str, RuntimeResource] | None,
+    resource_names: list[str] | None,
+) -> tuple[str | None, dict[str, _Any], dict[str, _Any]]:
+    """Key, extra data and callbacks that let renderer code call ``requestRows``.
+
+    A ``row_request`` trigger is stashed in session state by the callback and
+    answered on the rerun, as ``data.row_page``. Paging needs a stable key,
+    since an unkeyed component would remount when its data changes, so one
+    is derived from ``render_inputs`` (every argument of the call other than
+    resource data) and the resource names when none is given. Calls that
+    differ in any of them get different keys, as unkeyed calls did.
+    """
+
+    pageable = False
+    for name in resource_names or []:
+        definition = _lookup_resource(resources, str(name))
+        pageable |= definition is not None and definition.kind == "dataframe" and definition.frontend_access == "full"
+    if not pageable:
+        return key, {}, {}
+
+    if key is None:
+        inputs = _json.dumps([render_inputs, list(resource_names or [])], sort_keys=True, default=repr)
+        digest = _hashlib.blake2b(inputs.encode(), digest_size=8).hexdigest()
+        key = f"{prefix}_{digest}"
+    pending_key = f"_ai_row_request:{key}"
+    extra: dict[str, _Any] = {}
+    request = st.session_state.get(pending_key)
+    if isinstance(request, _Mapping):
+        del st.session_state[pending_key]
+        extra["row_page"] = _page_resource_rows(resources, request, resource_names=resource_names)
+
+    def stash_row_request() -> None:
+        state = st.session_state.get(key)
+        request = state.get(_ROW_REQUEST_EVENT) if isinstance(state, _Mapping) else None
+        if isinstance(request, _Mapping):
+            st.session_state[pending_key] = dict(request)
+
+    return key, extra, {f"on_{_ROW_REQUEST_EVENT}_change": stash_row_request}
+
+
 def _normalize_excalidraw_shapes(shapes: list[dict]) -> list[dict]:
     normalized = []
     for shape in shapes:
@@ -160,6 +229,119 @@ function _safeTimers(root, gen) {
 }
 """
 
+_JS_DATAFRAMES = """
+const _TYPED_ARRAYS = {
+  int8: Int8Array, int16: Int16Array, int32: Int32Array,
+  uint8: Uint8Array, uint16: Uint16Array, uint32: Uint32Array,
+  float32: Float32Array, float64: Float64Array,
+};
+function _decodeColumn(column) {
+  if (Array.isArray(column)) return column;
+  const bin = atob(column.base64);
+  const bytes = new Uint8Array(bin.length);
+  for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+  return new _TYPED_ARRAYS[column.dtype](bytes.buffer);
+}
+function _lazyArray(build) {
+  const target = [];
+  let built = false;
+  const ensure = () => {
+    if (!built) {
+      built = true;
+      const items = build();
+      target.length = items.length;
+      for (let i = 0; i < items.length; i++) target[i] = items[i];
+    }
+    return target;
+  };
+  return new Proxy(target, {
+    get: (_, p) => Reflect.get(ensure(), p),
+    has: (_, p) => Reflect.has(ensure(), p),
+    ownKeys: () => Reflect.ownKeys(ensure()),
+    getOwnPropertyDescriptor: (_, p) => Reflect.getOwnPropertyDescriptor(ensure(), p),
+  });
+}
+function _isArrowTable(value) {
+  return !!value && typeof value === 'object' && typeof value.getChild === 'function' && typeof value.schema === 'object';
+}
+function _stringifyData(data) {
+  return JSON.stringify(data, (_, v) => (_isArrowTable(v) ? undefined : v));
+}
+function _columnValues(value, data) {
+  const columnValues = {};
+  if (value.format === 'columns' && value.column_data) {
+    for (const name of Object.keys(value.column_data)) columnValues[name] = _decodeColumn(value.column_data[name]);
+    return columnValues;
+  }
+  const table = value.format === 'arrow' ? data[value.arrow_key] : null;
+  if (!_isArrowTable(table)) return null;
+  for (const field of table.schema.fields) {
+    const vector = table.getChild(field.name);
+    if (vector) columnValues[field.name] = vector.nullCount ? Array.from(vector) : vector.toArray();
+  }
+  return columnValues;
+}
+function _hydrate(value, data) {
+  if (!value || value.kind !== 'dataframe') return value;
+  const columnValues = _columnValues(value, data);
+  if (!columnValues) return value;
+  const names = Object.keys(columnValues);
+  const length = names.length ? columnValues[names[0]].length : 0;
+  const rows = _lazyArray(() => {
+    const out = new Array(length);
+    for (let i = 0; i < length; i++) {
+      const row = {};
+      for (const name of names) {
+        const v = columnValues[name][i];
+        row[name] = typeof v === 'number' && !Number.isFinite(v) ? null : v;
+      }
+      out[i] = row;
+    }
+    return out;
+  });
+  return { ...value, columnValues, rows };
+}
+function _hydrateRuntime(data) {
+  const resources = {};
+  for (const name of Object.keys(data.resources || {})) resources[name] = _hydrate(data.resources[name], data);
+  const resource = _hydrate(data.resource ?? null, data);
+  const rows = data.rows && data.rows.length
+    ? data.rows
+    : (resource && Array.isArray(resource.rows) ? resource.rows : []);
+  return { resources, resource, data: _hydrate(data.data ?? {}, data), rows };
+}
+"""
+
+
+_JS_ROW_PAGING = """
+function _rowRequester(root, setTriggerValue) {
+  return (resource, options = {}) => new Promise((resolve, reject) => {
+    if (typeof setTriggerValue !== 'function') {
+      reject(new Error('Row paging is not available here.'));
+      return;
+    }
+    const pending = root._rowRequests || (root._rowRequests = new Map());
+    const id = (root._rowRequestId = (root._rowRequestId || 0) + 1);
+    pending.set(id, { resolve, reject });
+    setTriggerValue('row_request', { ...options, id, resource });
+  });
+}
+function _deliverRowPage(root, page) {
+  const pending = root._rowRequests;
+  if (!page || !pending) return;
+  for (const [id, request] of pending) {
+    if (id > page.id) continue;
+    pending.delete(id);
+    if (id < page.id) request.reject(new Error('Row request superseded by a newer one.'));
+    else if (page.error) request.reject(new Error(page.error));
+    else request.resolve(page);
+  }
+}
+function _renderKey(data) {
+  return _hash(_stringifyData({ ...data, row_page: undefined }));
+}
+"""
+
 
 # ===========================================================================
 # Mode 1 — JS Raw  (no vendor libs — always inline)
@@ -167,16 +349,21 @@ function _safeTimers(root, gen) {
 _RAW_JS = (
     _JS_HASH
     + _JS_SAFE_TIMERS
+    + _JS_DATAFRAMES
+    + _JS_ROW_PAGING
     + r"""
 export default function (component) {
-  const { data, parentElement } = component;
+  const { data, parentElement, setTriggerValue } = component;
   if (!data) return;
 
   const root = parentElement.querySelector('#_r');
   if (!root) return;
 
+  // Row pages answer pending requestRows() calls without a re-render
+  _deliverRowPage(root, data.row_page);
+
   // Skip re-render when data hasn't changed (preserves animations)
-  const dh = _hash(JSON.stringify(data));
+  const dh = _renderKey(data);
   if (root.dataset.h === dh) return root._cleanup;
   root.dataset.h = dh;
 
@@ -194,22 +381,24 @@ export default function (component) {
   // Execute user JS
   if (data.js) {
     try {
+      const runtime = _hydrateRuntime(data);
       const fn = new Function(
         'container',
         'resources', 'data', 'resource', 'rows', 'context',
-        'requestAnimationFrame', 'setInterval', 'setTimeout',
+        'requestAnimationFrame', 'setInterval', 'setTimeout', 'requestRows',
         data.js,
       );
       fn(
         root,
-        data.resources || {},
-        data.data ?? {},
-        data.resource ?? null,
-        data.rows || [],
+        runtime.resources,
+        runtime.data,
+        runtime.resource,
+        runtime.rows,
         data.context || {},
         timers.requestAnimationFrame,
         timers.setInterval,
         timers.setTimeout,
+        _rowRequester(root, setTriggerValue),
       );
     } catch (e) {
       root.insertAdjacentHTML(
@@ -246,16 +435,27 @@ def js_raw(
     - ``data`` — if exactly one dataframe resource is requested, that dataframe payload; otherwise a context/resource object
     - ``resource`` — the single requested resource payload when there is exactly one
     - ``rows`` — convenience alias for ``data.rows`` when the primary resource is a dataframe
+      (dataframes in the ``"columns"`` format also expose ``columnValues``, typed arrays for numeric columns)
     - ``context`` — explicit Python-side context payload
     - ``requestAnimationFrame`` / ``setInterval`` / ``setTimeout`` — safe timers
+    - ``requestRows(name, {offset, limit, columns, filters, sort})`` — a promise for
+      more rows of a requested dataframe resource, filtered and sliced in Python
     """
     runtime_resources = resolve_frontend_resources(resources, resource_names)
     runtime = _build_javascript_runtime(runtime_resources)
+    key, paging, callbacks = _row_paging(
+        "ai_js_raw",
+        key,
+        {"html": html, "css": css, "js": js, "height": height},
+        resources,
+        resource_names,
+    )
     renderer = _ensure("ai_js_raw", html='<div id="_r"></div>', js=_RAW_JS)
     return renderer(
-        data={"html": html, "css": css, "js": js, **runtime},
+        data={"html": html, "css": css, "js": js, **runtime, **paging},
         height=height,
         key=key,
+        **callbacks,
     )
 
 
@@ -379,16 +579,39 @@ def vega_lite(
     data_resource: str | None = None,
     resources: dict[str, RuntimeResource] | None = None,
     key: str | None = None,
+    preaggregate: bool = True,
+    downsample: str | None = "lttb",
+    max_points: int = 2000,
 ):
     """
     Render a Vega-Lite chart from a specification dict (or JSON string).
+
+    With a dataframe ``data_resource``, ``aggregate`` / ``timeUnit`` / ``bin``
+    encodings and transforms are evaluated in pandas over the whole frame and
+    only the aggregated rows are sent, at most ``max_points`` of them; dense
+    line and scatter series are downsampled to about ``max_points`` points
+    (``downsample="lttb"`` or ``"minmax"``, ``None`` to disable). Specs that need Vega-Lite itself, or
+    ``preaggregate=False``, get the first ``max_rows`` rows as before.
     """
     if isinstance(spec, str):
         spec = _json.loads(spec)
 
     selected_resource_names = [data_resource] if data_resource else resource_names
-    resolved_resources = resolve_frontend_resources(resources, selected_resource_names)
-    spec = _inject_vega_lite_resource_data(spec, resolved_resources, data_resource=data_resource)
+    prepared = None
+    if preaggregate:
+        prepared = _prepare_vega_lite_data(
+            spec,
+            resources,
+            selected_resource_names,
+            data_resource=data_resource,
+            downsample=downsample,
+            max_points=max_points,
+        )
+    if prepared is not None:
+        spec = prepared
+    else:
+        resolved_resources = resolve_frontend_resources(resources, selected_resource_names, frontend_format="rows")
+        spec = _inject_vega_lite_resource_data(spec, resolved_resources, data_resource=data_resource)
 
     # Prefer Streamlit's built-in Vega-Lite renderer for standard specs.
     # It is more reliable inside dynamic containers such as chat messages.
@@ -430,6 +653,8 @@ _SB_CDN_JS = (
     _JS_HASH
     + _JS_LOAD_SCRIPT
     + _JS_SAFE_TIMERS
+    + _JS_DATAFRAMES
+    + _JS_ROW_PAGING
     + r"""
 const CDN = {
   echarts: 'https://cdn.jsdelivr.net/npm/echarts@5/dist/echarts.min.js',
@@ -444,7 +669,9 @@ export default function (component) {
   const root = parentElement.querySelector('#_r');
   if (!root) return;
 
-  const dh = _hash(JSON.stringify(data));
+  _deliverRowPage(root, data.row_page);
+
+  const dh = _renderKey(data);
   if (root.dataset.h === dh) return root._cleanup;
   root.dataset.h = dh;
 
@@ -464,6 +691,7 @@ export default function (component) {
 
       root.innerHTML = '';
 
+      const runtime = _hydrateRuntime(data);
       const ctx = {
         container:             root,
         echarts:               window.echarts,
@@ -471,10 +699,11 @@ export default function (component) {
         THREE:                 window.THREE,
         setStateValue:         setStateValue,
         setTriggerValue:       setTriggerValue,
-        data:                  data.data || {},
-        resources:             data.resources || {},
-        resource:              data.resource || null,
-        rows:                  data.rows || [],
+        requestRows:           _rowRequester(root, setTriggerValue),
+        data:                  runtime.data,
+        resources:             runtime.resources,
+        resource:              runtime.resource,
+        rows:                  runtime.rows,
         context:               data.context || {},
         requestAnimationFrame: timers.requestAnimationFrame,
         setInterval:           timers.setInterval,
@@ -524,13 +753,23 @@ def sandbox(
     - ``data``                  — if exactly one dataframe resource is requested, that dataframe payload; otherwise a context/resource object
     - ``resource``              — the single requested resource payload when there is exactly one
     - ``rows``                  — convenience alias for ``data.rows`` when the primary resource is a dataframe
+      (dataframes in the ``"columns"`` format also expose ``columnValues``, typed arrays for numeric columns)
     - ``context``               — custom context dict from Python
     - ``requestAnimationFrame`` — auto-cancels on re-render
     - ``setInterval``           — auto-cancels on re-render
     - ``setTimeout``            — auto-cancels on re-render
+    - ``requestRows(name, o)``  — promise for a page of a requested dataframe resource
+      (``o``: ``offset``, ``limit``, ``columns``, ``filters``, ``sort``), sliced in Python
     """
     runtime_resources = resolve_frontend_resources(resources, resource_names)
     runtime = _build_javascript_runtime(runtime_resources, context=context or {})
+    key, paging, callbacks = _row_paging(
+        "ai_sandbox",
+        key,
+        {"js": js, "height": height, "libraries": libraries, "context": context},
+        resources,
+        resource_names,
+    )
     renderer = _ensure(
         "ai_sandbox",
         html=_SB_HTML,
@@ -541,9 +780,11 @@ def sandbox(
             "js": js,
             "libraries": libraries or ["echarts"],
             **runtime,
+            **paging,
         },
         height=height,
         key=key,
+        **callbacks,
     )
 
 
@@ -619,9 +860,15 @@ from .chat import (
     AssistantChunk,
     ChatBackendConfig,
     ChatMessage,
+    DeltaBatchingPolicy,
+    SSEChatClient,
+    SSEClientError,
     StreamingSessionState,
     ToolCallCard,
+    ToolExecutionPolicy,
     append_user_message,
+    astream_assistant_turn,
+    astream_chat_turn,
     chat_container,
     chat_message,
     chat_reasoning,
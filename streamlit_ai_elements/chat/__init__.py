@@ -1,6 +1,15 @@
 """Public Chat Kit API."""
 
-from .runtime import append_user_message, ensure_session_state, stream_assistant_turn, stream_chat_turn
+from .partial_json import IncrementalJSONParser
+from .runtime import (
+    append_user_message,
+    astream_assistant_turn,
+    astream_chat_turn,
+    ensure_session_state,
+    stream_assistant_turn,
+    stream_chat_turn,
+)
+from .sse_client import SSEChatClient, SSEClientError
 from .tools import (
     DEFAULT_HEIGHTS,
     PREBUILT_COMPONENT_HEIGHTS,
@@ -11,18 +20,24 @@ from .tools import (
     element_from_tool_call,
     execute_tool_call,
     parse_tool_arguments,
+    partial_element_from_tool_call,
     register_tool_executor,
     render_element,
+    tool_schema_hash,
 )
 from .types import (
     AssistantChunk,
     ChatBackendConfig,
     ChatEvent,
     ChatMessage,
+    DeltaBatchingPolicy,
     StreamingSessionState,
+    TextBuffer,
     ToolCallCard,
     ToolCallEventState,
+    ToolExecutionPolicy,
     append_event,
+    apply_event,
     create_session_state,
     make_event,
     replay_timeline,
@@ -43,14 +58,23 @@ __all__ = [
     "ChatBackendConfig",
     "ChatEvent",
     "ChatMessage",
+    "DeltaBatchingPolicy",
+    "IncrementalJSONParser",
+    "SSEChatClient",
+    "SSEClientError",
     "StreamingSessionState",
+    "TextBuffer",
     "ToolCallCard",
     "ToolCallEventState",
+    "ToolExecutionPolicy",
     "SYSTEM_PROMPT",
     "DEFAULT_HEIGHTS",
     "PREBUILT_COMPONENT_HEIGHTS",
     "append_event",
+    "apply_event",
     "append_user_message",
+    "astream_assistant_turn",
+    "astream_chat_turn",
     "build_chat_completions_tools",
     "build_responses_tools",
     "build_system_prompt",
@@ -65,11 +89,13 @@ __all__ = [
     "execute_tool_call",
     "make_event",
     "parse_tool_arguments",
+    "partial_element_from_tool_call",
     "register_tool_card_renderer",
     "register_tool_executor",
     "render_chat_message",
     "render_chat_session",
     "render_element",
+    "tool_schema_hash",
     "replay_timeline",
     "stream_assistant_turn",
     "stream_chat_turn",
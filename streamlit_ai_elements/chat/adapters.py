@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Iterator
+from functools import lru_cache
+import asyncio
+import inspect
+import time
+from typing import Any, AsyncIterator, Callable, Iterator
 
 from .tools import build_chat_completions_tools, build_responses_tools
-from .types import ChatBackendConfig, ChatEvent, make_event
+from .types import ChatBackendConfig, ChatEvent, DeltaBatchingPolicy, TextBuffer, make_event
+
+_FieldGetter = Callable[[Any, str, Any], Any]
 
 
 @dataclass(slots=True)
@@ -16,18 +22,20 @@ class StreamingAdapterRequest:
     messages: list[dict[str, Any]]
     tool_outputs: list[dict[str, Any]] = field(default_factory=list)
     previous_response_id: str | None = None
+    resources: dict[str, Any] | None = None
+    delta_batching: DeltaBatchingPolicy | None = None
 
 
 @dataclass(slots=True)
 class _TrackedToolCall:
     call_id: str
     name: str
-    arguments: str = ""
+    arguments: TextBuffer = field(default_factory=TextBuffer)
     raw_id: str | None = None
 
 
-class ResponsesStreamAdapter:
-    """Normalize Responses API SSE events into chat timeline events."""
+class _ResponsesEventNormalizer:
+    """Request building and event normalization shared by the Responses adapters."""
 
     def __init__(self) -> None:
         self.last_response_id: str | None = None
@@ -35,11 +43,11 @@ class ResponsesStreamAdapter:
         self._tool_calls_by_item_id: dict[str, _TrackedToolCall] = {}
         self._reasoning_done_ids: set[str] = set()
 
-    def stream(self, client: Any, request: StreamingAdapterRequest) -> Iterator[ChatEvent]:
+    def _request_kwargs(self, request: StreamingAdapterRequest) -> dict[str, Any]:
         kwargs: dict[str, Any] = {
             "model": request.config.model,
             "instructions": request.instructions,
-            "tools": build_responses_tools(),
+            "tools": build_responses_tools(request.resources),
             "stream": True,
         }
         if request.previous_response_id:
@@ -57,140 +65,183 @@ class ResponsesStreamAdapter:
         if request.config.max_output_tokens is not None:
             kwargs["max_output_tokens"] = request.config.max_output_tokens
         kwargs.update(request.config.extra_request_options)
+        return kwargs
 
-        stream = client.responses.create(**kwargs)
-        for raw_event in stream:
-            yield from self._normalize_event(raw_event)
-
-    def _normalize_event(self, raw_event: Any) -> Iterator[ChatEvent]:
-        event_type = _get_value(raw_event, "type")
-        if not event_type:
-            return
-
-        if event_type == "response.created":
-            self.last_response_id = _first_non_empty(
-                _get_value(raw_event, "response.id"),
-                _get_value(raw_event, "response_id"),
+    def _normalize_event(self, raw_event: Any) -> ChatEvent | None:
+        get = _field_getter(raw_event)
+        handler = self._EVENT_HANDLERS.get(get(raw_event, "type", None))
+        if handler is None:
+            return None
+        return handler(self, raw_event, get)
+
+    def _on_response_created(self, raw_event: Any, get: _FieldGetter) -> None:
+        self.last_response_id = _first_non_empty(_RESPONSE_ID(raw_event), get(raw_event, "response_id", None))
+
+    def _on_text_delta(self, raw_event: Any, get: _FieldGetter) -> ChatEvent:
+        return make_event(
+            "text_delta",
+            delta=get(raw_event, "delta", "") or "",
+            backend_response_id=self.last_response_id,
+        )
+
+    def _on_reasoning_delta(self, raw_event: Any, get: _FieldGetter) -> ChatEvent:
+        return make_event(
+            "reasoning_delta",
+            delta=get(raw_event, "delta", "") or "",
+            backend_response_id=self.last_response_id,
+        )
+
+    def _on_output_item_added(self, raw_event: Any, get: _FieldGetter) -> ChatEvent | None:
+        item = get(raw_event, "item", None) or {}
+        item_get = _field_getter(item)
+        if item_get(item, "type", None) != "function_call":
+            return None
+        tracked = _TrackedToolCall(
+            call_id=_first_non_empty(
+                item_get(item, "call_id", None),
+                item_get(item, "id", None),
+                f"call_{get(raw_event, 'output_index', 0)}",
+            ),
+            name=item_get(item, "name", "tool") or "tool",
+            arguments=TextBuffer(item_get(item, "arguments", "") or ""),
+            raw_id=item_get(item, "id", None),
+        )
+        output_index = int(get(raw_event, "output_index", 0) or 0)
+        self._tool_calls_by_index[output_index] = tracked
+        if tracked.raw_id:
+            self._tool_calls_by_item_id[tracked.raw_id] = tracked
+        return make_event(
+            "tool_call_started",
+            tool_call_id=tracked.call_id,
+            tool_name=tracked.name,
+            arguments=str(tracked.arguments),
+            backend_response_id=self.last_response_id,
+        )
+
+    def _on_arguments_delta(self, raw_event: Any, get: _FieldGetter) -> ChatEvent | None:
+        tracked = self._tracked_tool_call(raw_event, get)
+        if tracked is None:
+            return None
+        delta = get(raw_event, "delta", "") or ""
+        tracked.arguments += delta
+        return make_event(
+            "tool_call_delta",
+            tool_call_id=tracked.call_id,
+            tool_name=tracked.name,
+            delta=delta,
+            backend_response_id=self.last_response_id,
+        )
+
+    def _on_arguments_done(self, raw_event: Any, get: _FieldGetter) -> ChatEvent:
+        item = get(raw_event, "item", None) or {}
+        item_get = _field_getter(item)
+        tracked = self._tracked_tool_call(raw_event, get)
+        if tracked is None:
+            tracked = _TrackedToolCall(
+                call_id=_first_non_empty(item_get(item, "call_id", None), item_get(item, "id", None), "tool_call"),
+                name=item_get(item, "name", "tool") or "tool",
             )
-            return
+        final_arguments = item_get(item, "arguments", None) or str(tracked.arguments)
+        tracked.arguments = TextBuffer(final_arguments)
+        return make_event(
+            "tool_call_completed",
+            tool_call_id=tracked.call_id,
+            tool_name=tracked.name,
+            arguments=final_arguments,
+            backend_response_id=self.last_response_id,
+        )
+
+    def _on_output_item_done(self, raw_event: Any, get: _FieldGetter) -> ChatEvent | None:
+        item = get(raw_event, "item", None) or {}
+        item_get = _field_getter(item)
+        if item_get(item, "type", None) != "reasoning":
+            return None
+        item_id = item_get(item, "id", None)
+        if item_id in self._reasoning_done_ids:
+            return None
+        summary = _flatten_reasoning_summary(item)
+        if not summary:
+            return None
+        self._reasoning_done_ids.add(item_id)
+        return make_event(
+            "reasoning_delta",
+            delta=summary,
+            backend_response_id=self.last_response_id,
+        )
+
+    def _on_error(self, raw_event: Any, get: _FieldGetter) -> ChatEvent:
+        return make_event(
+            "message_error",
+            error=_extract_error_message(raw_event),
+            backend_response_id=self.last_response_id,
+        )
+
+    # One lookup per event instead of a chain of type comparisons; events
+    # without a handler are ignored.
+    _EVENT_HANDLERS: dict[str, Callable[[Any, Any, _FieldGetter], ChatEvent | None]] = {
+        "response.created": _on_response_created,
+        "response.output_text.delta": _on_text_delta,
+        "response.reasoning_summary_text.delta": _on_reasoning_delta,
+        "response.reasoning.delta": _on_reasoning_delta,
+        "response.output_item.added": _on_output_item_added,
+        "response.function_call_arguments.delta": _on_arguments_delta,
+        "response.function_call_arguments.done": _on_arguments_done,
+        "response.output_item.done": _on_output_item_done,
+        "response.failed": _on_error,
+        "error": _on_error,
+    }
+
+    def _tracked_tool_call(self, raw_event: Any, get: _FieldGetter) -> _TrackedToolCall | None:
+        item_id = get(raw_event, "item_id", None)
+        if item_id and item_id in self._tool_calls_by_item_id:
+            return self._tool_calls_by_item_id[item_id]
+        output_index = get(raw_event, "output_index", None)
+        if output_index is None:
+            return None
+        return self._tool_calls_by_index.get(int(output_index))
 
-        if event_type == "response.output_text.delta":
-            yield make_event(
-                "text_delta",
-                delta=_get_value(raw_event, "delta", "") or "",
-                backend_response_id=self.last_response_id,
-            )
-            return
 
-        if event_type in {"response.reasoning_summary_text.delta", "response.reasoning.delta"}:
-            yield make_event(
-                "reasoning_delta",
-                delta=_get_value(raw_event, "delta", "") or "",
-                backend_response_id=self.last_response_id,
-            )
-            return
+class ResponsesStreamAdapter(_ResponsesEventNormalizer):
+    """Normalize Responses API SSE events into chat timeline events."""
 
-        if event_type == "response.output_item.added":
-            item = _get_value(raw_event, "item") or {}
-            if _get_value(item, "type") == "function_call":
-                tracked = _TrackedToolCall(
-                    call_id=_first_non_empty(_get_value(item, "call_id"), _get_value(item, "id"), f"call_{_get_value(raw_event, 'output_index', 0)}"),
-                    name=_get_value(item, "name", "tool") or "tool",
-                    arguments=_get_value(item, "arguments", "") or "",
-                    raw_id=_get_value(item, "id"),
-                )
-                output_index = int(_get_value(raw_event, "output_index", 0) or 0)
-                self._tool_calls_by_index[output_index] = tracked
-                if tracked.raw_id:
-                    self._tool_calls_by_item_id[tracked.raw_id] = tracked
-                yield make_event(
-                    "tool_call_started",
-                    tool_call_id=tracked.call_id,
-                    tool_name=tracked.name,
-                    arguments=tracked.arguments,
-                    backend_response_id=self.last_response_id,
-                )
-            return
+    def stream(self, client: Any, request: StreamingAdapterRequest) -> Iterator[ChatEvent]:
+        return _batch_deltas(self._stream(client, request), request.delta_batching)
 
-        if event_type == "response.function_call_arguments.delta":
-            tracked = self._tracked_tool_call(raw_event)
-            if tracked is None:
-                return
-            delta = _get_value(raw_event, "delta", "") or ""
-            tracked.arguments += delta
-            yield make_event(
-                "tool_call_delta",
-                tool_call_id=tracked.call_id,
-                tool_name=tracked.name,
-                delta=delta,
-                backend_response_id=self.last_response_id,
-            )
-            return
+    def _stream(self, client: Any, request: StreamingAdapterRequest) -> Iterator[ChatEvent]:
+        stream = client.responses.create(**self._request_kwargs(request))
+        normalize = self._normalize_event
+        for raw_event in stream:
+            event = normalize(raw_event)
+            if event is not None:
+                yield event
 
-        if event_type == "response.function_call_arguments.done":
-            item = _get_value(raw_event, "item") or {}
-            tracked = self._tracked_tool_call(raw_event)
-            if tracked is None:
-                tracked = _TrackedToolCall(
-                    call_id=_first_non_empty(_get_value(item, "call_id"), _get_value(item, "id"), "tool_call"),
-                    name=_get_value(item, "name", "tool") or "tool",
-                )
-            tracked.arguments = _get_value(item, "arguments", tracked.arguments) or tracked.arguments
-            yield make_event(
-                "tool_call_completed",
-                tool_call_id=tracked.call_id,
-                tool_name=tracked.name,
-                arguments=tracked.arguments,
-                backend_response_id=self.last_response_id,
-            )
-            return
 
-        if event_type == "response.output_item.done":
-            item = _get_value(raw_event, "item") or {}
-            if _get_value(item, "type") != "reasoning":
-                return
-            item_id = _get_value(item, "id")
-            if item_id in self._reasoning_done_ids:
-                return
-            summary = _flatten_reasoning_summary(item)
-            if not summary:
-                return
-            self._reasoning_done_ids.add(item_id)
-            yield make_event(
-                "reasoning_delta",
-                delta=summary,
-                backend_response_id=self.last_response_id,
-            )
-            return
+class AsyncResponsesStreamAdapter(_ResponsesEventNormalizer):
+    """Normalize Responses API SSE events from an ``AsyncOpenAI``-style client."""
 
-        if event_type in {"response.failed", "error"}:
-            yield make_event(
-                "message_error",
-                error=_extract_error_message(raw_event),
-                backend_response_id=self.last_response_id,
-            )
+    def stream(self, client: Any, request: StreamingAdapterRequest) -> AsyncIterator[ChatEvent]:
+        return _abatch_deltas(self._stream(client, request), request.delta_batching)
 
-    def _tracked_tool_call(self, raw_event: Any) -> _TrackedToolCall | None:
-        item_id = _get_value(raw_event, "item_id")
-        if item_id and item_id in self._tool_calls_by_item_id:
-            return self._tool_calls_by_item_id[item_id]
-        output_index = _get_value(raw_event, "output_index")
-        if output_index is None:
-            return None
-        return self._tool_calls_by_index.get(int(output_index))
+    async def _stream(self, client: Any, request: StreamingAdapterRequest) -> AsyncIterator[ChatEvent]:
+        stream = await _resolve_awaitable(client.responses.create(**self._request_kwargs(request)))
+        normalize = self._normalize_event
+        async for raw_event in stream:
+            event = normalize(raw_event)
+            if event is not None:
+                yield event
 
 
-class ChatCompletionsStreamAdapter:
-    """Normalize Chat Completions streaming chunks into chat timeline events."""
+class _ChatCompletionsChunkNormalizer:
+    """Request building and chunk normalization shared by the Chat Completions adapters."""
 
     def __init__(self) -> None:
         self._tool_calls_by_index: dict[int, _TrackedToolCall] = {}
 
-    def stream(self, client: Any, request: StreamingAdapterRequest) -> Iterator[ChatEvent]:
+    def _request_kwargs(self, request: StreamingAdapterRequest) -> dict[str, Any]:
         kwargs: dict[str, Any] = {
             "model": request.config.model,
             "messages": list(request.messages),
-            "tools": build_chat_completions_tools(),
+            "tools": build_chat_completions_tools(request.resources),
             "stream": True,
         }
         if request.config.reasoning_effort:
@@ -198,10 +249,7 @@ class ChatCompletionsStreamAdapter:
         if request.config.temperature is not None:
             kwargs["temperature"] = request.config.temperature
         kwargs.update(request.config.extra_request_options)
-
-        stream = client.chat.completions.create(**kwargs)
-        for chunk in stream:
-            yield from self._normalize_chunk(chunk)
+        return kwargs
 
     def _normalize_chunk(self, chunk: Any) -> Iterator[ChatEvent]:
         choice = _get_first_choice(chunk)
@@ -251,12 +299,151 @@ class ChatCompletionsStreamAdapter:
                     "tool_call_completed",
                     tool_call_id=tracked.call_id,
                     tool_name=tracked.name,
-                    arguments=tracked.arguments,
+                    arguments=str(tracked.arguments),
                 )
         elif finish_reason in {"stop", "length"}:
             return
 
 
+class ChatCompletionsStreamAdapter(_ChatCompletionsChunkNormalizer):
+    """Normalize Chat Completions streaming chunks into chat timeline events."""
+
+    def stream(self, client: Any, request: StreamingAdapterRequest) -> Iterator[ChatEvent]:
+        return _batch_deltas(self._stream(client, request), request.delta_batching)
+
+    def _stream(self, client: Any, request: StreamingAdapterRequest) -> Iterator[ChatEvent]:
+        stream = client.chat.completions.create(**self._request_kwargs(request))
+        for chunk in stream:
+            yield from self._normalize_chunk(chunk)
+
+
+class AsyncChatCompletionsStreamAdapter(_ChatCompletionsChunkNormalizer):
+    """Normalize Chat Completions streaming chunks from an ``AsyncOpenAI``-style client."""
+
+    def stream(self, client: Any, request: StreamingAdapterRequest) -> AsyncIterator[ChatEvent]:
+        return _abatch_deltas(self._stream(client, request), request.delta_batching)
+
+    async def _stream(self, client: Any, request: StreamingAdapterRequest) -> AsyncIterator[ChatEvent]:
+        stream = await _resolve_awaitable(client.chat.completions.create(**self._request_kwargs(request)))
+        async for chunk in stream:
+            for event in self._normalize_chunk(chunk):
+                yield event
+
+
+_BATCHED_EVENT_TYPES = frozenset({"text_delta", "reasoning_delta", "tool_call_delta"})
+
+
+class _DeltaBatcher:
+    """Merge runs of delta events for the same target according to a :class:`DeltaBatchingPolicy`."""
+
+    __slots__ = ("_max_chars", "_max_latency", "_pending", "_key", "_parts", "_size", "_started")
+
+    def __init__(self, policy: DeltaBatchingPolicy) -> None:
+        self._max_chars = policy.max_chars
+        self._max_latency = policy.max_latency
+        self._pending: ChatEvent | None = None
+        self._key: tuple[Any, ...] | None = None
+        self._parts: list[str] = []
+        self._size = 0
+        self._started = 0.0
+
+    def push(self, event: ChatEvent) -> list[ChatEvent]:
+        """Return the events ready to emit once ``event`` has been taken in."""
+
+        delta = event.get("delta")
+        key = None
+        if event["type"] in _BATCHED_EVENT_TYPES and isinstance(delta, str):
+            key = (event["type"], event.get("tool_call_id"), event.get("backend_response_id"))
+        ready: list[ChatEvent] = []
+        if self._pending is not None:
+            if (
+                key == self._key
+                and self._size + len(delta) <= self._max_chars
+                and time.monotonic() - self._started <= self._max_latency
+            ):
+                self._parts.append(delta)
+                self._size += len(delta)
+                return ready
+            ready.append(self._take())
+        if key is None:
+            ready.append(event)
+            return ready
+        self._pending = event
+        self._key = key
+        self._parts = [delta]
+        self._size = len(delta)
+        self._started = time.monotonic()
+        return ready
+
+    def flush(self) -> list[ChatEvent]:
+        return [self._take()] if self._pending is not None else []
+
+    def remaining(self) -> float | None:
+        """Seconds until the pending batch is due, or ``None`` when nothing is pending."""
+
+        if self._pending is None:
+            return None
+        return max(0.0, self._started + self._max_latency - time.monotonic())
+
+    def _take(self) -> ChatEvent:
+        event = self._pending
+        if len(self._parts) > 1:
+            event["delta"] = "".join(self._parts)
+        self._pending = None
+        self._key = None
+        self._parts = []
+        return event
+
+
+def _batch_deltas(events: Iterator[ChatEvent], policy: DeltaBatchingPolicy | None) -> Iterator[ChatEvent]:
+    return events if policy is None else _iter_batched(events, _DeltaBatcher(policy))
+
+
+def _abatch_deltas(events: AsyncIterator[ChatEvent], policy: DeltaBatchingPolicy | None) -> AsyncIterator[ChatEvent]:
+    return events if policy is None else _aiter_batched(events, _DeltaBatcher(policy))
+
+
+def _iter_batched(events: Iterator[ChatEvent], batcher: _DeltaBatcher) -> Iterator[ChatEvent]:
+    for event in events:
+        yield from batcher.push(event)
+    yield from batcher.flush()
+
+
+async def _aiter_batched(events: AsyncIterator[ChatEvent], batcher: _DeltaBatcher) -> AsyncIterator[ChatEvent]:
+    # The next event is awaited as a task so a stalled stream can flush the
+    # pending batch at its deadline without cancelling the source generator.
+    iterator = aiter(events)
+    upcoming: asyncio.Task | None = None
+    try:
+        while True:
+            if upcoming is None:
+                upcoming = asyncio.ensure_future(anext(iterator))
+            done, _ = await asyncio.wait({upcoming}, timeout=batcher.remaining())
+            if not done:
+                for ready in batcher.flush():
+                    yield ready
+                continue
+            try:
+                event = upcoming.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                upcoming = None
+            for ready in batcher.push(event):
+                yield ready
+    finally:
+        if upcoming is not None:
+            upcoming.cancel()
+    for ready in batcher.flush():
+        yield ready
+
+
+async def _resolve_awaitable(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
 def _get_first_choice(chunk: Any) -> Any | None:
     choices = _get_value(chunk, "choices")
     if isinstance(choices, list) and choices:
@@ -327,16 +514,15 @@ def _flatten_reasoning_summary(item: Any) -> str:
         if isinstance(entry, str):
             parts.append(entry)
             continue
-        if isinstance(entry, dict):
-            text = entry.get("text")
-            if isinstance(text, str):
-                parts.append(text)
+        text = _field_getter(entry)(entry, "text", None)
+        if isinstance(text, str):
+            parts.append(text)
     return "".join(parts)
 
 
 def _extract_error_message(raw_event: Any) -> str:
-    for path in ("error.message", "message"):
-        value = _get_value(raw_event, path)
+    for accessor in (_ERROR_MESSAGE, _MESSAGE):
+        value = accessor(raw_event)
         if isinstance(value, str) and value:
             return value
     return "Streaming request failed."
@@ -350,15 +536,44 @@ def _first_non_empty(*values: Any) -> Any:
 
 
 def _get_value(obj: Any, path: str, default: Any = None) -> Any:
-    current = obj
-    for part in path.split("."):
-        if current is None:
-            return default
-        if isinstance(current, dict):
-            current = current.get(part, default)
-            continue
-        current = getattr(current, part, default)
-    return current
+    return _compile_path(path)(obj, default)
+
+
+def _field_getter(obj: Any) -> _FieldGetter:
+    """``dict.get`` for dict events, ``getattr`` for SDK objects; both take ``(obj, name, default)``."""
+
+    return dict.get if isinstance(obj, dict) else getattr
+
+
+@lru_cache(maxsize=None)
+def _compile_path(path: str) -> Callable[..., Any]:
+    """Build an accessor for a dotted ``path`` once, instead of splitting it on every event."""
+
+    parts = tuple(path.split("."))
+    if len(parts) == 1:
+        name = parts[0]
+
+        def get_field(obj: Any, default: Any = None) -> Any:
+            if obj is None:
+                return default
+            return (dict.get if isinstance(obj, dict) else getattr)(obj, name, default)
+
+        return get_field
+
+    def get_path(obj: Any, default: Any = None) -> Any:
+        current = obj
+        for part in parts:
+            if current is None:
+                return default
+            current = (dict.get if isinstance(current, dict) else getattr)(current, part, default)
+        return current
+
+    return get_path
+
+
+_RESPONSE_ID = _compile_path("response.id")
+_ERROR_MESSAGE = _compile_path("error.message")
+_MESSAGE = _compile_path("message")
 
 
 def _nested_get(obj: dict[str, Any], path: tuple[str, ...]) -> Any:
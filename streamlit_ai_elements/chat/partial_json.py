@@ -0,0 +1,276 @@
+"""Incremental, tolerant JSON parsing for streamed tool-call arguments."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+_TRAILING_HIGH_SURROGATE = re.compile(r"(?<!\\)(?:\\\\)*\\u[dD][89abAB][0-9a-fA-F]{2}$")
+_WHITESPACE = frozenset(" \t\r\n")
+_CLOSERS = {"{": "}", "[": "]"}
+
+# Lexer states. ``_KEY`` expects an object key (or ``}``), ``_VALUE`` expects a
+# value (or ``]`` directly inside an array) and ``_AFTER_VALUE`` expects a
+# separator or a closing bracket.
+_VALUE = 0
+_KEY = 1
+_COLON = 2
+_AFTER_VALUE = 3
+_STRING = 4
+_SCALAR = 5
+_DONE = 6
+_FAILED = 7
+
+
+class _Frame:
+    __slots__ = ("kind", "key", "index")
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self.key: str | None = None
+        self.index = -1
+
+
+class IncrementalJSONParser:
+    """Best-effort view of a JSON document that arrives in pieces.
+
+    :meth:`feed` only scans the new delta: the parser keeps the container
+    stack, the string/escape state and the last offset at which the prefix can
+    be closed into valid JSON. :attr:`value` closes the prefix at that offset
+    (or inside the string value being written) and caches the result until
+    the next delta, so partially streamed objects, arrays and string values are
+    visible long before the document is complete.
+
+    Malformed input is tolerated: the parser stops advancing at the first
+    unexpected character and keeps returning what was valid before it.
+    """
+
+    __slots__ = (
+        "_chunks",
+        "_length",
+        "_stack",
+        "_state",
+        "_safe_end",
+        "_string_start",
+        "_string_is_key",
+        "_escape_start",
+        "_escape_pending",
+        "_key_chars",
+        "_value",
+        "_value_length",
+    )
+
+    def __init__(self, text: str = "") -> None:
+        self._chunks: list[str] = []
+        self._length = 0
+        self._stack: list[_Frame] = []
+        self._state = _VALUE
+        self._safe_end = 0
+        self._string_start = 0
+        self._string_is_key = False
+        self._escape_start = -1
+        self._escape_pending = 0
+        self._key_chars: list[str] = []
+        self._value: Any = None
+        self._value_length = 0
+        if text:
+            self.feed(text)
+
+    @property
+    def complete(self) -> bool:
+        """Whether a full top-level JSON value has been parsed."""
+        return self._state == _DONE
+
+    @property
+    def failed(self) -> bool:
+        return self._state == _FAILED
+
+    @property
+    def path(self) -> tuple[str | int, ...]:
+        """Keys and indexes leading to the value that is still being written.
+
+        Containers on the path are open, so their snapshot is partial. An empty
+        path means the parser sits between complete values.
+        """
+
+        path: list[str | int] = []
+        for frame in self._stack[:-1]:
+            path.append(frame.key if frame.kind == "{" else frame.index)
+        if self._stack and (self._state == _SCALAR or (self._state == _STRING and not self._string_is_key)):
+            frame = self._stack[-1]
+            path.append(frame.key if frame.kind == "{" else frame.index)
+        return tuple(item for item in path if item is not None)
+
+    @property
+    def value(self) -> Any:
+        """The document parsed so far, with open strings and containers closed."""
+
+        if self._value_length != self._length:
+            snapshot = self._snapshot()
+            if snapshot is not None:
+                try:
+                    self._value = json.loads(snapshot)
+                except json.JSONDecodeError:
+                    pass
+            self._value_length = self._length
+        return self._value
+
+    def feed(self, delta: str) -> None:
+        if not delta or self._state == _FAILED:
+            return
+        offset = self._length
+        self._chunks.append(delta)
+        self._length += len(delta)
+        index = 0
+        end = len(delta)
+        while index < end:
+            state = self._state
+            if state == _STRING:
+                index = self._scan_string(delta, index, offset)
+                continue
+            char = delta[index]
+            if state == _SCALAR:
+                if char in _WHITESPACE or char in ",]}":
+                    self._end_value(offset + index)
+                    continue
+                index += 1
+                continue
+            if char in _WHITESPACE:
+                index += 1
+                continue
+            position = offset + index
+            if state == _VALUE:
+                self._start_value(char, position)
+            elif state == _KEY:
+                if char == '"':
+                    self._start_string(position, is_key=True)
+                elif char == "}":
+                    self._close("{", position)
+                else:
+                    self._fail()
+            elif state == _COLON:
+                if char == ":":
+                    self._state = _VALUE
+                else:
+                    self._fail()
+            elif state == _AFTER_VALUE:
+                frame = self._stack[-1] if self._stack else None
+                if char == "," and frame is not None:
+                    self._state = _KEY if frame.kind == "{" else _VALUE
+                elif char in "}]":
+                    self._close("{" if char == "}" else "[", position)
+                else:
+                    self._fail()
+            else:
+                self._fail()
+            if self._state == _FAILED:
+                return
+            index += 1
+
+    def _start_value(self, char: str, position: int) -> None:
+        frame = self._stack[-1] if self._stack else None
+        if char == "]" and frame is not None and frame.kind == "[":
+            self._close("[", position)
+            return
+        if frame is not None and frame.kind == "[":
+            frame.index += 1
+        if char in _CLOSERS:
+            self._stack.append(_Frame(char))
+            self._state = _KEY if char == "{" else _VALUE
+            self._safe_end = position + 1
+        elif char == '"':
+            self._start_string(position, is_key=False)
+        elif char in "-0123456789tfn":
+            self._state = _SCALAR
+        else:
+            self._fail()
+
+    def _start_string(self, position: int, *, is_key: bool) -> None:
+        self._state = _STRING
+        self._string_start = position
+        self._string_is_key = is_key
+        self._key_chars.clear()
+
+    def _scan_string(self, delta: str, index: int, offset: int) -> int:
+        if self._escape_pending:
+            if self._escape_pending < 0:
+                self._escape_pending = 5 if delta[index] == "u" else 1
+            consumed = min(self._escape_pending, len(delta) - index)
+            if self._string_is_key:
+                self._key_chars.append(delta[index : index + consumed])
+            index += consumed
+            self._escape_pending -= consumed
+            if not self._escape_pending:
+                self._escape_start = -1
+            return index
+        match = _STRING_SPECIAL.search(delta, index)
+        if match is None:
+            if self._string_is_key:
+                self._key_chars.append(delta[index:])
+            return len(delta)
+        special = match.start()
+        if self._string_is_key:
+            self._key_chars.append(delta[index:special])
+        if delta[special] == '"':
+            if self._string_is_key:
+                self._finish_key()
+            else:
+                self._end_value(offset + special + 1)
+            return special + 1
+        self._escape_start = offset + special
+        if self._string_is_key:
+            self._key_chars.append("\\")
+        # Either a one-character escape or ``u`` plus four hex digits; only
+        # the character after the backslash tells which, and it may not have
+        # arrived yet.
+        index = special + 1
+        if index < len(delta):
+            self._escape_pending = 5 if delta[index] == "u" else 1
+        else:
+            self._escape_pending = -1
+        return index
+
+    def _finish_key(self) -> None:
+        frame = self._stack[-1]
+        try:
+            frame.key = json.loads('"' + "".join(self._key_chars) + '"')
+        except json.JSONDecodeError:
+            self._fail()
+            return
+        self._key_chars.clear()
+        self._state = _COLON
+
+    def _end_value(self, position: int) -> None:
+        self._state = _AFTER_VALUE if self._stack else _DONE
+        self._safe_end = position
+
+    def _close(self, kind: str, position: int) -> None:
+        if not self._stack or self._stack[-1].kind != kind:
+            self._fail()
+            return
+        self._stack.pop()
+        self._end_value(position + 1)
+
+    def _fail(self) -> None:
+        self._state = _FAILED
+
+    def _snapshot(self) -> str | None:
+        if not self._chunks:
+            return None
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        text = self._chunks[0]
+        closers = "".join(_CLOSERS[frame.kind] for frame in reversed(self._stack))
+        if self._state == _STRING and not self._string_is_key:
+            cut = self._escape_start if self._escape_start >= 0 else self._length
+            partial = text[:cut]
+            surrogate = _TRAILING_HIGH_SURROGATE.search(partial, self._string_start)
+            if surrogate is not None:
+                partial = partial[: surrogate.end() - 6]
+            return partial + '"' + closers
+        if not self._safe_end:
+            return None
+        return text[: self._safe_end] + closers
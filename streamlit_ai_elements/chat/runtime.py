@@ -2,15 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
-from typing import Any, Iterator
-
-from .adapters import ChatCompletionsStreamAdapter, ResponsesStreamAdapter, StreamingAdapterRequest
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from .adapters import (
+    AsyncChatCompletionsStreamAdapter,
+    AsyncResponsesStreamAdapter,
+    ChatCompletionsStreamAdapter,
+    ResponsesStreamAdapter,
+    StreamingAdapterRequest,
+)
 from .tools import build_system_prompt, execute_tool_call, parse_tool_arguments
 from .types import (
     ChatBackendConfig,
     ChatEvent,
+    DeltaBatchingPolicy,
     StreamingSessionState,
+    TextBuffer,
+    ToolExecutionPolicy,
     append_event,
     create_session_state,
     make_event,
@@ -22,18 +36,400 @@ from .types import (
 class _CycleToolCall:
     id: str
     tool_name: str
-    arguments: str = ""
+    arguments: TextBuffer = field(default_factory=TextBuffer)
 
 
 @dataclass(slots=True)
 class _CycleState:
-    text: str = ""
-    reasoning: str = ""
+    text: TextBuffer = field(default_factory=TextBuffer)
+    reasoning: TextBuffer = field(default_factory=TextBuffer)
     tool_calls: dict[str, _CycleToolCall] = field(default_factory=dict)
     response_id: str | None = None
     errored: bool = False
 
 
+_MAX_TOOL_CONTINUATIONS = 8
+_DEFAULT_TOOL_EXECUTION = ToolExecutionPolicy()
+
+
+class _ToolCallFailed(Exception):
+    """A tool executor raised; the turn ends with ``message_error``."""
+
+
+@dataclass(slots=True, eq=False)
+class _ScheduledToolCall:
+    tool_call: _CycleToolCall
+    arguments: dict[str, Any]
+    future: Future | None = None
+    started: threading.Event = field(default_factory=threading.Event)
+    started_at: float = 0.0
+
+
+class _ToolCallScheduler:
+    """Executes one cycle's tool calls and hands results back in submission order.
+
+    Threaded policies run calls on a ``ThreadPoolExecutor`` with
+    ``max_concurrency`` workers. A timed-out call cannot be interrupted and
+    keeps its worker; once every worker is held by one, calls that have not
+    started are cancelled and reported as skipped rather than waiting on them.
+    """
+
+    def __init__(self, policy: ToolExecutionPolicy, resources: dict[str, Any] | None) -> None:
+        self._policy = policy
+        self._resources = resources
+        self._executor: ThreadPoolExecutor | None = None
+        if policy.max_concurrency > 1 or policy.timeout is not None or policy.eager:
+            self._executor = ThreadPoolExecutor(
+                max_workers=policy.max_concurrency,
+                thread_name_prefix="ai-elements-tool",
+            )
+        self._ordered: deque[_ScheduledToolCall] = deque()
+        self._submitted_ids: set[str] = set()
+        self._stalled = 0
+        self._lock = threading.Lock()
+
+    def is_submitted(self, tool_call_id: str) -> bool:
+        return tool_call_id in self._submitted_ids
+
+    def submit(self, tool_call: _CycleToolCall, arguments: dict[str, Any]) -> None:
+        scheduled = _ScheduledToolCall(tool_call=tool_call, arguments=arguments)
+        self._submitted_ids.add(tool_call.id)
+        self._ordered.append(scheduled)
+        if self._executor is not None:
+            scheduled.future = self._executor.submit(self._run, scheduled)
+            with self._lock:
+                exhausted = self._stalled >= self._policy.max_concurrency
+            # Eager calls can arrive after every worker stalled; they would never start.
+            if exhausted and scheduled.future.cancel():
+                scheduled.started.set()
+
+    def results(self, *, block: bool = True) -> Iterator[tuple[_CycleToolCall, dict[str, Any]]]:
+        """Yield finished calls in order; without ``block``, stop at the first unfinished one."""
+
+        while self._ordered:
+            scheduled = self._ordered[0]
+            if not block and not self._is_settled(scheduled):
+                return
+            self._ordered.popleft()
+            try:
+                if scheduled.future is not None:
+                    execution = self._wait(scheduled)
+                else:
+                    execution = execute_tool_call(
+                        scheduled.tool_call.tool_name,
+                        scheduled.arguments,
+                        resources=self._resources,
+                    )
+            except Exception as exc:
+                raise _ToolCallFailed(str(exc)) from exc
+            yield scheduled.tool_call, execution
+
+    def cancel(self) -> None:
+        """Cancel calls that have not started; running ones finish in the background."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._ordered.clear()
+
+    def _is_settled(self, scheduled: _ScheduledToolCall) -> bool:
+        if scheduled.future is None:
+            return False
+        if scheduled.future.done():
+            return True
+        timeout = self._policy.timeout
+        return (
+            timeout is not None
+            and scheduled.started.is_set()
+            and time.monotonic() >= scheduled.started_at + timeout
+        )
+
+    def _run(self, scheduled: _ScheduledToolCall) -> dict[str, Any]:
+        scheduled.started_at = time.monotonic()
+        scheduled.started.set()
+        return execute_tool_call(
+            scheduled.tool_call.tool_name,
+            scheduled.arguments,
+            resources=self._resources,
+        )
+
+    def _wait(self, scheduled: _ScheduledToolCall) -> dict[str, Any]:
+        future = scheduled.future
+        timeout = self._policy.timeout
+        try:
+            if timeout is None:
+                return future.result()
+            # Calls start in submission order, so every earlier call has
+            # finished or timed out by now and a worker is free for this one
+            # unless it was cancelled.
+            scheduled.started.wait()
+            remaining = scheduled.started_at + timeout - time.monotonic()
+            return future.result(timeout=max(remaining, 0.0))
+        except CancelledError:
+            return _skipped_execution(scheduled.tool_call)
+        except FutureTimeoutError:
+            self._stall(future)
+            return _timed_out_execution(scheduled.tool_call, timeout)
+
+    def _stall(self, future: Future) -> None:
+        """Count a timed-out call's worker as lost until it returns, and cancel queued calls if none are left."""
+
+        with self._lock:
+            self._stalled += 1
+        future.add_done_callback(self._unstall)
+        with self._lock:
+            exhausted = self._stalled >= self._policy.max_concurrency
+        if not exhausted:
+            return
+        for scheduled in self._ordered:
+            if scheduled.future is not None and scheduled.future.cancel():
+                scheduled.started.set()
+
+    def _unstall(self, future: Future) -> None:
+        with self._lock:
+            self._stalled -= 1
+
+
+class _AsyncToolCallScheduler:
+    """Asyncio counterpart of :class:`_ToolCallScheduler`.
+
+    A timed-out call keeps its concurrency slot until its worker thread
+    returns, and once every slot is held that way the remaining calls are
+    reported as skipped, as in the threaded scheduler.
+    """
+
+    def __init__(self, policy: ToolExecutionPolicy, resources: dict[str, Any] | None) -> None:
+        self._policy = policy
+        self._resources = resources
+        self._semaphore = asyncio.Semaphore(policy.max_concurrency)
+        self._stalled = 0
+        self._exhausted = asyncio.Event()
+        self._ordered: deque[tuple[_CycleToolCall, asyncio.Task]] = deque()
+        self._submitted_ids: set[str] = set()
+
+    def is_submitted(self, tool_call_id: str) -> bool:
+        return tool_call_id in self._submitted_ids
+
+    def submit(self, tool_call: _CycleToolCall, arguments: dict[str, Any]) -> None:
+        task = asyncio.ensure_future(self._run(tool_call, arguments))
+        self._submitted_ids.add(tool_call.id)
+        self._ordered.append((tool_call, task))
+
+    async def results(self, *, block: bool = True) -> AsyncIterator[tuple[_CycleToolCall, dict[str, Any]]]:
+        while self._ordered:
+            tool_call, task = self._ordered[0]
+            if not block and not task.done():
+                return
+            self._ordered.popleft()
+            try:
+                execution = await task
+            except Exception as exc:
+                raise _ToolCallFailed(str(exc)) from exc
+            yield tool_call, execution
+
+    def cancel(self) -> None:
+        for _, task in self._ordered:
+            task.cancel()
+        self._ordered.clear()
+
+    async def _run(self, tool_call: _CycleToolCall, arguments: dict[str, Any]) -> dict[str, Any]:
+        if not await self._acquire():
+            return _skipped_execution(tool_call)
+        execution = asyncio.ensure_future(
+            asyncio.to_thread(
+                execute_tool_call,
+                tool_call.tool_name,
+                arguments,
+                resources=self._resources,
+            )
+        )
+        holds_slot = True
+        try:
+            timeout = self._policy.timeout
+            if timeout is None:
+                return await execution
+            done, _ = await asyncio.wait({execution}, timeout=timeout)
+            if execution in done:
+                return execution.result()
+            # The thread cannot be interrupted; its slot is released when it returns.
+            holds_slot = False
+            self._stall(execution)
+            return _timed_out_execution(tool_call, timeout)
+        finally:
+            if holds_slot:
+                self._semaphore.release()
+
+    async def _acquire(self) -> bool:
+        """Take a slot, or return ``False`` once every slot is held by a timed-out call."""
+
+        if self._exhausted.is_set():
+            return False
+        acquire = asyncio.ensure_future(self._semaphore.acquire())
+        exhausted = asyncio.ensure_future(self._exhausted.wait())
+        try:
+            await asyncio.wait({acquire, exhausted}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            exhausted.cancel()
+            if not acquire.done():
+                acquire.cancel()
+        return acquire.done() and not acquire.cancelled()
+
+    def _stall(self, execution: asyncio.Future) -> None:
+        self._stalled += 1
+        if self._stalled >= self._policy.max_concurrency:
+            self._exhausted.set()
+        execution.add_done_callback(self._unstall)
+
+    def _unstall(self, execution: asyncio.Future) -> None:
+        self._stalled -= 1
+        if self._stalled < self._policy.max_concurrency:
+            self._exhausted.clear()
+        self._semaphore.release()
+
+
+def _timed_out_execution(tool_call: _CycleToolCall, timeout: float) -> dict[str, Any]:
+    return {
+        "output_text": f"Tool call `{tool_call.tool_name}` timed out after {timeout:g} seconds.",
+        "card_policy": "augment",
+        "is_renderer": False,
+    }
+
+
+def _skipped_execution(tool_call: _CycleToolCall) -> dict[str, Any]:
+    return {
+        "output_text": f"Tool call `{tool_call.tool_name}` was not run because earlier tool calls timed out.",
+        "card_policy": "augment",
+        "is_renderer": False,
+    }
+
+
+@dataclass(slots=True)
+class _AssistantTurn:
+    """Session bookkeeping for one assistant turn, shared by the sync and async runtimes."""
+
+    session: StreamingSessionState
+    message_id: str
+    instructions: str
+    chat_messages: list[dict[str, Any]]
+    previous_response_id: str | None = None
+    resources: dict[str, Any] | None = None
+    tool_outputs: list[dict[str, Any]] = field(default_factory=list)
+    assistant_tool_calls_payload: list[dict[str, Any]] = field(default_factory=list)
+    tool_message_payloads: list[dict[str, Any]] = field(default_factory=list)
+
+    def emit(self, event: ChatEvent) -> ChatEvent:
+        append_event(self.session, event)
+        return event
+
+    def adapter_request(
+        self,
+        config: ChatBackendConfig,
+        delta_batching: DeltaBatchingPolicy | None = None,
+    ) -> StreamingAdapterRequest:
+        return StreamingAdapterRequest(
+            config=config,
+            instructions=self.instructions,
+            messages=self.chat_messages,
+            tool_outputs=self.tool_outputs,
+            previous_response_id=self.previous_response_id,
+            resources=self.resources,
+            delta_batching=delta_batching,
+        )
+
+    def record_stream_event(self, cycle: _CycleState, event: ChatEvent) -> ChatEvent:
+        event["message_id"] = self.message_id
+        self.emit(event)
+        _apply_cycle_event(cycle, event)
+        return event
+
+    def finish_stream(self, cycle: _CycleState, adapter: Any) -> None:
+        self.previous_response_id = cycle.response_id or getattr(adapter, "last_response_id", self.previous_response_id)
+
+    def completed(self) -> ChatEvent:
+        return self.emit(make_event("message_completed", message_id=self.message_id))
+
+    def failed(self, error: str) -> ChatEvent:
+        return self.emit(make_event("message_error", message_id=self.message_id, error=error))
+
+    def begin_tool_batch(self) -> None:
+        self.tool_outputs = []
+        self.assistant_tool_calls_payload = []
+        self.tool_message_payloads = []
+
+    def register_tool_call(self, tool_call: _CycleToolCall) -> dict[str, Any]:
+        raw_arguments = str(tool_call.arguments)
+        self.assistant_tool_calls_payload.append(
+            {
+                "id": tool_call.id,
+                "type": "function",
+                "function": {
+                    "name": tool_call.tool_name,
+                    "arguments": raw_arguments,
+                },
+            }
+        )
+        return parse_tool_arguments(raw_arguments)
+
+    def tool_result_events(self, tool_call: _CycleToolCall, execution: dict[str, Any]) -> Iterator[ChatEvent]:
+        if execution.get("element") is not None:
+            yield self.emit(
+                make_event(
+                    "renderer_placeholder_started",
+                    message_id=self.message_id,
+                    tool_call_id=tool_call.id,
+                    tool_name=tool_call.tool_name,
+                    card_policy=execution.get("card_policy", "replace"),
+                )
+            )
+            yield self.emit(
+                make_event(
+                    "renderer_completed",
+                    message_id=self.message_id,
+                    tool_call_id=tool_call.id,
+                    tool_name=tool_call.tool_name,
+                    element=execution["element"],
+                    card_policy=execution.get("card_policy", "replace"),
+                )
+            )
+
+        tool_output_text = str(execution.get("output_text", "success"))
+        if tool_output_text:
+            yield self.emit(
+                make_event(
+                    "tool_call_completed",
+                    message_id=self.message_id,
+                    tool_call_id=tool_call.id,
+                    tool_name=tool_call.tool_name,
+                    arguments=str(tool_call.arguments),
+                    output=tool_output_text,
+                )
+            )
+
+        self.tool_outputs.append(
+            {
+                "type": "function_call_output",
+                "call_id": tool_call.id,
+                "output": tool_output_text,
+            }
+        )
+        self.tool_message_payloads.append(
+            {
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "content": tool_output_text,
+            }
+        )
+
+    def end_tool_batch(self, cycle: _CycleState) -> None:
+        self.chat_messages.append(
+            {
+                "role": "assistant",
+                "content": str(cycle.text),
+                "tool_calls": self.assistant_tool_calls_payload,
+            }
+        )
+        self.chat_messages.extend(self.tool_message_payloads)
+
+
 def ensure_session_state(state: StreamingSessionState | None = None) -> StreamingSessionState:
     return state or create_session_state()
 
@@ -62,9 +458,18 @@ def stream_chat_turn(
     state: StreamingSessionState | None = None,
     config: ChatBackendConfig,
     resources: dict[str, Any] | None = None,
+    tool_execution: ToolExecutionPolicy | None = None,
+    delta_batching: DeltaBatchingPolicy | None = None,
 ) -> Iterator[ChatEvent]:
     session = append_user_message(state, prompt)
-    yield from stream_assistant_turn(client, state=session, config=config, resources=resources)
+    yield from stream_assistant_turn(
+        client,
+        state=session,
+        config=config,
+        resources=resources,
+        tool_execution=tool_execution,
+        delta_batching=delta_batching,
+    )
 
 
 def stream_assistant_turn(
@@ -73,142 +478,182 @@ def stream_assistant_turn(
     state: StreamingSessionState | None = None,
     config: ChatBackendConfig,
     resources: dict[str, Any] | None = None,
+    tool_execution: ToolExecutionPolicy | None = None,
+    delta_batching: DeltaBatchingPolicy | None = None,
 ) -> Iterator[ChatEvent]:
-    session = ensure_session_state(state)
-    chat_messages = _build_backend_messages(session)
-    assistant_message_id = new_message_id()
-    started_event = make_event("message_started", message_id=assistant_message_id, role="assistant")
-    append_event(session, started_event)
-    yield started_event
+    """Stream one assistant turn, executing requested tool calls between model cycles.
 
-    instructions = build_system_prompt(resources)
-    previous_response_id: str | None = None
-    tool_outputs: list[dict[str, Any]] = []
+    With ``delta_batching``, adjacent text, reasoning and tool-argument deltas
+    are merged before they are recorded, so the timeline holds fewer events.
+    """
 
-    for _ in range(8):
+    policy = tool_execution or _DEFAULT_TOOL_EXECUTION
+    turn = _start_assistant_turn(state, resources)
+    yield turn.emit(make_event("message_started", message_id=turn.message_id, role="assistant"))
+
+    for _ in range(_MAX_TOOL_CONTINUATIONS):
         adapter = _build_adapter(config.backend)
         cycle = _CycleState()
-        request = StreamingAdapterRequest(
-            config=config,
-            instructions=instructions,
-            messages=chat_messages,
-            tool_outputs=tool_outputs,
-            previous_response_id=previous_response_id,
-        )
-
-        for event in adapter.stream(client, request):
-            event["message_id"] = assistant_message_id
-            append_event(session, event)
-            yield event
-            _apply_cycle_event(cycle, event)
+        request = turn.adapter_request(config, delta_batching)
+        turn.begin_tool_batch()
+        scheduler = _ToolCallScheduler(policy, resources)
+        try:
+            for event in adapter.stream(client, request):
+                yield turn.record_stream_event(cycle, event)
+                if policy.eager:
+                    _submit_completed_tool_call(turn, scheduler, cycle, event)
+                    yield from _tool_result_events(turn, scheduler, block=False)
+            turn.finish_stream(cycle, adapter)
+
+            if cycle.errored:
+                return
 
-        previous_response_id = cycle.response_id or getattr(adapter, "last_response_id", previous_response_id)
+            if not cycle.tool_calls:
+                yield turn.completed()
+                return
 
-        if cycle.errored:
+            _submit_remaining_tool_calls(turn, scheduler, cycle)
+            yield from _tool_result_events(turn, scheduler, block=True)
+        except _ToolCallFailed as exc:
+            yield turn.failed(str(exc))
             return
+        finally:
+            scheduler.cancel()
+        turn.end_tool_batch(cycle)
 
-        if not cycle.tool_calls:
-            completed_event = make_event("message_completed", message_id=assistant_message_id)
-            append_event(session, completed_event)
-            yield completed_event
-            return
+    yield turn.failed("Exceeded maximum tool-call continuations for one assistant turn.")
 
-        tool_outputs = []
-        assistant_tool_calls_payload: list[dict[str, Any]] = []
-        tool_message_payloads: list[dict[str, Any]] = []
-        for tool_call in cycle.tool_calls.values():
-            raw_arguments = tool_call.arguments
-            tool_args = parse_tool_arguments(raw_arguments)
-            assistant_tool_calls_payload.append(
-                {
-                    "id": tool_call.id,
-                    "type": "function",
-                    "function": {
-                        "name": tool_call.tool_name,
-                        "arguments": raw_arguments,
-                    },
-                }
-            )
 
-            try:
-                execution = execute_tool_call(tool_call.tool_name, tool_args, resources=resources)
-            except Exception as exc:  # pragma: no cover - defensive path
-                error_event = make_event(
-                    "message_error",
-                    message_id=assistant_message_id,
-                    error=str(exc),
-                )
-                append_event(session, error_event)
-                yield error_event
+async def astream_chat_turn(
+    client: Any,
+    prompt: str,
+    *,
+    state: StreamingSessionState | None = None,
+    config: ChatBackendConfig,
+    resources: dict[str, Any] | None = None,
+    tool_execution: ToolExecutionPolicy | None = None,
+    delta_batching: DeltaBatchingPolicy | None = None,
+) -> AsyncIterator[ChatEvent]:
+    """Async counterpart of :func:`stream_chat_turn` for ``AsyncOpenAI``-style clients."""
+
+    session = append_user_message(state, prompt)
+    async for event in astream_assistant_turn(
+        client,
+        state=session,
+        config=config,
+        resources=resources,
+        tool_execution=tool_execution,
+        delta_batching=delta_batching,
+    ):
+        yield event
+
+
+async def astream_assistant_turn(
+    client: Any,
+    *,
+    state: StreamingSessionState | None = None,
+    config: ChatBackendConfig,
+    resources: dict[str, Any] | None = None,
+    tool_execution: ToolExecutionPolicy | None = None,
+    delta_batching: DeltaBatchingPolicy | None = None,
+) -> AsyncIterator[ChatEvent]:
+    """Async counterpart of :func:`stream_assistant_turn`.
+
+    Produces the same ``ChatEvent`` stream. Tool executors run in worker
+    threads so a slow executor does not block the event loop;
+    ``tool_execution`` bounds how many run at once and for how long.
+    """
+
+    policy = tool_execution or _DEFAULT_TOOL_EXECUTION
+    turn = _start_assistant_turn(state, resources)
+    yield turn.emit(make_event("message_started", message_id=turn.message_id, role="assistant"))
+
+    for _ in range(_MAX_TOOL_CONTINUATIONS):
+        adapter = _build_async_adapter(config.backend)
+        cycle = _CycleState()
+        request = turn.adapter_request(config, delta_batching)
+        turn.begin_tool_batch()
+        scheduler = _AsyncToolCallScheduler(policy, resources)
+        try:
+            async for event in adapter.stream(client, request):
+                yield turn.record_stream_event(cycle, event)
+                if policy.eager:
+                    _submit_completed_tool_call(turn, scheduler, cycle, event)
+                    async for result_event in _atool_result_events(turn, scheduler, block=False):
+                        yield result_event
+            turn.finish_stream(cycle, adapter)
+
+            if cycle.errored:
                 return
 
-            if execution.get("element") is not None:
-                placeholder_event = make_event(
-                    "renderer_placeholder_started",
-                    message_id=assistant_message_id,
-                    tool_call_id=tool_call.id,
-                    tool_name=tool_call.tool_name,
-                    card_policy=execution.get("card_policy", "replace"),
-                )
-                append_event(session, placeholder_event)
-                yield placeholder_event
+            if not cycle.tool_calls:
+                yield turn.completed()
+                return
 
-            if execution.get("element") is not None:
-                rendered_event = make_event(
-                    "renderer_completed",
-                    message_id=assistant_message_id,
-                    tool_call_id=tool_call.id,
-                    tool_name=tool_call.tool_name,
-                    element=execution["element"],
-                    card_policy=execution.get("card_policy", "replace"),
-                )
-                append_event(session, rendered_event)
-                yield rendered_event
+            _submit_remaining_tool_calls(turn, scheduler, cycle)
+            async for result_event in _atool_result_events(turn, scheduler, block=True):
+                yield result_event
+        except _ToolCallFailed as exc:
+            yield turn.failed(str(exc))
+            return
+        finally:
+            scheduler.cancel()
+        turn.end_tool_batch(cycle)
 
-            tool_output_text = str(execution.get("output_text", "success"))
-            if tool_output_text:
-                execution_result_event = make_event(
-                    "tool_call_completed",
-                    message_id=assistant_message_id,
-                    tool_call_id=tool_call.id,
-                    tool_name=tool_call.tool_name,
-                    arguments=raw_arguments,
-                    output=tool_output_text,
-                )
-                append_event(session, execution_result_event)
-                yield execution_result_event
-
-            tool_outputs.append(
-                {
-                    "type": "function_call_output",
-                    "call_id": tool_call.id,
-                    "output": tool_output_text,
-                }
-            )
-            tool_message_payloads.append(
-                {
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": tool_output_text,
-                }
-            )
+    yield turn.failed("Exceeded maximum tool-call continuations for one assistant turn.")
+
+
+def _submit_completed_tool_call(
+    turn: _AssistantTurn,
+    scheduler: _ToolCallScheduler | _AsyncToolCallScheduler,
+    cycle: _CycleState,
+    event: ChatEvent,
+) -> None:
+    if event["type"] != "tool_call_completed":
+        return
+    tool_call = cycle.tool_calls.get(event.get("tool_call_id") or "")
+    if tool_call is not None and not scheduler.is_submitted(tool_call.id):
+        scheduler.submit(tool_call, turn.register_tool_call(tool_call))
+
+
+def _submit_remaining_tool_calls(
+    turn: _AssistantTurn,
+    scheduler: _ToolCallScheduler | _AsyncToolCallScheduler,
+    cycle: _CycleState,
+) -> None:
+    for tool_call in cycle.tool_calls.values():
+        if not scheduler.is_submitted(tool_call.id):
+            scheduler.submit(tool_call, turn.register_tool_call(tool_call))
+
+
+def _tool_result_events(turn: _AssistantTurn, scheduler: _ToolCallScheduler, *, block: bool) -> Iterator[ChatEvent]:
+    for tool_call, execution in scheduler.results(block=block):
+        yield from turn.tool_result_events(tool_call, execution)
+
+
+async def _atool_result_events(
+    turn: _AssistantTurn,
+    scheduler: _AsyncToolCallScheduler,
+    *,
+    block: bool,
+) -> AsyncIterator[ChatEvent]:
+    async for tool_call, execution in scheduler.results(block=block):
+        for event in turn.tool_result_events(tool_call, execution):
+            yield event
 
-        chat_messages.append(
-            {
-                "role": "assistant",
-                "content": cycle.text or "",
-                "tool_calls": assistant_tool_calls_payload,
-            }
-        )
-        chat_messages.extend(tool_message_payloads)
 
-    error_event = make_event(
-        "message_error",
-        message_id=assistant_message_id,
-        error="Exceeded maximum tool-call continuations for one assistant turn.",
+def _start_assistant_turn(
+    state: StreamingSessionState | None,
+    resources: dict[str, Any] | None,
+) -> _AssistantTurn:
+    session = ensure_session_state(state)
+    return _AssistantTurn(
+        session=session,
+        message_id=new_message_id(),
+        instructions=build_system_prompt(resources),
+        chat_messages=_build_backend_messages(session),
+        resources=resources,
     )
-    append_event(session, error_event)
-    yield error_event
 
 
 def _build_adapter(backend: str) -> ResponsesStreamAdapter | ChatCompletionsStreamAdapter:
@@ -219,12 +664,20 @@ def _build_adapter(backend: str) -> ResponsesStreamAdapter | ChatCompletionsStre
     raise ValueError(f"Unsupported chat backend: {backend!r}")
 
 
+def _build_async_adapter(backend: str) -> AsyncResponsesStreamAdapter | AsyncChatCompletionsStreamAdapter:
+    if backend == "responses":
+        return AsyncResponsesStreamAdapter()
+    if backend == "chat_completions":
+        return AsyncChatCompletionsStreamAdapter()
+    raise ValueError(f"Unsupported chat backend: {backend!r}")
+
+
 def _build_backend_messages(state: StreamingSessionState) -> list[dict[str, Any]]:
     messages: list[dict[str, Any]] = []
     for message in state.messages:
         if message.role not in {"user", "assistant"}:
             continue
-        messages.append({"role": message.role, "content": message.content})
+        messages.append({"role": message.role, "content": str(message.content)})
     return messages
 
 
@@ -240,7 +693,7 @@ def _apply_cycle_event(cycle: _CycleState, event: ChatEvent) -> None:
             cycle.tool_calls[tool_call_id] = _CycleToolCall(
                 id=tool_call_id,
                 tool_name=event.get("tool_name", "tool"),
-                arguments=event.get("arguments", ""),
+                arguments=TextBuffer(event.get("arguments", "")),
             )
     elif event_type == "tool_call_delta":
         tool_call_id = event.get("tool_call_id")
@@ -252,7 +705,7 @@ def _apply_cycle_event(cycle: _CycleState, event: ChatEvent) -> None:
             cycle.tool_calls.setdefault(
                 tool_call_id,
                 _CycleToolCall(id=tool_call_id, tool_name=event.get("tool_name", "tool")),
-            ).arguments = event.get("arguments", "")
+            ).arguments = TextBuffer(event.get("arguments", ""))
     elif event_type == "message_error":
         cycle.errored = True
     if event.get("backend_response_id"):
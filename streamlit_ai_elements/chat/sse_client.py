@@ -0,0 +1,240 @@
+"""A lightweight streaming client for OpenAI-compatible endpoints.
+
+:class:`SSEChatClient` can be passed wherever the chat runtime expects an
+``OpenAI`` client. It only implements the streaming calls the adapters make
+(``client.responses.create`` and ``client.chat.completions.create``), speaks
+the server-sent events wire format over pooled keep-alive ``http.client``
+connections, and yields each ``data:`` payload as a plain dict. The adapters
+normalize those dicts directly, so no SDK model objects are built per token.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+import http.client
+import json
+import os
+import ssl
+import threading
+from typing import Any, Iterator, Mapping
+from urllib.parse import urlsplit
+
+
+_DEFAULT_BASE_URL = "https://api.openai.com/v1"
+_DONE = b"[DONE]"
+# Failures of an idle keep-alive connection the server already closed; the
+# request is retried once on a fresh connection.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class SSEClientError(RuntimeError):
+    """The endpoint rejected a request or reported an error mid-stream."""
+
+    def __init__(self, message: str, *, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class SSEChatClient:
+    """Streaming-only stand-in for ``OpenAI(...)`` that yields plain dicts.
+
+    ``api_key`` and ``base_url`` default to ``OPENAI_API_KEY`` and
+    ``OPENAI_BASE_URL`` like the SDK. Up to ``max_connections`` requests
+    stream at once; further requests wait for a free connection. Use it as a
+    context manager or call :meth:`close` to drop idle connections.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        *,
+        base_url: str | None = None,
+        timeout: float = 600.0,
+        max_connections: int = 4,
+        default_headers: Mapping[str, str] | None = None,
+    ) -> None:
+        base_url = base_url or os.environ.get("OPENAI_BASE_URL") or _DEFAULT_BASE_URL
+        parts = urlsplit(base_url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported base_url: {base_url!r}")
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1.")
+        self._path_prefix = parts.path.rstrip("/")
+        self._headers = {
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+            **dict(default_headers or {}),
+        }
+        api_key = api_key if api_key is not None else os.environ.get("OPENAI_API_KEY")
+        if api_key:
+            self._headers["Authorization"] = f"Bearer {api_key}"
+        self._timeout = timeout
+        self._pool = _ConnectionPool(parts.scheme, parts.hostname, parts.port, max_connections, timeout)
+        self.responses = _Endpoint(self, "/responses")
+        self.chat = _Chat(_Endpoint(self, "/chat/completions"))
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def __enter__(self) -> "SSEChatClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _stream(self, path: str, options: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        headers = dict(self._headers)
+        headers.update(options.pop("extra_headers", None) or {})
+        extra_body = options.pop("extra_body", None) or {}
+        options.pop("timeout", None)
+        body = json.dumps({**options, **extra_body, "stream": True}).encode("utf-8")
+        return self._iter_events(self._path_prefix + path, body, headers)
+
+    def _iter_events(self, path: str, body: bytes, headers: dict[str, str]) -> Iterator[dict[str, Any]]:
+        connection, response = self._send(path, body, headers)
+        reusable = False
+        try:
+            if response.status >= 400:
+                raise SSEClientError(_error_message(response.read(), response.status), status=response.status)
+            for payload in _iter_sse_payloads(response):
+                error = payload.get("error")
+                if error and "type" not in payload:
+                    raise SSEClientError(_error_text(error), status=response.status)
+                yield payload
+            response.read()
+            reusable = not response.will_close
+        finally:
+            self._pool.release(connection, reusable)
+
+    def _send(self, path: str, body: bytes, headers: dict[str, str]) -> tuple[Any, Any]:
+        connection, reused = self._pool.acquire()
+        try:
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                return connection, connection.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                connection.close()
+                connection.request("POST", path, body=body, headers=headers)
+                return connection, connection.getresponse()
+        except BaseException:
+            self._pool.release(connection, False)
+            raise
+
+
+class _Endpoint:
+    __slots__ = ("_client", "_path")
+
+    def __init__(self, client: SSEChatClient, path: str) -> None:
+        self._client = client
+        self._path = path
+
+    def create(self, **options: Any) -> Iterator[dict[str, Any]]:
+        if options.get("stream") is False:
+            raise ValueError("SSEChatClient only supports streaming requests.")
+        return self._client._stream(self._path, options)
+
+
+class _Chat:
+    __slots__ = ("completions",)
+
+    def __init__(self, completions: _Endpoint) -> None:
+        self.completions = completions
+
+
+class _ConnectionPool:
+    """Keep-alive connections to one host, handed out most recently used first."""
+
+    def __init__(self, scheme: str, host: str, port: int | None, size: int, timeout: float) -> None:
+        self._scheme = scheme
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._context = ssl.create_default_context() if scheme == "https" else None
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: deque[http.client.HTTPConnection] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Return a connection and whether it was reused from the idle pool."""
+
+        if not self._slots.acquire(timeout=self._timeout):
+            raise SSEClientError("Timed out waiting for a free connection.")
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        if self._scheme == "https":
+            connection = http.client.HTTPSConnection(self._host, self._port, timeout=self._timeout, context=self._context)
+        else:
+            connection = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+        return connection, False
+
+    def release(self, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            with self._lock:
+                self._idle.append(connection)
+        else:
+            connection.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection in idle:
+            connection.close()
+
+
+def _iter_sse_payloads(response: Any) -> Iterator[dict[str, Any]]:
+    """Parse ``data:`` fields of an event stream into dicts until ``[DONE]`` or EOF.
+
+    Multi-line data is joined per the SSE spec; an ``event:`` name fills in
+    ``type`` when the payload has none. Comments and other fields are skipped.
+    """
+
+    data: list[bytes] = []
+    event_name = None
+    for line in response:
+        line = line.rstrip(b"\r\n")
+        if line.startswith(b"data:"):
+            value = line[5:]
+            data.append(value[1:] if value.startswith(b" ") else value)
+            continue
+        if line:
+            if line.startswith(b"event:"):
+                event_name = line[6:].strip().decode("utf-8")
+            continue
+        if not data:
+            event_name = None
+            continue
+        raw = data[0] if len(data) == 1 else b"\n".join(data)
+        data = []
+        if raw == _DONE:
+            return
+        payload = json.loads(raw)
+        if event_name and isinstance(payload, dict) and "type" not in payload:
+            payload["type"] = event_name
+        event_name = None
+        if isinstance(payload, dict):
+            yield payload
+    if data and data[0] != _DONE:
+        payload = json.loads(b"\n".join(data))
+        if isinstance(payload, dict):
+            yield payload
+
+
+def _error_message(body: bytes, status: int) -> str:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        text = body.decode("utf-8", "replace").strip()
+        return f"HTTP {status}: {text}" if text else f"HTTP {status}"
+    if isinstance(payload, dict) and payload.get("error"):
+        return f"HTTP {status}: {_error_text(payload['error'])}"
+    return f"HTTP {status}"
+
+
+def _error_text(error: Any) -> str:
+    if isinstance(error, dict):
+        return str(error.get("message") or error)
+    return str(error)
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
 from typing import Any, Callable
 
 import streamlit as st
 
-from streamlit_ai_elements.runtime_resources import RuntimeResource, format_resources_for_prompt
+from streamlit_ai_elements.runtime_resources import RuntimeResource, format_resources_for_prompt, freeze_payload
+from streamlit_ai_elements.sql_resources import SQL_QUERY_TOOL, has_sql_resources, sql_query_tool_executor
+
+from .partial_json import IncrementalJSONParser
 
 
 SYSTEM_PROMPT = """\
@@ -247,9 +252,19 @@ PREBUILT_COMPONENT_HEIGHTS = {
     "excalidraw": 560,
 }
 
+_PREVIEW_TOOL_NAMES = frozenset({"js_raw", "prebuilt_component", "excalidraw"})
+
 ToolExecutor = Callable[[dict[str, Any], dict[str, RuntimeResource] | None], dict[str, Any]]
 _TOOL_EXECUTORS: dict[str, ToolExecutor] = {}
 
+_BUILTIN_TOOL_NAMES = frozenset(definition["name"] for definition in [*_FUNCTION_DEFINITIONS, SQL_QUERY_TOOL])
+# Definitions of tools added through ``register_tool_executor``, and the frozen
+# provider payloads built from them, keyed by (backend, includes sql_query).
+_CUSTOM_TOOL_DEFINITIONS: dict[str, dict[str, Any]] = {}
+_TOOL_PAYLOADS: dict[tuple[str, bool], tuple[list[dict[str, Any]], str]] = {}
+_TOOL_REGISTRY_LOCK = threading.Lock()
+_TOOL_REGISTRY_VERSION = 0
+
 
 def build_system_prompt(resources: dict[str, RuntimeResource] | None = None) -> str:
     prompt = SYSTEM_PROMPT
@@ -259,16 +274,86 @@ def build_system_prompt(resources: dict[str, RuntimeResource] | None = None) ->
     return prompt
 
 
-def build_chat_completions_tools() -> list[dict[str, Any]]:
-    return [{"type": "function", "function": definition} for definition in _FUNCTION_DEFINITIONS]
+def build_chat_completions_tools(resources: dict[str, RuntimeResource] | None = None) -> list[dict[str, Any]]:
+    return _tool_payload("chat_completions", resources)[0]
+
+
+def build_responses_tools(resources: dict[str, RuntimeResource] | None = None) -> list[dict[str, Any]]:
+    return _tool_payload("responses", resources)[0]
+
+
+def tool_schema_hash(backend: str = "responses", resources: dict[str, RuntimeResource] | None = None) -> str:
+    """Stable hash of the tool list sent to ``backend``.
+
+    It only changes when the tools themselves do (a tool definition is
+    registered, or ``sql_database`` resources come and go), and is the same
+    across processes, so it can key provider-side prompt caches.
+    """
+
+    return _tool_payload(backend, resources)[1]
+
+
+def _tool_payload(backend: str, resources: dict[str, RuntimeResource] | None) -> tuple[list[dict[str, Any]], str]:
+    """Return the frozen tool list for ``backend`` and its hash, built once per tool set.
+
+    Every request reuses the same read-only list, so request bodies stay
+    byte-identical across turns and the Excalidraw schema is not rebuilt for
+    every model cycle.
+    """
+
+    key = (backend, has_sql_resources(resources))
+    cached = _TOOL_PAYLOADS.get(key)
+    if cached is not None:
+        return cached
+
+    with _TOOL_REGISTRY_LOCK:
+        version = _TOOL_REGISTRY_VERSION
+        definitions = _function_definitions(key[1])
+    if backend == "chat_completions":
+        tools = [{"type": "function", "function": definition} for definition in definitions]
+    elif backend == "responses":
+        tools = [{"type": "function", **definition} for definition in definitions]
+    else:
+        raise ValueError(f"Unsupported chat backend: {backend!r}")
+    payload = freeze_payload(tools)
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    cached = (payload, hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest())
+    with _TOOL_REGISTRY_LOCK:
+        if version == _TOOL_REGISTRY_VERSION:
+            _TOOL_PAYLOADS.setdefault(key, cached)
+    return cached
+
+
+def _function_definitions(include_sql: bool) -> list[dict[str, Any]]:
+    definitions = [*_FUNCTION_DEFINITIONS, *_CUSTOM_TOOL_DEFINITIONS.values()]
+    if include_sql:
+        definitions.append(SQL_QUERY_TOOL)
+    return definitions
+
 
+def register_tool_executor(name: str, executor: ToolExecutor, definition: dict[str, Any] | None = None) -> None:
+    """Route tool calls named ``name`` to ``executor``.
 
-def build_responses_tools() -> list[dict[str, Any]]:
-    return [{"type": "function", **definition} for definition in _FUNCTION_DEFINITIONS]
+    With ``definition`` (a function schema with ``description`` and
+    ``parameters``), the tool is also offered to the model on every turn;
+    without it, only calls to an already advertised tool are handled.
+    """
 
+    global _TOOL_REGISTRY_VERSION
+    if definition is not None:
+        if definition.get("name", name) != name:
+            raise ValueError(f"Tool definition name {definition['name']!r} does not match {name!r}.")
+        if name in _BUILTIN_TOOL_NAMES:
+            raise ValueError(f"Cannot redefine the built-in tool {name!r}.")
+    with _TOOL_REGISTRY_LOCK:
+        _TOOL_EXECUTORS[name] = executor
+        if definition is not None:
+            _CUSTOM_TOOL_DEFINITIONS[name] = freeze_payload({"name": name, **definition})
+            _TOOL_REGISTRY_VERSION += 1
+            _TOOL_PAYLOADS.clear()
 
-def register_tool_executor(name: str, executor: ToolExecutor) -> None:
-    _TOOL_EXECUTORS[name] = executor
+
+register_tool_executor("sql_query", sql_query_tool_executor)
 
 
 def execute_tool_call(
@@ -323,6 +408,60 @@ def element_from_tool_call(tool_name: str, arguments: dict[str, Any]) -> dict[st
     return None
 
 
+def partial_element_from_tool_call(
+    tool_name: str,
+    arguments: IncrementalJSONParser,
+) -> dict[str, Any] | None:
+    """Build a preview element from tool arguments that are still streaming.
+
+    Only parts that are safe to draw are kept: complete Excalidraw shapes and
+    connectors, and ``js_raw`` markup and styles cut at the last closed tag or
+    rule. Scripts are never previewed. Returns ``None`` when nothing is ready.
+    """
+    if tool_name not in _PREVIEW_TOOL_NAMES:
+        return None
+    partial = arguments.value
+    if not isinstance(partial, dict):
+        return None
+    path = arguments.path
+
+    if tool_name == "js_raw":
+        html = _settled_text(partial, "html", path, ">")
+        if not html:
+            return None
+        return {"type": "js_raw", "args": {"html": html, "css": _settled_text(partial, "css", path, "}")}}
+
+    component_name = partial.get("component") if tool_name == "prebuilt_component" else tool_name
+    if component_name != "excalidraw" or path[:1] == ("component",):
+        return None
+    shapes = _settled_items(partial, "shapes", path)
+    if not shapes:
+        return None
+    return {
+        "type": "prebuilt_component",
+        "component": "excalidraw",
+        "args": {"shapes": shapes, "connectors": _settled_items(partial, "connectors", path)},
+    }
+
+
+def _settled_items(partial: dict[str, Any], field_name: str, path: tuple[str | int, ...]) -> list[dict[str, Any]]:
+    items = partial.get(field_name)
+    if not isinstance(items, list):
+        return []
+    if path[:1] == (field_name,) and len(path) > 1 and isinstance(path[1], int):
+        items = items[: path[1]]
+    return [item for item in items if isinstance(item, dict)]
+
+
+def _settled_text(partial: dict[str, Any], field_name: str, path: tuple[str | int, ...], boundary: str) -> str:
+    text = partial.get(field_name)
+    if not isinstance(text, str):
+        return ""
+    if path[:1] == (field_name,):
+        text = text[: text.rfind(boundary) + 1]
+    return text
+
+
 def parse_tool_arguments(raw_arguments: str | None) -> dict[str, Any]:
     if not raw_arguments:
         return {}
@@ -336,6 +475,11 @@ def validate_tool_call(tool_name: str, arguments: dict[str, Any]) -> str | None:
     if tool_name == "sandbox" and not str(arguments.get("js", "")).strip():
         return "Sandbox tool calls require a non-empty `js` field."
 
+    if tool_name == "sql_query":
+        if not str(arguments.get("resource", "")).strip() or not str(arguments.get("sql", "")).strip():
+            return "sql_query tool calls require non-empty `resource` and `sql` fields."
+        return None
+
     if tool_name not in {"prebuilt_component", "vega_lite", "excalidraw"}:
         return None
 
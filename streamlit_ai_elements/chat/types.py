@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+import itertools
+import os
+import time
 from typing import Any, Literal, TypedDict
 from uuid import uuid4
 
+from .partial_json import IncrementalJSONParser
+
 
 ChatEventType = Literal[
     "message_started",
@@ -44,6 +49,90 @@ class ChatEvent(TypedDict, total=False):
     backend_response_id: str
 
 
+class TextBuffer:
+    """Append-only text that joins its chunks lazily and caches the result.
+
+    Streamed deltas are appended in O(1); the joined string is materialized on
+    first read and reused until the next append. The buffer compares equal to
+    the ``str`` it holds and forwards unknown attributes to it, so existing
+    string-style reads keep working. Call ``str()`` before handing it to APIs
+    that require a real ``str`` such as ``json.dumps``.
+    """
+
+    __slots__ = ("_chunks", "_length", "_value")
+
+    def __init__(self, text: str = "") -> None:
+        text = str(text)
+        self._chunks: list[str] = [text] if text else []
+        self._length = len(text)
+        self._value: str | None = text
+
+    def append(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        self._value = None
+
+    @property
+    def value(self) -> str:
+        if self._value is None:
+            self._value = "".join(self._chunks)
+            self._chunks = [self._value]
+        return self._value
+
+    def __iadd__(self, chunk: str) -> TextBuffer:
+        self.append(str(chunk))
+        return self
+
+    def __add__(self, other: object) -> str:
+        return self.value + str(other)
+
+    def __radd__(self, other: object) -> str:
+        return str(other) + self.value
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"TextBuffer({self.value!r})"
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.value, format_spec)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TextBuffer):
+            return self._length == other._length and self.value == other.value
+        if isinstance(other, str):
+            return self._length == len(other) and self.value == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.value
+
+    def __getitem__(self, index: int | slice) -> str:
+        return self.value[index]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.value, name)
+
+    def __getstate__(self) -> str:
+        return self.value
+
+    def __setstate__(self, state: str) -> None:
+        self._chunks = [state] if state else []
+        self._length = len(state)
+        self._value = state
+
+
 @dataclass(slots=True)
 class ChatBackendConfig:
     """Backend and model selection for streamed chat."""
@@ -57,6 +146,57 @@ class ChatBackendConfig:
     extra_request_options: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(slots=True)
+class ToolExecutionPolicy:
+    """How the tool calls of one assistant cycle are executed.
+
+    The default runs tool calls one by one on the calling thread once the
+    model stream for the cycle has ended. Raising ``max_concurrency`` runs up
+    to that many calls at once on worker threads; ``timeout`` bounds each call
+    in seconds and reports a timed-out call back to the model as a tool output
+    instead of failing the turn; its worker stays busy until the call returns,
+    and once every worker is, calls that have not started are reported as
+    skipped. With ``eager=True`` each call starts as soon
+    as the backend reports its arguments complete, while the model is still
+    streaming later calls or text. Tool result events and tool outputs are
+    always emitted in the order the calls were started.
+    """
+
+    max_concurrency: int = 1
+    timeout: float | None = None
+    eager: bool = False
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError("timeout must be positive when provided.")
+
+
+@dataclass(slots=True)
+class DeltaBatchingPolicy:
+    """How adjacent streamed deltas are merged before they reach the timeline.
+
+    Consecutive ``text_delta``, ``reasoning_delta`` or ``tool_call_delta``
+    events for the same target are combined into one event of at most
+    ``max_chars`` characters (a single larger delta is kept whole). A delta
+    only joins a batch that started less than ``max_latency`` seconds ago. A
+    batch is emitted once an event arrives that cannot join it, when the
+    stream ends, and — for async turns — once ``max_latency`` passes while the
+    stream is stalled. Sync turns only see time pass between events, so a
+    stall there holds the pending batch until the next event or the end.
+    """
+
+    max_chars: int = 256
+    max_latency: float = 0.05
+
+    def __post_init__(self) -> None:
+        if self.max_chars < 1:
+            raise ValueError("max_chars must be at least 1.")
+        if self.max_latency < 0:
+            raise ValueError("max_latency must not be negative.")
+
+
 @dataclass(slots=True)
 class AssistantChunk:
     """A visible streamed chunk within an assistant message."""
@@ -66,58 +206,216 @@ class AssistantChunk:
     status: MessageStatus = "streaming"
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, init=False)
 class ToolCallEventState:
-    """Runtime state for one tool call inside a message."""
+    """Runtime state for one tool call inside a message.
+
+    ``arguments`` is a plain ``str``; streamed argument deltas go into a
+    private :class:`TextBuffer` through :meth:`append_arguments`.
+    """
 
     id: str
     tool_name: str
-    status: ToolStatus = "streaming"
-    arguments: str = ""
-    output: str = ""
-    element: dict[str, Any] | None = None
-    card_policy: ToolCardPolicy = "replace"
-    error: str | None = None
-
-
-@dataclass(slots=True)
+    status: ToolStatus
+    _arguments: TextBuffer
+    output: str
+    element: dict[str, Any] | None
+    card_policy: ToolCardPolicy
+    error: str | None
+    partial_arguments: IncrementalJSONParser | None = field(repr=False, compare=False)
+
+    def __init__(
+        self,
+        id: str,
+        tool_name: str,
+        status: ToolStatus = "streaming",
+        arguments: str | TextBuffer = "",
+        output: str = "",
+        element: dict[str, Any] | None = None,
+        card_policy: ToolCardPolicy = "replace",
+        error: str | None = None,
+        partial_arguments: IncrementalJSONParser | None = None,
+    ) -> None:
+        self.id = id
+        self.tool_name = tool_name
+        self.status = status
+        self._arguments = TextBuffer(str(arguments))
+        self.output = output
+        self.element = element
+        self.card_policy = card_policy
+        self.error = error
+        self.partial_arguments = partial_arguments
+        if self.partial_arguments is None:
+            self.partial_arguments = IncrementalJSONParser(self.arguments)
+
+    @property
+    def arguments(self) -> str:
+        return self._arguments.value
+
+    @arguments.setter
+    def arguments(self, value: str) -> None:
+        self._arguments = TextBuffer(str(value))
+
+    def append_arguments(self, delta: str) -> None:
+        self._arguments.append(delta)
+
+    def replace_arguments(self, arguments: str) -> None:
+        self._arguments = TextBuffer(arguments)
+        self.partial_arguments = IncrementalJSONParser(arguments)
+
+
+@dataclass(slots=True, init=False)
 class ToolCallCard:
-    """Presentation-oriented state for a tool call card."""
+    """Presentation-oriented state for a tool call card.
+
+    Cards built by the timeline reducer are updated in place and share their
+    argument buffer and ``partial_arguments`` parser with the matching
+    :class:`ToolCallEventState`; ``argument_preview`` reads it as a ``str``.
+    """
 
     id: str
     tool_name: str
     status: ToolStatus
-    argument_preview: str = ""
-    output_preview: str = ""
-    element: dict[str, Any] | None = None
-    card_policy: ToolCardPolicy = "replace"
-
-
-@dataclass(slots=True)
+    _argument_preview: TextBuffer
+    output_preview: str
+    element: dict[str, Any] | None
+    card_policy: ToolCardPolicy
+    partial_arguments: IncrementalJSONParser | None = field(repr=False, compare=False)
+
+    def __init__(
+        self,
+        id: str,
+        tool_name: str,
+        status: ToolStatus,
+        argument_preview: str | TextBuffer = "",
+        output_preview: str = "",
+        element: dict[str, Any] | None = None,
+        card_policy: ToolCardPolicy = "replace",
+        partial_arguments: IncrementalJSONParser | None = None,
+    ) -> None:
+        self.id = id
+        self.tool_name = tool_name
+        self.status = status
+        self._argument_preview = TextBuffer(str(argument_preview))
+        self.output_preview = output_preview
+        self.element = element
+        self.card_policy = card_policy
+        self.partial_arguments = partial_arguments
+
+    @property
+    def argument_preview(self) -> str:
+        return self._argument_preview.value
+
+    @argument_preview.setter
+    def argument_preview(self, value: str) -> None:
+        self._argument_preview = TextBuffer(str(value))
+
+
+@dataclass(slots=True, init=False)
 class ChatMessage:
-    """A reconstructed chat message from timeline events."""
+    """A reconstructed chat message from timeline events.
+
+    ``content`` and ``reasoning`` are plain ``str``. Streamed deltas go into
+    private :class:`TextBuffer` fields through :meth:`append_content` and
+    :meth:`append_reasoning`, which the timeline reducer uses.
+    """
 
     id: str
     role: MessageRole
-    status: MessageStatus = "streaming"
-    content: str = ""
-    reasoning: str = ""
-    tool_calls: list[ToolCallCard] = field(default_factory=list)
-    rendered_elements: list[dict[str, Any]] = field(default_factory=list)
-    error: str | None = None
+    status: MessageStatus
+    _content: TextBuffer
+    _reasoning: TextBuffer
+    tool_calls: list[ToolCallCard]
+    rendered_elements: list[dict[str, Any]]
+    error: str | None
+
+    def __init__(
+        self,
+        id: str,
+        role: MessageRole,
+        status: MessageStatus = "streaming",
+        content: str | TextBuffer = "",
+        reasoning: str | TextBuffer = "",
+        tool_calls: list[ToolCallCard] | None = None,
+        rendered_elements: list[dict[str, Any]] | None = None,
+        error: str | None = None,
+    ) -> None:
+        self.id = id
+        self.role = role
+        self.status = status
+        self._content = TextBuffer(str(content))
+        self._reasoning = TextBuffer(str(reasoning))
+        self.tool_calls = [] if tool_calls is None else tool_calls
+        self.rendered_elements = [] if rendered_elements is None else rendered_elements
+        self.error = error
+
+    @property
+    def content(self) -> str:
+        return self._content.value
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self._content = TextBuffer(str(value))
+
+    @property
+    def reasoning(self) -> str:
+        return self._reasoning.value
+
+    @reasoning.setter
+    def reasoning(self, value: str) -> None:
+        self._reasoning = TextBuffer(str(value))
+
+    def append_content(self, delta: str) -> None:
+        self._content.append(delta)
+
+    def append_reasoning(self, delta: str) -> None:
+        self._reasoning.append(delta)
 
 
 @dataclass(slots=True)
 class StreamingSessionState:
-    """Append-only timeline plus reconstructed message state."""
+    """Append-only timeline plus reconstructed message state.
+
+    ``messages_by_id``, ``tool_states`` and ``tool_cards`` are the reducer
+    indexes that let :func:`append_event` apply one event at a time instead of
+    replaying the whole timeline.
+    """
 
     session_id: str
     timeline: list[ChatEvent] = field(default_factory=list)
     messages: list[ChatMessage] = field(default_factory=list)
+    messages_by_id: dict[str, ChatMessage] = field(default_factory=dict, repr=False, compare=False)
+    tool_states: dict[tuple[str, str], ToolCallEventState] = field(
+        default_factory=dict,
+        repr=False,
+        compare=False,
+    )
+    tool_cards: dict[tuple[str, str], ToolCallCard] = field(default_factory=dict, repr=False, compare=False)
+
+
+def _event_id_prefix() -> str:
+    return f"evt_{time.time_ns() // 1_000_000:011x}{os.urandom(3).hex()}"
+
+
+# Event ids are a per-process prefix (start time in ms plus random bits) and a
+# fixed-width counter: unique across processes and replays, and they sort in
+# creation order within a process, and by process start time across processes.
+_EVENT_ID_PREFIX = _event_id_prefix()
+_EVENT_COUNTER = itertools.count()
+
+
+def _reset_event_ids() -> None:
+    global _EVENT_ID_PREFIX, _EVENT_COUNTER
+    _EVENT_ID_PREFIX = _event_id_prefix()
+    _EVENT_COUNTER = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_event_ids)
 
 
 def new_event_id() -> str:
-    return f"evt_{uuid4().hex}"
+    return f"{_EVENT_ID_PREFIX}{next(_EVENT_COUNTER):010x}"
 
 
 def new_message_id() -> str:
@@ -144,8 +442,7 @@ def create_session_state(
 
 def append_event(state: StreamingSessionState, event: ChatEvent) -> StreamingSessionState:
     state.timeline.append(event)
-    replayed = replay_timeline(state.timeline, session_id=state.session_id)
-    state.messages = replayed.messages
+    apply_event(state, event)
     return state
 
 
@@ -154,114 +451,123 @@ def replay_timeline(
     *,
     session_id: str | None = None,
 ) -> StreamingSessionState:
-    state = StreamingSessionState(session_id=session_id or new_session_id(), timeline=list(timeline))
-    messages_by_id: dict[str, ChatMessage] = {}
-    tool_states: dict[tuple[str, str], ToolCallEventState] = {}
-
-    for event in timeline:
-        event_type = event["type"]
-        message_id = event.get("message_id")
-        if event_type == "message_started":
-            if not message_id:
-                continue
-            message = ChatMessage(
-                id=message_id,
-                role=event.get("role", "assistant"),
-                status="streaming",
-            )
-            messages_by_id[message_id] = message
-            state.messages.append(message)
-            continue
-
-        if not message_id or message_id not in messages_by_id:
-            continue
-
-        message = messages_by_id[message_id]
-        if event_type == "text_delta":
-            message.content += event.get("delta", "")
-        elif event_type == "reasoning_delta":
-            message.reasoning += event.get("delta", "")
-        elif event_type == "tool_call_started":
-            tool_call_id = event.get("tool_call_id")
-            if not tool_call_id:
-                continue
-            existing_tool_state = tool_states.get((message_id, tool_call_id))
-            if existing_tool_state is None:
-                tool_state = ToolCallEventState(
-                    id=tool_call_id,
-                    tool_name=event.get("tool_name", "tool"),
-                    status="streaming",
-                    arguments=event.get("arguments", ""),
-                )
-                tool_states[(message_id, tool_call_id)] = tool_state
-                message.tool_calls.append(
-                    ToolCallCard(
-                        id=tool_call_id,
-                        tool_name=tool_state.tool_name,
-                        status=tool_state.status,
-                        argument_preview=tool_state.arguments,
-                    )
-                )
-            else:
-                existing_tool_state.tool_name = event.get("tool_name", existing_tool_state.tool_name)
-                existing_tool_state.arguments = event.get("arguments", existing_tool_state.arguments)
-                existing_tool_state.status = "streaming"
-                _sync_tool_card(message, existing_tool_state)
-        elif event_type == "tool_call_delta":
-            tool_call_id = event.get("tool_call_id")
-            tool_state = tool_states.get((message_id, tool_call_id or ""))
-            if tool_state is None:
-                continue
-            tool_state.arguments += event.get("delta", "")
-            _sync_tool_card(message, tool_state)
-        elif event_type == "tool_call_completed":
-            tool_call_id = event.get("tool_call_id")
-            tool_state = tool_states.get((message_id, tool_call_id or ""))
-            if tool_state is None:
-                continue
-            tool_state.status = "completed"
-            tool_state.arguments = event.get("arguments", tool_state.arguments)
-            tool_state.output = event.get("output", tool_state.output)
-            _sync_tool_card(message, tool_state)
-        elif event_type == "renderer_placeholder_started":
-            tool_call_id = event.get("tool_call_id")
-            tool_state = tool_states.get((message_id, tool_call_id or ""))
-            if tool_state is None:
-                continue
-            tool_state.status = "rendering"
-            tool_state.card_policy = event.get("card_policy", tool_state.card_policy)
-            _sync_tool_card(message, tool_state)
-        elif event_type == "renderer_completed":
-            tool_call_id = event.get("tool_call_id")
-            tool_state = tool_states.get((message_id, tool_call_id or ""))
-            if tool_state is None:
-                continue
-            tool_state.status = "completed"
-            tool_state.element = event.get("element")
-            tool_state.card_policy = event.get("card_policy", tool_state.card_policy)
-            if tool_state.element is not None:
-                message.rendered_elements.append(tool_state.element)
-            _sync_tool_card(message, tool_state)
-        elif event_type == "message_completed":
-            message.status = "completed"
-        elif event_type == "message_error":
-            message.status = "error"
-            message.error = event.get("error") or "Unknown streaming error."
+    """Rebuild session state from scratch; use for cold starts only."""
 
+    state = StreamingSessionState(session_id=session_id or new_session_id(), timeline=list(timeline))
+    for event in state.timeline:
+        apply_event(state, event)
     return state
 
 
-def _sync_tool_card(message: ChatMessage, tool_state: ToolCallEventState) -> None:
-    for index, tool_card in enumerate(message.tool_calls):
-        if tool_card.id != tool_state.id:
-            continue
-        message.tool_calls[index] = ToolCallCard(
-            id=tool_state.id,
-            tool_name=tool_state.tool_name,
-            status=tool_state.status,
-            argument_preview=tool_state.arguments,
-            output_preview=tool_state.output,
-            element=tool_state.element,
-            card_policy=tool_state.card_policy,
+def apply_event(state: StreamingSessionState, event: ChatEvent) -> None:
+    """Fold one timeline event into ``state.messages`` without touching the timeline."""
+
+    messages_by_id = state.messages_by_id
+    tool_states = state.tool_states
+    tool_cards = state.tool_cards
+    event_type = event["type"]
+    message_id = event.get("message_id")
+    if event_type == "message_started":
+        if not message_id:
+            return
+        message = ChatMessage(
+            id=message_id,
+            role=event.get("role", "assistant"),
+            status="streaming",
         )
+        messages_by_id[message_id] = message
+        state.messages.append(message)
+        return
+
+    if not message_id or message_id not in messages_by_id:
+        return
+
+    message = messages_by_id[message_id]
+    if event_type == "text_delta":
+        message.append_content(event.get("delta", ""))
+    elif event_type == "reasoning_delta":
+        message.append_reasoning(event.get("delta", ""))
+    elif event_type == "tool_call_started":
+        tool_call_id = event.get("tool_call_id")
+        if not tool_call_id:
+            return
+        tool_key = (message_id, tool_call_id)
+        existing_tool_state = tool_states.get(tool_key)
+        if existing_tool_state is None:
+            tool_state = ToolCallEventState(
+                id=tool_call_id,
+                tool_name=event.get("tool_name", "tool"),
+                status="streaming",
+                arguments=event.get("arguments", ""),
+            )
+            tool_states[tool_key] = tool_state
+            tool_card = ToolCallCard(
+                id=tool_call_id,
+                tool_name=tool_state.tool_name,
+                status=tool_state.status,
+                partial_arguments=tool_state.partial_arguments,
+            )
+            tool_card._argument_preview = tool_state._arguments
+            tool_cards[tool_key] = tool_card
+            message.tool_calls.append(tool_card)
+        else:
+            existing_tool_state.tool_name = event.get("tool_name", existing_tool_state.tool_name)
+            if "arguments" in event:
+                existing_tool_state.replace_arguments(event["arguments"])
+            existing_tool_state.status = "streaming"
+            _sync_tool_card(tool_cards.get(tool_key), existing_tool_state)
+    elif event_type == "tool_call_delta":
+        tool_key = (message_id, event.get("tool_call_id") or "")
+        tool_state = tool_states.get(tool_key)
+        if tool_state is None:
+            return
+        # The card shares the buffer and parser, so the delta is visible without a sync.
+        delta = event.get("delta", "")
+        tool_state.append_arguments(delta)
+        tool_state.partial_arguments.feed(delta)
+    elif event_type == "tool_call_completed":
+        tool_key = (message_id, event.get("tool_call_id") or "")
+        tool_state = tool_states.get(tool_key)
+        if tool_state is None:
+            return
+        tool_state.status = "completed"
+        if "arguments" in event:
+            tool_state.replace_arguments(event["arguments"])
+        tool_state.output = event.get("output", tool_state.output)
+        _sync_tool_card(tool_cards.get(tool_key), tool_state)
+    elif event_type == "renderer_placeholder_started":
+        tool_key = (message_id, event.get("tool_call_id") or "")
+        tool_state = tool_states.get(tool_key)
+        if tool_state is None:
+            return
+        tool_state.status = "rendering"
+        tool_state.card_policy = event.get("card_policy", tool_state.card_policy)
+        _sync_tool_card(tool_cards.get(tool_key), tool_state)
+    elif event_type == "renderer_completed":
+        tool_key = (message_id, event.get("tool_call_id") or "")
+        tool_state = tool_states.get(tool_key)
+        if tool_state is None:
+            return
+        tool_state.status = "completed"
+        tool_state.element = event.get("element")
+        tool_state.card_policy = event.get("card_policy", tool_state.card_policy)
+        if tool_state.element is not None:
+            message.rendered_elements.append(tool_state.element)
+        _sync_tool_card(tool_cards.get(tool_key), tool_state)
+    elif event_type == "message_completed":
+        message.status = "completed"
+    elif event_type == "message_error":
+        message.status = "error"
+        message.error = event.get("error") or "Unknown streaming error."
+
+
+def _sync_tool_card(tool_card: ToolCallCard | None, tool_state: ToolCallEventState) -> None:
+    if tool_card is None:
         return
+    tool_card.tool_name = tool_state.tool_name
+    tool_card.status = tool_state.status
+    tool_card._argument_preview = tool_state._arguments
+    tool_card.partial_arguments = tool_state.partial_arguments
+    tool_card.output_preview = tool_state.output
+    tool_card.element = tool_state.element
+    tool_card.card_policy = tool_state.card_policy
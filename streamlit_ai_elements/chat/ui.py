@@ -3,16 +3,18 @@
 from __future__ import annotations
 
 import json
+import time
 from typing import Any, Callable
 
 import streamlit as st
 
-from .tools import render_element
-from .types import ChatEvent, ChatMessage, StreamingSessionState, ToolCallCard, replay_timeline
+from .tools import partial_element_from_tool_call, render_element
+from .types import ChatEvent, ChatMessage, StreamingSessionState, ToolCallCard, append_event, replay_timeline
 
 
 ToolCardRenderer = Callable[[ToolCallCard, str, dict[str, Any] | None], None]
 _TOOL_CARD_RENDERERS: dict[str, ToolCardRenderer] = {}
+_COALESCED_EVENT_TYPES = frozenset({"text_delta", "reasoning_delta", "tool_call_delta"})
 
 
 def register_tool_card_renderer(name: str, renderer: ToolCardRenderer) -> None:
@@ -58,7 +60,7 @@ def render_chat_message(
             chat_reasoning(message.reasoning, expanded=message.status == "streaming")
 
         for index, tool_card in enumerate(message.tool_calls):
-            tool_key = f"{key_prefix}_{message.id}_tool_{tool_card.id or index}"
+            tool_key = _tool_card_key(key_prefix, message, tool_card, index)
             if render_nonce:
                 tool_key = f"{tool_key}_{render_nonce}"
             chat_tool_card(
@@ -96,26 +98,165 @@ def chat_stream(
     state: StreamingSessionState,
     resources: dict[str, Any] | None = None,
     key_prefix: str = "chat_stream",
+    max_redraws_per_second: float | None = 20.0,
 ) -> StreamingSessionState:
-    live_timeline = list(state.timeline)
+    """Render streamed events live, redrawing only the message regions that changed.
+
+    Events are folded into ``state`` incrementally; events that the producer
+    already appended to ``state`` (as ``stream_assistant_turn`` does) are not
+    appended twice. Tool cards keep the same Streamlit key for the whole turn,
+    and a card is no longer redrawn once it has mounted its rendered element.
+
+    Consecutive text, reasoning and tool-argument deltas are coalesced into at
+    most ``max_redraws_per_second`` redraws; any other event, and the end of
+    the stream, flushes immediately. Pass ``None`` to redraw on every event.
+    """
+
     placeholder = st.empty()
+    scheduler = _RenderScheduler(max_redraws_per_second)
+    live_view: _LiveMessageView | None = None
+    pending_redraw = False
     for event in events:
-        live_timeline.append(event)
-        live_state = replay_timeline(live_timeline, session_id=state.session_id)
-        if not live_state.messages:
+        if not _is_last_recorded_event(state, event):
+            append_event(state, event)
+        if not state.messages:
             continue
-        with placeholder.container():
-            render_chat_message(
-                live_state.messages[-1],
+        message = state.messages[-1]
+        if live_view is None or live_view.message_id != message.id:
+            live_view = _LiveMessageView(
+                placeholder.container(),
+                message,
                 key_prefix=key_prefix,
                 resources=resources,
-                render_nonce=str(len(live_timeline)),
             )
-        state.timeline = list(live_state.timeline)
-        state.messages = list(live_state.messages)
+        elif not scheduler.should_flush(event):
+            pending_redraw = True
+            continue
+        live_view.update(message)
+        scheduler.mark_flushed()
+        pending_redraw = False
+
+    if pending_redraw and live_view is not None:
+        live_view.update(state.messages_by_id[live_view.message_id])
     return state
 
 
+class _RenderScheduler:
+    """Time budget for coalescing streamed deltas into fewer redraws."""
+
+    def __init__(
+        self,
+        max_redraws_per_second: float | None,
+        *,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self._interval = 1.0 / max_redraws_per_second if max_redraws_per_second else 0.0
+        self._clock = clock or time.monotonic
+        self._last_flush: float | None = None
+
+    def should_flush(self, event: ChatEvent) -> bool:
+        if event["type"] not in _COALESCED_EVENT_TYPES or not self._interval:
+            return True
+        if self._last_flush is None:
+            return True
+        return self._clock() - self._last_flush >= self._interval
+
+    def mark_flushed(self) -> None:
+        self._last_flush = self._clock()
+
+
+class _LiveMessageView:
+    """Stable placeholders for one streaming message, redrawn region by region."""
+
+    def __init__(
+        self,
+        container: Any,
+        message: ChatMessage,
+        *,
+        key_prefix: str,
+        resources: dict[str, Any] | None,
+    ) -> None:
+        self.message_id = message.id
+        self._key_prefix = key_prefix
+        self._resources = resources
+        with container:
+            with st.chat_message(message.role):
+                self._reasoning_slot = st.empty()
+                self._tools_container = st.container()
+                self._content_slot = st.empty()
+                self._error_slot = st.empty()
+        self._tool_slots: dict[str, Any] = {}
+        self._mounted_tool_ids: set[str] = set()
+        self._signatures: dict[str, Any] = {}
+
+    def update(self, message: ChatMessage) -> None:
+        reasoning_signature = (len(message.reasoning), message.status == "streaming")
+        if self._changed("reasoning", reasoning_signature):
+            with self._reasoning_slot.container():
+                chat_reasoning(message.reasoning, expanded=message.status == "streaming")
+
+        for index, tool_card in enumerate(message.tool_calls):
+            self._update_tool_card(message, tool_card, index)
+
+        if self._changed("content", len(message.content)) and message.content:
+            self._content_slot.markdown(message.content)
+
+        if self._changed("error", message.error) and message.error:
+            self._error_slot.error(message.error)
+
+    def _update_tool_card(self, message: ChatMessage, tool_card: ToolCallCard, index: int) -> None:
+        tool_key = _tool_card_key(self._key_prefix, message, tool_card, index)
+        # Streamlit allows one element per key and run, so a mounted renderer stays put.
+        if tool_key in self._mounted_tool_ids:
+            return
+        if not self._changed(tool_key, _tool_card_signature(tool_card)):
+            return
+        slot = self._tool_slots.get(tool_key)
+        if slot is None:
+            with self._tools_container:
+                slot = st.empty()
+            self._tool_slots[tool_key] = slot
+        with slot.container():
+            chat_tool_card(tool_card, key=tool_key, resources=self._resources)
+        if tool_card.element is not None:
+            self._mounted_tool_ids.add(tool_key)
+
+    def _changed(self, region: str, signature: Any) -> bool:
+        if region in self._signatures and self._signatures[region] == signature:
+            return False
+        self._signatures[region] = signature
+        return True
+
+
+def _is_last_recorded_event(state: StreamingSessionState, event: ChatEvent) -> bool:
+    if not state.timeline:
+        return False
+    last_event = state.timeline[-1]
+    return last_event is event or (
+        "event_id" in event and last_event.get("event_id") == event["event_id"]
+    )
+
+
+def _tool_card_key(key_prefix: str, message: ChatMessage, tool_card: ToolCallCard, index: int) -> str:
+    return f"{key_prefix}_{message.id}_tool_{tool_card.id or index}"
+
+
+def _tool_card_signature(tool_card: ToolCallCard) -> tuple[Any, ...]:
+    # A previewing renderer card only redraws when the preview itself grows, and
+    # each redraw mounts the preview under a new key.
+    preview = None
+    if _TOOL_CARD_RENDERERS.get(tool_card.tool_name) is _render_renderer_tool_card:
+        preview = _renderer_preview(tool_card)
+    return (
+        tool_card.tool_name,
+        tool_card.status,
+        len(tool_card.argument_preview) if preview is None else _preview_token(preview),
+        tool_card.output_preview,
+        tool_card.element is not None,
+        tool_card.card_policy,
+    )
+
+
 def _render_generic_tool_card(
     card: ToolCallCard,
     key: str,
@@ -127,7 +268,7 @@ def _render_generic_tool_card(
     with st.expander(label, expanded=card.status != "completed"):
         if card.argument_preview:
             st.caption("Arguments")
-            st.code(_format_json_preview(card.argument_preview), language="json")
+            st.code(_format_json_preview(str(card.argument_preview)), language="json")
         if card.output_preview:
             st.caption("Output")
             st.code(card.output_preview)
@@ -144,19 +285,37 @@ def _render_renderer_tool_card(
         if card.element is not None:
             if card.argument_preview and card.card_policy == "augment":
                 with st.expander("Tool call", expanded=False):
-                    st.code(_format_json_preview(card.argument_preview), language="json")
+                    st.code(_format_json_preview(str(card.argument_preview)), language="json")
             render_element(card.element, key=key, resources=resources)
             return
 
+        preview = _renderer_preview(card)
+        if preview is not None:
+            render_element(preview, key=f"{key}_preview_{_preview_token(preview)}", resources=resources)
+            return
+
         if card.output_preview:
             st.warning(card.output_preview)
         if card.argument_preview:
             with st.expander("Tool call", expanded=card.status == "streaming"):
-                st.code(_format_json_preview(card.argument_preview), language="json")
+                st.code(_format_json_preview(str(card.argument_preview)), language="json")
         elif not card.output_preview:
             st.caption("Preparing renderer…")
 
 
+def _renderer_preview(card: ToolCallCard) -> dict[str, Any] | None:
+    if card.element is not None or card.status != "streaming" or card.partial_arguments is None:
+        return None
+    return partial_element_from_tool_call(card.tool_name, card.partial_arguments)
+
+
+def _preview_token(preview: dict[str, Any]) -> str:
+    args = preview["args"]
+    if preview["type"] == "js_raw":
+        return f"{len(args['html'])}_{len(args['css'])}"
+    return f"{len(args['shapes'])}_{len(args['connectors'])}"
+
+
 def _format_json_preview(raw_arguments: str) -> str:
     try:
         return json.dumps(json.loads(raw_arguments), ensure_ascii=True, indent=2)
@@ -0,0 +1,213 @@
+"""Column statistics for the dataframe summaries shown to the model.
+
+Head rows are a poor picture of sorted or skewed data, so summary prompt
+blocks describe each column with statistics computed over every row (null
+counts, cardinality, min/max, quantiles and the most common values) plus a
+sample drawn across the whole frame, stratified by a low-cardinality column
+when there is one. Profiles are computed in one vectorized pass per column
+and cached by the caller's content fingerprint.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import datetime
+import json
+import math
+import threading
+from typing import Any
+
+import numpy as np
+
+
+_TOP_K = 5
+_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+_MAX_PROFILES = 64
+_MAX_STRATA = 20
+_MAX_TEXT = 40
+_SAMPLE_SEED = 0
+
+_PROFILES: OrderedDict[Any, "DataframeProfile"] = OrderedDict()
+_PROFILES_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnProfile:
+    name: str
+    dtype: str
+    nulls: int
+    distinct: int | None = None
+    minimum: Any = None
+    maximum: Any = None
+    quantiles: tuple[tuple[float, Any], ...] = ()
+    top: tuple[tuple[Any, int], ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class DataframeProfile:
+    row_count: int
+    columns: tuple[ColumnProfile, ...]
+    sample: Any
+    stratified_by: str | None = None
+
+
+def profile_dataframe(df: Any, *, sample_rows: int, cache_key: Any = None) -> DataframeProfile:
+    """Profile ``df``, reusing the cached profile for ``cache_key`` when given."""
+
+    key = (cache_key, sample_rows) if cache_key is not None else None
+    if key is not None:
+        with _PROFILES_LOCK:
+            profile = _PROFILES.get(key)
+            if profile is not None:
+                _PROFILES.move_to_end(key)
+                return profile
+    profile = _build_profile(df, sample_rows)
+    if key is not None:
+        with _PROFILES_LOCK:
+            _PROFILES[key] = profile
+            while len(_PROFILES) > _MAX_PROFILES:
+                _PROFILES.popitem(last=False)
+    return profile
+
+
+def clear_profiles() -> None:
+    with _PROFILES_LOCK:
+        _PROFILES.clear()
+
+
+def format_column_profile(column: ColumnProfile) -> str:
+    """One prompt line, e.g. ``- amount: float64 (min -3.2, max 4.1, p50 0.01, ...)``."""
+
+    stats = []
+    if column.nulls:
+        stats.append(f"{column.nulls} nulls")
+    if column.minimum is not None:
+        stats.append(f"min {_format_value(column.minimum)}")
+        stats.append(f"max {_format_value(column.maximum)}")
+    if column.quantiles:
+        stats.append(" ".join(f"p{round(q * 100)} {_format_value(value)}" for q, value in column.quantiles))
+    if column.distinct is not None:
+        stats.append(f"{column.distinct} distinct")
+    if column.top:
+        stats.append("top " + ", ".join(f"{_format_value(value)} ({count})" for value, count in column.top))
+    suffix = f" ({'; '.join(stats)})" if stats else ""
+    return f"- {column.name}: {column.dtype}{suffix}"
+
+
+def _build_profile(df: Any, sample_rows: int) -> DataframeProfile:
+    columns = tuple(_profile_column(str(name), df.iloc[:, index]) for index, name in enumerate(df.columns))
+    stratum = next(
+        (
+            index
+            for index, column in enumerate(columns)
+            if column.top and column.distinct is not None and 1 < column.distinct <= _MAX_STRATA
+        ),
+        None,
+    )
+    positions = _sample_positions(df, sample_rows, stratum)
+    return DataframeProfile(
+        row_count=int(len(df)),
+        columns=columns,
+        sample=df.iloc[positions],
+        stratified_by=None if stratum is None else columns[stratum].name,
+    )
+
+
+def _profile_column(name: str, series: Any) -> ColumnProfile:
+    import pandas as pd
+    from pandas.api import types
+
+    dtype = series.dtype
+    nulls = int(series.isna().sum())
+    if types.is_bool_dtype(dtype):
+        counts = series.value_counts(dropna=True)
+        return ColumnProfile(name, str(dtype), nulls, int(len(counts)), top=_top_values(counts))
+    if types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        finite = values[np.isfinite(values)]
+        if not len(finite):
+            return ColumnProfile(name, str(dtype), nulls)
+        integer = types.is_integer_dtype(dtype)
+        quantiles = np.quantile(finite, _QUANTILES)
+        return ColumnProfile(
+            name,
+            str(dtype),
+            nulls,
+            int(series.nunique(dropna=True)),
+            minimum=_number(finite.min(), integer),
+            maximum=_number(finite.max(), integer),
+            quantiles=tuple((q, _number(value, integer)) for q, value in zip(_QUANTILES, quantiles)),
+        )
+    if types.is_datetime64_any_dtype(dtype):
+        present = series.dropna()
+        if not len(present):
+            return ColumnProfile(name, str(dtype), nulls)
+        return ColumnProfile(
+            name,
+            str(dtype),
+            nulls,
+            int(present.nunique()),
+            minimum=present.min(),
+            maximum=present.max(),
+        )
+    try:
+        counts = series.value_counts(dropna=True)
+    except TypeError:  # unhashable cells such as lists
+        return ColumnProfile(name, str(dtype), nulls)
+    return ColumnProfile(name, str(dtype), nulls, int(len(counts)), top=_top_values(counts))
+
+
+def _top_values(counts: Any) -> tuple[tuple[Any, int], ...]:
+    return tuple((value, int(count)) for value, count in counts.head(_TOP_K).items())
+
+
+def _number(value: Any, integer: bool) -> float | int:
+    return int(value) if integer else float(value)
+
+
+def _sample_positions(df: Any, sample_rows: int, stratum: int | None) -> np.ndarray:
+    """Row positions of a seeded sample spread over the whole frame.
+
+    With a stratum column (given by position, as labels need not be strings
+    or unique), every value (up to ``sample_rows`` of the largest
+    groups) contributes at least one row and the rest are allotted by group
+    size. The seed is fixed so the prompt stays stable while the data is.
+    """
+
+    row_count = len(df)
+    size = min(max(sample_rows, 0), row_count)
+    if not size:
+        return np.empty(0, dtype=np.intp)
+    rng = np.random.default_rng(_SAMPLE_SEED)
+    if stratum is None:
+        return np.sort(rng.choice(row_count, size=size, replace=False))
+
+    import pandas as pd
+
+    codes, _ = pd.factorize(df.iloc[:, stratum])
+    groups = [np.flatnonzero(codes == code) for code in range(codes.max() + 1)]
+    groups.sort(key=len, reverse=True)
+    groups = groups[:size]
+    sizes = np.array([len(group) for group in groups], dtype=float)
+    allotted = np.ones(len(groups), dtype=int)
+    remaining = size - len(groups)
+    if remaining:
+        extra = np.floor(sizes / sizes.sum() * remaining).astype(int)
+        extra[: remaining - extra.sum()] += 1
+        allotted = np.minimum(allotted + extra, sizes.astype(int))
+    chosen = [rng.choice(group, size=count, replace=False) for group, count in zip(groups, allotted)]
+    return np.sort(np.concatenate(chosen))
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, float):
+        return "nan" if math.isnan(value) else f"{value:.4g}"
+    if isinstance(value, (bool, np.bool_, int, np.integer)):
+        return str(value)
+    if isinstance(value, datetime.date) or hasattr(value, "isoformat"):
+        return value.isoformat()
+    text = str(value)
+    if len(text) > _MAX_TEXT:
+        text = text[: _MAX_TEXT - 3] + "..."
+    return json.dumps(text, ensure_ascii=True)
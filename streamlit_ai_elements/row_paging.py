@@ -0,0 +1,258 @@
+"""Serve row ranges of dataframe resources to ``js_raw`` / ``sandbox`` code.
+
+Renderers receive at most ``max_rows`` rows upfront. Beyond that, their
+JavaScript can call ``requestRows(name, {offset, limit, columns, filters,
+sort})``, which sends a ``row_request`` trigger to Python. On the rerun,
+:func:`page_resource_rows` filters, sorts and slices the resource's frame and
+the chunk is handed back to the pending promise, without re-running the
+renderer's code.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import threading
+from typing import Any, Mapping
+
+from .runtime_resources import (
+    RuntimeResource,
+    dataframe_records,
+    frame_fingerprint,
+    lookup_resource,
+    resource_frame,
+)
+
+
+ROW_REQUEST_EVENT = "row_request"
+_DEFAULT_PAGE_ROWS = 100
+_MAX_PAGE_ROWS = 5000
+_MAX_VIEWS = 32
+_FILTER_OPS = {"==", "!=", "<", "<=", ">", ">=", "in", "not in", "contains", "startswith", "isnull", "notnull"}
+
+# Row positions of filtered/sorted views, so paging through one view does not
+# re-filter the frame for every page.
+_VIEWS: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+_VIEWS_LOCK = threading.Lock()
+
+
+class RowRequestError(ValueError):
+    """A row request named an unknown resource or column, or an invalid filter."""
+
+
+def page_resource_rows(
+    registry: Mapping[str, RuntimeResource] | None,
+    request: Mapping[str, Any],
+    *,
+    resource_names: list[str] | tuple[str, ...] | None = None,
+) -> dict[str, Any]:
+    """Answer a ``requestRows`` call from a renderer.
+
+    Only dataframe resources the component requested in ``resource_names``
+    and that have ``frontend_access="full"`` can be paged. ``filters`` is a
+    list of ``{column, op, value}`` (ops: ``== != < <= > >= in``, ``not in``,
+    ``contains``, ``startswith``, ``isnull``, ``notnull``), all of which must
+    hold; ``sort`` is a column name or a list of ``{column, descending}``.
+    Errors are returned in the response rather than raised.
+    """
+
+    request_id = request.get("id")
+    name = str(request.get("resource") or "")
+    try:
+        definition = _pageable_resource(registry, name, resource_names)
+        page = _page(definition, request)
+    except RowRequestError as exc:
+        return {"id": request_id, "resource": name, "error": str(exc)}
+    return {"id": request_id, "resource": name, **page}
+
+
+def clear_row_views() -> None:
+    with _VIEWS_LOCK:
+        _VIEWS.clear()
+
+
+def _pageable_resource(
+    registry: Mapping[str, RuntimeResource] | None,
+    name: str,
+    resource_names: list[str] | tuple[str, ...] | None,
+) -> RuntimeResource:
+    if resource_names is not None and name not in {str(item) for item in resource_names}:
+        raise RowRequestError(f"Resource {name!r} was not requested by this component.")
+    definition = lookup_resource(registry, name)
+    if definition is None or definition.kind != "dataframe":
+        raise RowRequestError(f"Unknown dataframe resource: {name!r}")
+    if definition.frontend_access != "full":
+        raise RowRequestError(f"Rows of resource {name!r} are not available to frontend components.")
+    return definition
+
+
+def _page(definition: RuntimeResource, request: Mapping[str, Any]) -> dict[str, Any]:
+    df = resource_frame(definition)
+    filters = _as_list(request.get("filters"))
+    sort = _sort_keys(request.get("sort"))
+    columns = request.get("columns")
+    if columns is not None:
+        columns = _column_labels(df, [str(column) for column in _as_list(columns)])
+    offset = max(0, _as_int(request.get("offset"), 0))
+    limit = min(max(0, _as_int(request.get("limit"), _DEFAULT_PAGE_ROWS)), _MAX_PAGE_ROWS)
+
+    positions = _view_positions(df, filters, sort)
+    if positions is None:
+        view = df
+    else:
+        view = df.iloc[positions]
+    chunk = view.iloc[offset : offset + limit]
+    if columns is not None:
+        chunk = chunk[columns]
+    return {
+        "offset": offset,
+        "limit": limit,
+        "total_rows": int(len(view)),
+        "columns": [str(column) for column in chunk.columns],
+        "rows": dataframe_records(chunk),
+    }
+
+
+def _view_positions(df: Any, filters: list[Any], sort: list[tuple[str, bool]]) -> Any:
+    """Positions of the rows matching ``filters`` in ``sort`` order, or ``None`` for all rows as-is."""
+
+    if not filters and not sort:
+        return None
+    fingerprint = frame_fingerprint(df)
+    key = None
+    if fingerprint is not None:
+        key = (fingerprint, json.dumps(filters, sort_keys=True, default=str), tuple(sort))
+        with _VIEWS_LOCK:
+            positions = _VIEWS.get(key)
+            if positions is not None:
+                _VIEWS.move_to_end(key)
+                return positions
+
+    import numpy as np
+
+    mask = np.ones(len(df), dtype=bool)
+    for item in filters:
+        mask &= _filter_mask(df, item)
+    positions = np.flatnonzero(mask)
+    if sort:
+        labels = _column_labels(df, [column for column, _ in sort])
+        try:
+            ordered = df.iloc[positions].reset_index(drop=True).sort_values(
+                labels,
+                ascending=[not descending for _, descending in sort],
+                kind="stable",
+                na_position="last",
+            )
+        except TypeError as exc:
+            names = ", ".join(repr(column) for column, _ in sort)
+            raise RowRequestError(f"Cannot sort by {names}: the column(s) mix values that cannot be compared.") from exc
+        positions = positions[ordered.index.to_numpy()]
+
+    if key is not None:
+        with _VIEWS_LOCK:
+            _VIEWS[key] = positions
+            while len(_VIEWS) > _MAX_VIEWS:
+                _VIEWS.popitem(last=False)
+    return positions
+
+
+def _filter_mask(df: Any, item: Any) -> Any:
+    import pandas as pd
+
+    if not isinstance(item, Mapping):
+        raise RowRequestError("Each filter must be an object with `column`, `op` and `value`.")
+    column = str(item.get("column"))
+    op = str(item.get("op", "=="))
+    if op not in _FILTER_OPS:
+        raise RowRequestError(f"Unsupported filter op: {op!r}")
+    series = df[_column_labels(df, [column])[0]]
+    value = item.get("value")
+
+    if op == "isnull":
+        mask = series.isna()
+    elif op == "notnull":
+        mask = series.notna()
+    elif op in ("contains", "startswith"):
+        text = series.astype("string")
+        mask = text.str.contains(str(value), regex=False) if op == "contains" else text.str.startswith(str(value))
+    elif op in ("in", "not in"):
+        values = [_coerce(series, entry) for entry in _as_list(value)]
+        mask = series.isin(values)
+        if op == "not in":
+            mask = ~mask
+    else:
+        target = _coerce(series, value)
+        try:
+            mask = {
+                "==": series.__eq__,
+                "!=": series.__ne__,
+                "<": series.__lt__,
+                "<=": series.__le__,
+                ">": series.__gt__,
+                ">=": series.__ge__,
+            }[op](target)
+        except TypeError as exc:
+            raise RowRequestError(f"Cannot compare column {column!r} with {value!r}.") from exc
+    return pd.Series(mask, index=df.index).fillna(False).to_numpy(dtype=bool)
+
+
+def _coerce(series: Any, value: Any) -> Any:
+    """Turn JSON values into the column's type, e.g. ISO strings into timestamps."""
+
+    import pandas as pd
+    from pandas.api import types
+
+    if value is None or not isinstance(value, str):
+        return value
+    if types.is_datetime64_any_dtype(series.dtype):
+        try:
+            timestamp = pd.Timestamp(value)
+        except ValueError as exc:
+            raise RowRequestError(f"Invalid timestamp: {value!r}") from exc
+        timezone = getattr(series.dtype, "tz", None)
+        if timezone is not None:
+            return timestamp.tz_localize(timezone) if timestamp.tzinfo is None else timestamp.tz_convert(timezone)
+        return timestamp.tz_localize(None) if timestamp.tzinfo is not None else timestamp
+    if types.is_numeric_dtype(series.dtype) and not types.is_bool_dtype(series.dtype):
+        try:
+            return float(value)
+        except ValueError as exc:
+            raise RowRequestError(f"Invalid number: {value!r}") from exc
+    return value
+
+
+def _sort_keys(sort: Any) -> list[tuple[str, bool]]:
+    keys = []
+    for item in _as_list(sort):
+        if isinstance(item, Mapping):
+            keys.append((str(item.get("column")), bool(item.get("descending"))))
+        else:
+            keys.append((str(item), False))
+    return keys
+
+
+def _column_labels(df: Any, columns: list[str]) -> list[Any]:
+    """Map column names as sent by JavaScript (always strings) to the frame's labels, e.g. ``"0"`` to ``0``."""
+
+    labels = {str(column): column for column in df.columns}
+    missing = [column for column in columns if column not in labels]
+    if missing:
+        raise RowRequestError(f"Unknown column(s): {', '.join(repr(column) for column in missing)}")
+    return [labels[column] for column in columns]
+
+
+def _as_list(value: Any) -> list[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _as_int(value: Any, default: int) -> int:
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError) as exc:
+        raise RowRequestError(f"Expected an integer, got {value!r}.") from exc
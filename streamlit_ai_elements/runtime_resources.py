@@ -2,13 +2,55 @@
 
 from __future__ import annotations
 
+import base64
+from collections import OrderedDict
 from copy import deepcopy
 from dataclasses import dataclass, field, replace
+import datetime
+import functools
+import hashlib
 import json
-from typing import Any, Mapping
+import math
+import os
+from pathlib import Path
+import threading
+import time
+import types
+from typing import Any, Callable, Iterator, Mapping
+from uuid import uuid4
+import weakref
+
+from .dataframe_profile import clear_profiles, format_column_profile, profile_dataframe
 
 
 _ACCESS_LEVELS = {"none", "summary", "schema", "full"}
+_FRONTEND_FORMATS = {"rows", "columns", "arrow"}
+_DEFAULT_MAX_ROWS = 1000
+_DEFAULT_ARROW_MAX_ROWS = 100_000
+_ARROW_KEY_PREFIX = "__arrow__"
+_TYPED_ARRAY_DTYPES = {
+    "i1": "int8",
+    "i2": "int16",
+    "i4": "int32",
+    "u1": "uint8",
+    "u2": "uint16",
+    "u4": "uint32",
+    "f2": "float32",
+    "f4": "float32",
+    "f8": "float64",
+}
+_DEFAULT_PAYLOAD_CACHE_BYTES = 64 * 1024 * 1024
+_MAX_LAZY_FRAMES = 32
+_DEFAULT_SUMMARY_TOKENS = 600
+_LAZY_READERS = {
+    ".csv": ("read_csv", {}),
+    ".tsv": ("read_csv", {"sep": "\t"}),
+    ".parquet": ("read_parquet", {}),
+    ".pq": ("read_parquet", {}),
+    ".feather": ("read_feather", {}),
+    ".json": ("read_json", {}),
+    ".jsonl": ("read_json", {"lines": True}),
+}
 
 
 @dataclass(frozen=True, slots=True)
@@ -22,10 +64,108 @@ class RuntimeResource:
     frontend_access: str = "full"
     max_rows: int = 1000
     sample_rows: int = 5
+    frontend_format: str = "rows"
     metadata: dict[str, Any] = field(default_factory=dict)
     name: str | None = None
 
 
+class LazyDataFrame:
+    """Payload of :meth:`resource.lazy_dataframe`: loads its frame on demand."""
+
+    __slots__ = ("_loader", "_path", "_ttl", "_key", "_frame", "_loaded_at")
+
+    def __init__(
+        self,
+        loader: Callable[[], Any] | str | os.PathLike[str],
+        *,
+        ttl: float | datetime.timedelta | None = None,
+        key: Any = None,
+    ) -> None:
+        if isinstance(loader, (str, os.PathLike)):
+            path = Path(loader).expanduser()
+            if path.suffix.lower() not in _LAZY_READERS:
+                raise ValueError(f"Unsupported file type for a lazy dataframe: {path.suffix!r}")
+            self._path: Path | None = path
+        elif callable(loader):
+            self._path = None
+        else:
+            raise TypeError(f"lazy_dataframe expects a callable or a file path, got {type(loader).__name__}.")
+        if isinstance(ttl, datetime.timedelta):
+            ttl = ttl.total_seconds()
+        if ttl is not None and ttl < 0:
+            raise ValueError("ttl must be non-negative.")
+        self._loader = loader
+        self._ttl = ttl
+        self._key = key
+        self._frame: Any = None
+        self._loaded_at = 0.0
+
+    def load(self) -> Any:
+        """Return the frame, loading it if it is not cached or has expired."""
+
+        key = self._cache_key()
+        now = time.monotonic()
+        with _LAZY_FRAMES_LOCK:
+            if key is None:
+                entry = (self._frame, self._loaded_at) if self._frame is not None else None
+            else:
+                entry = _LAZY_FRAMES.get(key)
+                if entry is not None:
+                    _LAZY_FRAMES.move_to_end(key)
+            if entry is not None and (self._ttl is None or now - entry[1] < self._ttl):
+                return entry[0]
+
+        frame = self._read()
+        with _LAZY_FRAMES_LOCK:
+            if key is None:
+                self._frame, self._loaded_at = frame, now
+            else:
+                _LAZY_FRAMES[key] = (frame, now)
+                while len(_LAZY_FRAMES) > _MAX_LAZY_FRAMES:
+                    _LAZY_FRAMES.popitem(last=False)
+        return frame
+
+    def _read(self) -> Any:
+        import pandas as pd
+
+        if self._path is not None:
+            reader, options = _LAZY_READERS[self._path.suffix.lower()]
+            return getattr(pd, reader)(self._path, **options)
+        value = self._loader()
+        if hasattr(value, "dtypes") and hasattr(value, "head"):
+            return value
+        if isinstance(value, Mapping):
+            return pd.DataFrame(value)
+        items = list(value)
+        if items and all(isinstance(item, pd.DataFrame) for item in items):
+            return pd.concat(items, ignore_index=True)
+        return pd.DataFrame(items)
+
+    def _cache_key(self) -> tuple[Any, ...] | None:
+        """Key shared by equivalent loaders built on different reruns; ``None`` keeps the frame on this object."""
+
+        if self._key is not None:
+            key: tuple[Any, ...] = ("key", self._key)
+        elif self._path is not None:
+            path = self._path.resolve()
+            try:
+                modified = path.stat().st_mtime_ns
+            except OSError:
+                modified = None
+            key = ("path", str(path), modified)
+        else:
+            key = _loader_key(self._loader)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def __repr__(self) -> str:
+        source = self._path if self._path is not None else getattr(self._loader, "__qualname__", self._loader)
+        return f"LazyDataFrame({source!r}, ttl={self._ttl!r})"
+
+
 class _ResourceFactory:
     def dataframe(
         self,
@@ -34,11 +174,33 @@ class _ResourceFactory:
         description: str = "",
         ai_access: str = "summary",
         frontend_access: str = "full",
-        max_rows: int = 1000,
+        max_rows: int | None = None,
         sample_rows: int = 5,
+        frontend_format: str = "rows",
+        summary_tokens: int = _DEFAULT_SUMMARY_TOKENS,
     ) -> RuntimeResource:
+        """Expose a pandas DataFrame to the AI runtime and frontend renderers.
+
+        ``frontend_format="columns"`` ships the rows to JavaScript renderers
+        column by column, with numeric columns as base64-encoded typed
+        arrays. ``frontend_format="arrow"`` hands the rows to Streamlit as an
+        Arrow table, so they travel as Arrow IPC and reach the renderers
+        with typed columns; ``max_rows`` then defaults to 100,000 instead of
+        1,000. Either way the renderers still see a ``rows`` array, built
+        lazily on first access.
+
+        With ``ai_access`` "summary" or "full", the system prompt describes
+        each column with statistics over every row (nulls, cardinality,
+        min/max, quantiles, top values) and shows ``sample_rows`` rows
+        sampled across the frame, within roughly ``summary_tokens`` tokens.
+        ``summary_tokens=0`` shows the first rows and dtypes only.
+        """
+
         _validate_access(ai_access)
         _validate_access(frontend_access)
+        _validate_frontend_format(frontend_format)
+        if max_rows is None:
+            max_rows = _DEFAULT_ARROW_MAX_ROWS if frontend_format == "arrow" else _DEFAULT_MAX_ROWS
         return RuntimeResource(
             kind="dataframe",
             payload=df,
@@ -47,6 +209,49 @@ class _ResourceFactory:
             frontend_access=frontend_access,
             max_rows=max(0, int(max_rows)),
             sample_rows=max(0, int(sample_rows)),
+            frontend_format=frontend_format,
+            metadata={"summary_tokens": max(0, int(summary_tokens))},
+        )
+
+    def lazy_dataframe(
+        self,
+        loader: Callable[[], Any] | str | os.PathLike[str],
+        *,
+        ttl: float | datetime.timedelta | None = None,
+        key: Any = None,
+        description: str = "",
+        ai_access: str = "summary",
+        frontend_access: str = "full",
+        max_rows: int | None = None,
+        sample_rows: int = 5,
+        frontend_format: str = "rows",
+        summary_tokens: int = _DEFAULT_SUMMARY_TOKENS,
+    ) -> RuntimeResource:
+        """Like :meth:`dataframe`, but load the frame on first use.
+
+        ``loader`` is a zero-argument callable returning a DataFrame, an
+        iterable of DataFrames (such as a generator of chunks) or records,
+        or a path to a CSV, TSV, Parquet, Feather, JSON or JSONL file.
+        Nothing is loaded until a renderer or the prompt builder needs the
+        rows, so registered but unused resources are free. Loaded frames are
+        shared across reruns for ``ttl`` seconds (forever when ``None``) and
+        files are reloaded when they change. ``key`` overrides the cache
+        key, which otherwise comes from the path or the loader function: its
+        code, defaults, closure and the values of the globals it reads.
+        """
+
+        return replace(
+            self.dataframe(
+                None,
+                description=description,
+                ai_access=ai_access,
+                frontend_access=frontend_access,
+                max_rows=max_rows,
+                sample_rows=sample_rows,
+                frontend_format=frontend_format,
+                summary_tokens=summary_tokens,
+            ),
+            payload=LazyDataFrame(loader, ttl=ttl, key=key),
         )
 
     def sql_database(
@@ -59,19 +264,47 @@ class _ResourceFactory:
         allowed_tables: list[str] | None = None,
         schema: dict[str, list[str]] | None = None,
         allow_write: bool = False,
+        max_rows: int = 1000,
+        query_timeout: float | None = 10.0,
+        pool_size: int = 4,
+        cache_ttl: float | None = None,
     ) -> RuntimeResource:
+        """Describe a SQL database the assistant can query with the ``sql_query`` tool.
+
+        ``engine`` is a SQLite file path, a SQLAlchemy-style engine (anything
+        with ``raw_connection()``), a zero-argument DB-API connection factory
+        or a single DB-API connection. Queries may only touch
+        ``allowed_tables`` (when given) and must be read-only unless
+        ``allow_write``; each runs on one of ``pool_size`` pooled
+        connections, is interrupted after ``query_timeout`` seconds and
+        returns at most ``max_rows`` rows.
+
+        Read results of a SQLite file are cached until the file changes.
+        Other engines give no such signal, so their results are only cached
+        when ``cache_ttl`` is set, for at most that many seconds; ``cache_ttl``
+        also bounds SQLite results, and ``0`` disables caching.
+        """
+
         _validate_access(ai_access)
         _validate_access(frontend_access)
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1.")
+        if cache_ttl is not None and cache_ttl < 0:
+            raise ValueError("cache_ttl must not be negative.")
         return RuntimeResource(
             kind="sql_database",
             payload=engine,
             description=description,
             ai_access=ai_access,
             frontend_access=frontend_access,
+            max_rows=max(0, int(max_rows)),
             metadata={
                 "allowed_tables": list(allowed_tables or []),
                 "schema": deepcopy(schema or {}),
                 "allow_write": bool(allow_write),
+                "query_timeout": query_timeout,
+                "pool_size": int(pool_size),
+                "cache_ttl": cache_ttl,
             },
         )
 
@@ -79,6 +312,250 @@ class _ResourceFactory:
 resource = _ResourceFactory()
 
 
+@dataclass(frozen=True, slots=True)
+class PayloadCacheInfo:
+    """Counters for the materialized dataframe payload cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+
+def _read_only(self: Any, *args: Any, **kwargs: Any) -> Any:
+    raise TypeError(f"{type(self).__name__} is a read-only view of a cached runtime payload.")
+
+
+class _FrozenDict(dict):
+    """A ``dict`` that refuses mutation but still serializes as a plain dict.
+
+    Copies (``copy``/``deepcopy``/pickling) produce ordinary mutable dicts.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[Any, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[Any, Any]:
+        return {key: deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (dict, (dict(self),))
+
+
+class _FrozenList(list):
+    """A ``list`` that refuses mutation but still serializes as a plain list.
+
+    Copies (``copy``/``deepcopy``/pickling) produce ordinary mutable lists.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return [deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (list(self),))
+
+
+def freeze_payload(value: Any) -> Any:
+    """Recursively wrap JSON-like dicts and lists in read-only views."""
+
+    if isinstance(value, dict):
+        if type(value) is _FrozenDict:
+            return value
+        return _FrozenDict(
+            {key: freeze_payload(item) if isinstance(item, (dict, list)) else item for key, item in value.items()}
+        )
+    if isinstance(value, list):
+        if type(value) is _FrozenList:
+            return value
+        return _FrozenList(freeze_payload(item) if isinstance(item, (dict, list)) else item for item in value)
+    return value
+
+
+class DataframePayloadCache:
+    """LRU cache of materialized dataframe rows, bounded by the frame data behind them.
+
+    Entries are keyed by a content fingerprint of the dataframe plus the row
+    limits, so equal data resolves to the same entry across reruns, chat cards
+    and resource registries. Cached values are frozen (see :func:`freeze_payload`)
+    because every payload built from an entry shares them.
+
+    Each entry is charged the size the caller passes to :meth:`put`, which is
+    :func:`frame_size` of the rows it was built from, not the size of the
+    cached records or of the serialized payload. Python records and JSON
+    usually take several times more memory than those rows, so the bound is
+    an estimate rather than a hard limit.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._entries: OrderedDict[tuple[Any, ...], tuple[dict[str, Any], int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: tuple[Any, ...]) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: tuple[Any, ...], value: dict[str, Any], size: int) -> None:
+        with self._lock:
+            if size > self._max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._current_bytes += size
+            self._evict()
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> PayloadCacheInfo:
+        with self._lock:
+            return PayloadCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                current_bytes=self._current_bytes,
+                max_bytes=self._max_bytes,
+            )
+
+    def _evict(self) -> None:
+        while self._entries and self._current_bytes > self._max_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._current_bytes -= size
+            self._evictions += 1
+
+
+_PAYLOAD_CACHE = DataframePayloadCache(_DEFAULT_PAYLOAD_CACHE_BYTES)
+_MAX_EPHEMERAL_RESOURCES = 128
+_EPHEMERAL_RESOURCES: OrderedDict[str, tuple[RuntimeResource, Callable[[], Any], str | None]] = OrderedDict()
+_EPHEMERAL_LOCK = threading.Lock()
+_MAX_PROMPT_BLOCKS = 256
+_PROMPT_BLOCKS: OrderedDict[tuple[Any, ...], tuple[str, ...]] = OrderedDict()
+_PROMPT_BLOCKS_LOCK = threading.Lock()
+_LAZY_FRAMES: OrderedDict[tuple[Any, ...], tuple[Any, float]] = OrderedDict()
+_LAZY_FRAMES_LOCK = threading.Lock()
+_FRAME_FINGERPRINTS: dict[int, tuple[weakref.ref[Any], tuple[Any, ...]]] = {}
+# Reentrant: a weakref callback may run from garbage collection while the
+# same thread holds the lock.
+_FRAME_FINGERPRINTS_LOCK = threading.RLock()
+
+
+def payload_cache_info() -> PayloadCacheInfo:
+    """Return hit/miss counters and memory use of the dataframe payload cache."""
+
+    return _PAYLOAD_CACHE.info()
+
+
+def clear_payload_cache() -> None:
+    """Drop every cached dataframe payload, prompt block, profile and lazily loaded frame and reset the counters."""
+
+    _PAYLOAD_CACHE.clear()
+    with _PROMPT_BLOCKS_LOCK:
+        _PROMPT_BLOCKS.clear()
+    with _LAZY_FRAMES_LOCK:
+        _LAZY_FRAMES.clear()
+    with _FRAME_FINGERPRINTS_LOCK:
+        _FRAME_FINGERPRINTS.clear()
+    clear_profiles()
+
+
+def set_payload_cache_limit(max_bytes: int) -> None:
+    """Bound the dataframe payload cache to ``max_bytes`` of source frame data.
+
+    Entries are measured by the pandas memory use of the rows they were built
+    from, so the cached records themselves take more. Least recently used
+    entries are evicted first; ``0`` disables caching.
+    """
+
+    _PAYLOAD_CACHE.resize(max(0, int(max_bytes)))
+
+
+def register_ephemeral_resource(name: str, definition: RuntimeResource, source: Any) -> None:
+    """Keep a derived resource (such as a SQL query result) resolvable by name.
+
+    Ephemeral resources outlive the registry dict that is rebuilt on every
+    rerun, so replayed chat history can still render them. They are only
+    visible through registries that contain a resource whose payload is
+    ``source`` (or, for a file path such as a SQLite database, names the same
+    file), and the least recently used ones are dropped first. ``source`` is
+    held weakly where possible, so a resource does not keep an engine rebuilt
+    on every rerun alive.
+    """
+
+    try:
+        source_ref: Callable[[], Any] = weakref.ref(source)
+    except TypeError:
+
+        def source_ref() -> Any:
+            return source
+
+    with _EPHEMERAL_LOCK:
+        _EPHEMERAL_RESOURCES.pop(name, None)
+        _EPHEMERAL_RESOURCES[name] = (replace(definition, name=name), source_ref, _source_path(source))
+        while len(_EPHEMERAL_RESOURCES) > _MAX_EPHEMERAL_RESOURCES:
+            _EPHEMERAL_RESOURCES.popitem(last=False)
+
+
+def lookup_resource(registry: Mapping[str, RuntimeResource] | None, name: str) -> RuntimeResource | None:
+    """Resolve ``name`` in ``registry``, falling back to ephemeral resources visible from it."""
+
+    if registry and name in registry:
+        return registry[name]
+    with _EPHEMERAL_LOCK:
+        entry = _EPHEMERAL_RESOURCES.get(name)
+        if entry is not None:
+            _EPHEMERAL_RESOURCES.move_to_end(name)
+    if entry is None or not registry:
+        return None
+    definition, source_ref, path = entry
+    source = source_ref()
+    for candidate in registry.values():
+        if (source is not None and candidate.payload is source) or (path is not None and _source_path(candidate.payload) == path):
+            return definition
+    return None
+
+
+def _source_path(payload: Any) -> str | None:
+    """The resolved path of a path-like payload; reruns pass a new but equal ``str`` each time."""
+
+    if isinstance(payload, (str, os.PathLike)):
+        return os.path.realpath(os.path.expanduser(os.fspath(payload)))
+    return None
+
+
 def resources(**named_resources: RuntimeResource) -> dict[str, RuntimeResource]:
     """Build a validated runtime resource registry."""
 
@@ -127,8 +604,17 @@ def format_resources_for_prompt(registry: Mapping[str, RuntimeResource] | None)
 def resolve_frontend_resources(
     registry: Mapping[str, RuntimeResource] | None,
     requested_names: list[str] | tuple[str, ...] | None,
+    *,
+    frontend_format: str | None = None,
 ) -> dict[str, dict[str, Any]]:
-    """Materialize the requested resources for frontend renderers."""
+    """Materialize the requested resources for frontend renderers.
+
+    ``frontend_format`` overrides each dataframe resource's own format, for
+    consumers such as Vega-Lite that need plain rows.
+    """
+
+    if frontend_format is not None:
+        _validate_frontend_format(frontend_format)
 
     if not requested_names:
         return {}
@@ -140,18 +626,24 @@ def resolve_frontend_resources(
         name = str(raw_name)
         if name in resolved:
             continue
-        if name not in registry:
+        definition = lookup_resource(registry, name)
+        if definition is None:
             raise ValueError(f"Unknown runtime resource requested by component: {name!r}")
-
-        definition = registry[name]
         if definition.frontend_access == "none":
             raise ValueError(f"Runtime resource {name!r} is not available to frontend components.")
 
         if definition.kind == "dataframe":
             row_limit = definition.max_rows if definition.frontend_access == "full" else definition.sample_rows
-            payload = _materialize_dataframe_payload(name, definition, row_limit=row_limit)
+            payload = _materialize_dataframe_payload(
+                name,
+                definition,
+                row_limit=row_limit,
+                frontend_format=frontend_format or definition.frontend_format,
+            )
             if definition.frontend_access != "full":
                 payload.pop("rows", None)
+                payload.pop("column_data", None)
+                payload.pop("arrow_table", None)
                 payload["sample_rows"] = payload.pop("rows_preview", [])
             else:
                 payload["sample_rows"] = payload["rows_preview"]
@@ -207,17 +699,27 @@ def build_javascript_runtime(
     *,
     context: Mapping[str, Any] | None = None,
 ) -> dict[str, Any]:
-    """Build a stable runtime payload for JS-based renderers."""
+    """Build a stable runtime payload for JS-based renderers.
+
+    Arrow tables of ``"arrow"`` format dataframes are lifted to top-level
+    keys of the returned dict, the only place where Streamlit serializes them
+    as Arrow; each payload names its table in ``arrow_key``.
+
+    ``resources``, ``resource``, ``data`` and ``rows`` are read-only views
+    that share one copy of each payload (and the cached rows) instead of
+    deep copies; mutating them raises ``TypeError``.
+    """
 
-    resources_payload = deepcopy(dict(frontend_resources or {}))
+    frontend_resources, arrow_tables = _hoist_arrow_tables(frontend_resources or {})
+    resources_payload = freeze_payload(dict(frontend_resources))
     context_payload = deepcopy(dict(context or {}))
     primary_resource = _pick_single_resource(resources_payload)
 
     if primary_resource and primary_resource.get("kind") == "dataframe":
-        data_payload: Any = deepcopy(primary_resource)
-        rows_payload: list[Any] = deepcopy(primary_resource.get("rows") or [])
+        data_payload: Any = primary_resource
+        rows_payload: list[Any] = primary_resource.get("rows") or _FrozenList()
     elif primary_resource is not None:
-        data_payload = deepcopy(primary_resource)
+        data_payload = primary_resource
         rows_payload = []
     elif context_payload:
         data_payload = context_payload
@@ -229,18 +731,77 @@ def build_javascript_runtime(
     return {
         "resources": resources_payload,
         "context": context_payload,
-        "resource": deepcopy(primary_resource),
+        "resource": primary_resource,
         "data": data_payload,
         "rows": rows_payload,
+        **arrow_tables,
     }
 
 
+def _hoist_arrow_tables(
+    frontend_resources: Mapping[str, dict[str, Any]],
+) -> tuple[dict[str, dict[str, Any]], dict[str, Any]]:
+    resources_payload: dict[str, dict[str, Any]] = {}
+    arrow_tables: dict[str, Any] = {}
+    for name, payload in frontend_resources.items():
+        if "arrow_table" in payload:
+            arrow_key = f"{_ARROW_KEY_PREFIX}{name}"
+            arrow_tables[arrow_key] = payload["arrow_table"]
+            payload = {key: value for key, value in payload.items() if key != "arrow_table"}
+            payload["arrow_key"] = arrow_key
+        resources_payload[name] = payload
+    return resources_payload, arrow_tables
+
+
 def _validate_access(level: str) -> None:
     if level not in _ACCESS_LEVELS:
         raise ValueError(f"Unsupported access level: {level!r}")
 
 
+def _validate_frontend_format(frontend_format: str) -> None:
+    if frontend_format not in _FRONTEND_FORMATS:
+        raise ValueError(f"Unsupported frontend format: {frontend_format!r}")
+
+
 def _format_dataframe_prompt_block(name: str, definition: RuntimeResource) -> list[str]:
+    """Prompt lines for a dataframe, memoized on what they show.
+
+    Profiled blocks are keyed on :func:`frame_fingerprint`, plain ones on
+    the rows they print, so repeated turns skip the work and keep the system
+    prompt byte-identical while a change to the data builds a fresh block.
+    """
+
+    df = resource_frame(definition)
+    summary_tokens = _summary_tokens(definition)
+    if summary_tokens:
+        fingerprint = frame_fingerprint(df)
+    else:
+        fingerprint = _dataframe_fingerprint(df, max(definition.sample_rows, 0))
+    if fingerprint is None:
+        return _build_dataframe_prompt_block(name, definition, None)
+    key = (name, definition.description, definition.ai_access, definition.sample_rows, summary_tokens, fingerprint)
+    with _PROMPT_BLOCKS_LOCK:
+        lines = _PROMPT_BLOCKS.get(key)
+        if lines is not None:
+            _PROMPT_BLOCKS.move_to_end(key)
+            return list(lines)
+    lines = tuple(_build_dataframe_prompt_block(name, definition, fingerprint))
+    with _PROMPT_BLOCKS_LOCK:
+        _PROMPT_BLOCKS[key] = lines
+        while len(_PROMPT_BLOCKS) > _MAX_PROMPT_BLOCKS:
+            _PROMPT_BLOCKS.popitem(last=False)
+    return list(lines)
+
+
+def _build_dataframe_prompt_block(
+    name: str,
+    definition: RuntimeResource,
+    fingerprint: tuple[Any, ...] | None,
+) -> list[str]:
+    summary_tokens = _summary_tokens(definition)
+    if summary_tokens:
+        return _build_profiled_prompt_block(name, definition, fingerprint, summary_tokens)
+
     payload = _materialize_dataframe_payload(name, definition, row_limit=definition.sample_rows)
     lines = [f"- {name} (dataframe): {definition.description or 'Tabular data'}", f"  Rows: {payload['row_count']}"]
     if payload["columns"]:
@@ -254,6 +815,92 @@ def _format_dataframe_prompt_block(name: str, definition: RuntimeResource) -> li
     return lines
 
 
+def _build_profiled_prompt_block(
+    name: str,
+    definition: RuntimeResource,
+    fingerprint: tuple[Any, ...] | None,
+    summary_tokens: int,
+) -> list[str]:
+    """Column names and dtypes always; statistics, then sample rows, while the budget lasts."""
+
+    profile = profile_dataframe(resource_frame(definition), sample_rows=definition.sample_rows, cache_key=fingerprint)
+    lines = [f"- {name} (dataframe): {definition.description or 'Tabular data'}", f"  Rows: {profile.row_count}"]
+    column_lines = [f"  - {column.name}: {column.dtype}" for column in profile.columns]
+    budget = summary_tokens - _estimate_tokens(lines) - _estimate_tokens(column_lines)
+    for index, column in enumerate(profile.columns):
+        detailed = f"  {format_column_profile(column)}"
+        cost = _estimate_tokens([detailed]) - _estimate_tokens([column_lines[index]])
+        if cost > budget:
+            break
+        column_lines[index] = detailed
+        budget -= cost
+    if column_lines:
+        lines.append("  Columns:")
+        lines.extend(column_lines)
+
+    sample_lines = [f"  - {json.dumps(row, ensure_ascii=True)}" for row in dataframe_records(profile.sample)]
+    label = f"  Sample rows (stratified by {profile.stratified_by}):" if profile.stratified_by else "  Sample rows:"
+    budget -= _estimate_tokens([label])
+    shown = []
+    for line in sample_lines:
+        budget -= _estimate_tokens([line])
+        if budget < 0:
+            break
+        shown.append(line)
+    if shown:
+        lines.append(label)
+        lines.extend(shown)
+    return lines
+
+
+def _summary_tokens(definition: RuntimeResource) -> int:
+    if definition.ai_access not in {"summary", "full"}:
+        return 0
+    return int(definition.metadata.get("summary_tokens", 0))
+
+
+def _estimate_tokens(lines: list[str]) -> int:
+    """Rough token count for prompt text: about four characters per token."""
+
+    return sum(len(line) + 1 for line in lines) // 4
+
+
+def frame_fingerprint(df: Any) -> tuple[Any, ...] | None:
+    """Content key for whole-frame statistics and views.
+
+    Every row is hashed: profiles, prompt blocks and filtered row views all
+    depend on the full contents, so an edit anywhere in the frame must change
+    the key. The key is remembered per frame object while it is alive and its
+    shape, columns and dtypes are unchanged, so a frame that is reused across
+    turns is hashed once. Values edited in place are therefore not seen;
+    assign an edited copy (as a Streamlit rerun does) or call
+    :func:`clear_payload_cache`.
+    """
+
+    layout = _frame_layout(df)
+    with _FRAME_FINGERPRINTS_LOCK:
+        entry = _FRAME_FINGERPRINTS.get(id(df))
+    if entry is not None and entry[0]() is df and entry[1][:3] == layout:
+        return entry[1]
+    fingerprint = _dataframe_fingerprint(df, int(getattr(df, "shape", (0,))[0]))
+    if fingerprint is None:
+        return None
+    try:
+        ref = weakref.ref(df, functools.partial(_forget_frame_fingerprint, id(df)))
+    except TypeError:
+        return fingerprint
+    with _FRAME_FINGERPRINTS_LOCK:
+        _FRAME_FINGERPRINTS[id(df)] = (ref, fingerprint)
+    return fingerprint
+
+
+def _forget_frame_fingerprint(frame_id: int, ref: weakref.ref[Any]) -> None:
+    with _FRAME_FINGERPRINTS_LOCK:
+        entry = _FRAME_FINGERPRINTS.get(frame_id)
+        if entry is not None and entry[0] is ref:
+            del _FRAME_FINGERPRINTS[frame_id]
+
+
 def _format_sql_database_prompt_block(name: str, definition: RuntimeResource) -> list[str]:
     schema = definition.metadata.get("schema") or {}
     allowed_tables = definition.metadata.get("allowed_tables") or []
@@ -266,6 +913,11 @@ def _format_sql_database_prompt_block(name: str, definition: RuntimeResource) ->
     elif allowed_tables:
         lines.append(f"  Allowed tables: {', '.join(allowed_tables)}")
     lines.append(f"  Read-only: {not bool(definition.metadata.get('allow_write'))}")
+    if definition.ai_access != "none":
+        lines.append(
+            f"  Query it with the `sql_query` tool (resource={name!r}); each result is returned as a dataframe "
+            "resource you can pass as `data_resource` or in `resources`."
+        )
     return lines
 
 
@@ -274,28 +926,325 @@ def _materialize_dataframe_payload(
     definition: RuntimeResource,
     *,
     row_limit: int,
+    frontend_format: str = "rows",
 ) -> dict[str, Any]:
-    df = definition.payload
+    df = resource_frame(definition)
     if not hasattr(df, "to_json") or not hasattr(df, "dtypes") or not hasattr(df, "head"):
         raise TypeError(f"Runtime resource {name!r} is not a pandas-like DataFrame.")
 
     row_count = int(getattr(df, "shape")[0])
     preview_limit = min(max(definition.sample_rows, 0), row_count)
     rows_limit = min(max(row_limit, 0), row_count)
-    rows = json.loads(df.head(rows_limit).to_json(orient="records", date_format="iso"))
-    rows_preview = json.loads(df.head(preview_limit).to_json(orient="records", date_format="iso"))
-    columns = [{"name": str(column), "dtype": str(dtype)} for column, dtype in zip(df.columns, df.dtypes)]
 
-    return {
+    fingerprint = _dataframe_fingerprint(df, max(rows_limit, preview_limit))
+    cache_key = (fingerprint, rows_limit, preview_limit, frontend_format)
+    materialized = _PAYLOAD_CACHE.get(cache_key) if fingerprint is not None else None
+    if materialized is None:
+        head = df.head(max(rows_limit, preview_limit))
+        materialized = {
+            "columns": [{"name": str(column), "dtype": str(dtype)} for column, dtype in zip(df.columns, df.dtypes)],
+        }
+        if frontend_format == "columns":
+            materialized["column_data"] = _dataframe_column_data(head.head(rows_limit))
+            materialized["rows_preview"] = dataframe_records(head.head(preview_limit))
+        elif frontend_format == "arrow":
+            materialized["arrow_table"] = _dataframe_arrow_table(head.head(rows_limit))
+            materialized["rows_preview"] = dataframe_records(head.head(preview_limit))
+        else:
+            records = dataframe_records(head)
+            materialized["rows"] = _FrozenList(records[:rows_limit])
+            materialized["rows_preview"] = _FrozenList(records[:preview_limit])
+        materialized = freeze_payload(materialized)
+        if fingerprint is not None:
+            _PAYLOAD_CACHE.put(cache_key, materialized, frame_size(head))
+
+    payload = {
         "kind": "dataframe",
         "name": name,
         "description": definition.description,
-        "columns": columns,
+        "format": frontend_format,
+        "columns": materialized["columns"],
         "row_count": row_count,
-        "rows": rows,
-        "rows_preview": rows_preview,
+        "rows_preview": materialized["rows_preview"],
         "truncated": row_count > rows_limit,
     }
+    if frontend_format == "columns":
+        payload["column_data"] = materialized["column_data"]
+    elif frontend_format == "arrow":
+        payload["arrow_table"] = materialized["arrow_table"]
+        # Lets renderers detect data changes without hashing the table itself.
+        payload["arrow_version"] = fingerprint[-1] if fingerprint is not None else uuid4().hex
+    else:
+        payload["rows"] = materialized["rows"]
+    return payload
+
+
+def resource_frame(definition: RuntimeResource) -> Any:
+    """The DataFrame behind a dataframe resource, loading lazy ones."""
+
+    payload = definition.payload
+    return payload.load() if isinstance(payload, LazyDataFrame) else payload
+
+
+def _loader_key(loader: Callable[[], Any], _seen: frozenset[Any] = frozenset()) -> tuple[Any, ...]:
+    """Identify a loader by its code and the values it reads, which survive a Streamlit rerun.
+
+    Besides defaults and closure cells, this includes the current value of
+    every module global the code reads, so a script-level loader that reads a
+    widget selection from a global loads again once the selection changes.
+    """
+
+    if isinstance(loader, functools.partial):
+        return ("partial", _loader_key(loader.func, _seen), loader.args, tuple(sorted(loader.keywords.items())))
+    code = getattr(loader, "__code__", None)
+    if code is None:
+        return ("object", loader)
+    try:
+        closure = tuple(_Identity.wrap(cell.cell_contents) for cell in loader.__closure__ or ())
+    except ValueError:  # a cell that is not bound yet
+        return ("object", loader)
+    defaults = tuple(_Identity.wrap(value) for value in loader.__defaults__ or ())
+    return (
+        "function",
+        code,
+        defaults,
+        closure,
+        _Identity.wrap(getattr(loader, "__self__", None)),
+        _global_values(loader, _seen | {code}),
+    )
+
+
+def _global_values(function: Any, seen: frozenset[Any]) -> tuple[tuple[str, Any], ...]:
+    namespace = getattr(function, "__globals__", None) or {}
+    values = []
+    for name in sorted(set(_code_names(function.__code__))):
+        if name not in namespace:
+            continue
+        value = namespace[name]
+        if isinstance(value, types.FunctionType):
+            # Helpers defined in the script are new objects on every rerun.
+            value = ("recursive", value.__code__) if value.__code__ in seen else _loader_key(value, seen)
+        else:
+            value = _Identity.wrap(value)
+        values.append((name, value))
+    return tuple(values)
+
+
+def _code_names(code: types.CodeType) -> Iterator[str]:
+    yield from code.co_names
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            yield from _code_names(constant)
+
+
+class _Identity:
+    """Hash an unhashable value by identity, keeping it alive so its id is not reused."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    @classmethod
+    def wrap(cls, value: Any) -> Any:
+        try:
+            hash(value)
+        except TypeError:
+            return cls(value)
+        return value
+
+    def __hash__(self) -> int:
+        return id(self.value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Identity) and other.value is self.value
+
+
+def dataframe_records(df: Any) -> list[dict[str, Any]]:
+    """Convert a frame to JSON-ready records, one vectorized pass per column.
+
+    Matches ``to_json(orient="records", date_format="iso")`` for datetimes
+    (millisecond ISO strings, ``Z`` for tz-aware), timedeltas, missing values
+    and numpy scalars, but keeps floats at full precision. Frames with
+    duplicate columns, and objects that are merely pandas-like, still go
+    through ``to_json``.
+
+    The records are built read-only, since they end up in the payload cache.
+    """
+
+    if not hasattr(df, "items") or not getattr(df.columns, "is_unique", False):
+        return freeze_payload(json.loads(df.to_json(orient="records", date_format="iso")))
+    names = [str(column) for column in df.columns]
+    columns = [_column_json_values(series) for _, series in df.items()]
+    if not columns:
+        return _FrozenList(_FrozenDict() for _ in range(len(df)))
+    return _FrozenList([_FrozenDict(zip(names, values)) for values in zip(*columns)])
+
+
+def _dataframe_column_data(df: Any) -> dict[str, Any]:
+    """Encode a frame column by column for the ``"columns"`` frontend format.
+
+    Numeric columns become ``{"dtype", "base64"}`` little-endian typed-array
+    buffers (64-bit integers narrow to ``int32`` when they fit, otherwise
+    ``float64``); every other column is a plain JSON array.
+    """
+
+    if not getattr(df.columns, "is_unique", False):
+        raise ValueError("DataFrame columns must be unique for the 'columns' frontend format.")
+    return {str(column): _encode_column(series) for column, series in df.items()}
+
+
+def _encode_column(series: Any) -> Any:
+    import numpy as np
+
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in "iuf":
+        return _FrozenList(_column_json_values(series))
+    array = series.to_numpy()
+    typed_name = _TYPED_ARRAY_DTYPES.get(f"{dtype.kind}{dtype.itemsize}")
+    if typed_name is None:
+        array = _narrow_int64(array)
+        typed_name = str(array.dtype)
+    little_endian = np.ascontiguousarray(array, dtype=np.dtype(typed_name).newbyteorder("<"))
+    return {"dtype": typed_name, "base64": base64.b64encode(little_endian.tobytes()).decode("ascii")}
+
+
+def _dataframe_arrow_table(df: Any) -> Any:
+    """Convert a frame to a ``pyarrow.Table`` for the ``"arrow"`` frontend format.
+
+    Types are adjusted so the browser sees the same values as in the row
+    format. Datetimes and timedeltas become ISO strings. 64-bit integers
+    narrow like in the ``"columns"`` format, because Arrow's JavaScript
+    reader would return BigInts for them. Object columns that Arrow cannot
+    type are sent as strings, as ``st.dataframe`` does.
+    """
+
+    import numpy as np
+    import pyarrow as pa
+
+    if not getattr(df.columns, "is_unique", False):
+        raise ValueError("DataFrame columns must be unique for the 'arrow' frontend format.")
+    arrays = {}
+    for column, series in df.items():
+        dtype = series.dtype
+        if dtype.kind in "mM":
+            array = pa.array(_column_json_values(series), type=pa.string())
+        elif isinstance(dtype, np.dtype) and dtype.kind in "iu" and dtype.itemsize == 8:
+            array = pa.array(_narrow_int64(series.to_numpy()))
+        else:
+            try:
+                array = pa.array(series, from_pandas=True)
+            except (pa.ArrowException, TypeError, ValueError):
+                array = pa.array(series.astype(str), from_pandas=True)
+        arrays[str(column)] = array
+    return pa.table(arrays)
+
+
+def _narrow_int64(array: Any) -> Any:
+    import numpy as np
+
+    fits_int32 = not len(array) or (int(array.min()) >= -(2**31) and int(array.max()) < 2**31)
+    return array.astype(np.int32 if fits_int32 else np.float64)
+
+
+def _column_json_values(series: Any) -> list[Any]:
+    import numpy as np
+    import pandas as pd
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+        return series.to_numpy().tolist()
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        array = series.to_numpy()
+        values = array.tolist()
+        missing = ~np.isfinite(array)
+        if missing.any():
+            for index in np.flatnonzero(missing).tolist():
+                values[index] = None
+        return values
+    if dtype.kind == "M":
+        timezone = getattr(dtype, "tz", None)
+        if timezone is not None:
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        array = series.to_numpy(dtype="datetime64[ms]")
+        if timezone is None:
+            values = array.astype("U23").tolist()
+        else:
+            values = np.datetime_as_string(array, unit="ms", timezone="UTC").tolist()
+        missing = np.isnat(array)
+        if missing.any():
+            for index in np.flatnonzero(missing).tolist():
+                values[index] = None
+        return values
+    if isinstance(dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    values = series.to_numpy(dtype=object, na_value=None).tolist()
+    return [value if type(value) in _JSON_NATIVE_TYPES else _json_value(value) for value in values]
+
+
+_JSON_NATIVE_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def _json_value(value: Any) -> Any:
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(value, float):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, np.generic):
+        return _json_value(value.item())
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, pd.Timedelta):
+        return value.isoformat()
+    if isinstance(value, datetime.datetime):
+        timestamp = pd.Timestamp(value)
+        if timestamp.tzinfo is not None:
+            return timestamp.tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        return timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+    if isinstance(value, datetime.date):
+        return f"{value.isoformat()}T00:00:00.000"
+    if isinstance(value, Mapping):
+        return _FrozenDict({str(key): _json_value(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return _FrozenList([_json_value(item) for item in value])
+    if isinstance(value, (str, int, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def frame_size(df: Any) -> int:
+    """Deep pandas memory use of ``df`` in bytes, or ``0`` when it cannot be measured."""
+
+    try:
+        return int(df.memory_usage(index=False, deep=True).sum())
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def _dataframe_fingerprint(df: Any, row_limit: int) -> tuple[Any, ...] | None:
+    """Cheap content key for the first ``row_limit`` rows of a pandas DataFrame.
+
+    Returns ``None`` for frames that pandas cannot hash (for example object
+    columns holding lists), which are then materialized without caching.
+    """
+
+    try:
+        from pandas.util import hash_pandas_object
+
+        row_hashes = hash_pandas_object(df.head(row_limit), index=True)
+    except (ImportError, TypeError, ValueError):
+        return None
+    digest = hashlib.blake2b(row_hashes.to_numpy().tobytes(), digest_size=16).hexdigest()
+    return (*_frame_layout(df), digest)
+
+
+def _frame_layout(df: Any) -> tuple[Any, ...]:
+    return (
+        tuple(getattr(df, "shape", ())),
+        tuple(str(column) for column in getattr(df, "columns", ())),
+        tuple(str(dtype) for dtype in getattr(df, "dtypes", ())),
+    )
 
 
 def _pick_single_dataframe(frontend_resources: Mapping[str, dict[str, Any]]) -> str | None:
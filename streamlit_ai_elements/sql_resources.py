@@ -0,0 +1,760 @@
+"""Query execution for ``sql_database`` runtime resources.
+
+``resource.sql_database`` used to only describe a database in the system
+prompt. This module lets the assistant query it through the ``sql_query``
+tool: statements are checked against ``allowed_tables`` / ``allow_write``,
+run on a small per-engine connection pool with a timeout and a row cap, and
+read results are cached by their normalized SQL. Each result is registered as
+an ephemeral dataframe resource, so the assistant can chart it with
+``data_resource`` in a later tool call.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Iterator, Mapping
+from urllib.parse import quote
+import weakref
+
+from .runtime_resources import (
+    DataframePayloadCache,
+    RuntimeResource,
+    dataframe_records,
+    frame_size,
+    register_ephemeral_resource,
+    resource,
+)
+
+
+_RESULT_PREFIX = "sql_result_"
+_PREVIEW_ROWS = 20
+_RESULT_CACHE_BYTES = 32 * 1024 * 1024
+_POOL_WAIT_SECONDS = 30.0
+_MAX_PINNED_DATABASES = 16
+
+_TOKEN = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<string>'(?:[^']|'')*')
+    | (?P<quoted>"(?:[^"]|"")*"|`(?:[^`]|``)*`|\[[^\]]*\])
+    | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_READ_STATEMENTS = {"SELECT", "WITH", "VALUES"}
+_WRITE_KEYWORDS = {
+    "ALTER",
+    "ATTACH",
+    "CALL",
+    "COPY",
+    "CREATE",
+    "DELETE",
+    "DETACH",
+    "DROP",
+    "EXEC",
+    "EXECUTE",
+    "GRANT",
+    "INSERT",
+    "INTO",
+    "MERGE",
+    "PRAGMA",
+    "REINDEX",
+    "REVOKE",
+    "TRUNCATE",
+    "UPDATE",
+    "UPSERT",
+    "VACUUM",
+}
+_TABLE_KEYWORDS = {"FROM", "JOIN", "INTO", "UPDATE", "TABLE"}
+# Words that end a table reference instead of aliasing it.
+_CLAUSE_KEYWORDS = {
+    "AS",
+    "CROSS",
+    "EXCEPT",
+    "FETCH",
+    "FOR",
+    "FULL",
+    "GROUP",
+    "HAVING",
+    "INNER",
+    "INTERSECT",
+    "JOIN",
+    "LEFT",
+    "LIMIT",
+    "NATURAL",
+    "OFFSET",
+    "ON",
+    "ORDER",
+    "OUTER",
+    "RETURNING",
+    "RIGHT",
+    "SELECT",
+    "SET",
+    "UNION",
+    "USING",
+    "VALUES",
+    "WHERE",
+    "WINDOW",
+    "DEFAULT",
+}
+
+SQL_QUERY_TOOL = {
+    "name": "sql_query",
+    "description": (
+        "Run a SQL query against a sql_database runtime resource. Returns the columns, the row count, "
+        "a preview of the rows and a `result_resource` name: pass that name as `data_resource` "
+        "(Vega-Lite) or in `resources` (js_raw, sandbox) to chart the full result."
+    ),
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "resource": {"type": "string", "description": "Name of the sql_database runtime resource to query."},
+            "sql": {
+                "type": "string",
+                "description": "A single SQL statement. Only use tables listed for the resource; aggregate in SQL where possible.",
+            },
+        },
+        "required": ["resource", "sql"],
+    },
+}
+
+
+class SQLQueryError(ValueError):
+    """A query was rejected by the resource's rules or failed to run."""
+
+
+@dataclass(frozen=True, slots=True)
+class SQLQueryResult:
+    """Rows returned by :func:`run_sql_query`."""
+
+    sql: str
+    frame: Any
+    truncated: bool
+    from_cache: bool = False
+    affected_rows: int | None = None
+    result_resource: str | None = None
+
+
+def run_sql_query(definition: RuntimeResource, sql: str, *, resource_name: str | None = None) -> SQLQueryResult:
+    """Check and run ``sql`` against a ``sql_database`` resource.
+
+    Read results are cached per database by their normalized SQL (comments,
+    whitespace and keyword case do not matter), for as long as the
+    resource's ``cache_ttl`` allows, and registered as the ephemeral
+    dataframe resource named in ``result_resource``. Writes, when the
+    resource allows them, clear that database's cache.
+    """
+
+    if definition.kind != "sql_database":
+        raise SQLQueryError(f"Runtime resource {resource_name or definition.name!r} is not a sql_database resource.")
+    name = resource_name or definition.name or "sql_database"
+    metadata = definition.metadata
+    statement = _parse_statement(
+        sql,
+        allowed_tables=metadata.get("allowed_tables") or [],
+        allow_write=bool(metadata.get("allow_write")),
+        resource_name=name,
+        standard_strings=_is_sqlite(definition.payload),
+    )
+    database = _database_for(definition)
+    max_rows = definition.max_rows
+    cache_key = (statement.normalized, max_rows, database.version())
+    ttl = metadata.get("cache_ttl")
+    cacheable = ttl != 0 and (ttl is not None or database.path is not None)
+
+    if cacheable and not statement.is_write:
+        cached = database.results.get(cache_key)
+        if cached is not None and (ttl is None or time.monotonic() - cached["cached_at"] <= ttl):
+            return _read_result(definition, database, statement, cached, from_cache=True)
+
+    frame, truncated, affected_rows = database.execute(
+        statement.text,
+        max_rows=max_rows,
+        timeout=metadata.get("query_timeout"),
+        is_write=statement.is_write,
+    )
+    if statement.is_write:
+        database.results.clear()
+        return SQLQueryResult(sql=statement.normalized, frame=frame, truncated=truncated, affected_rows=affected_rows)
+
+    entry = {"frame": frame, "truncated": truncated, "cached_at": time.monotonic()}
+    if cacheable:
+        database.results.put(cache_key, entry, frame_size(frame))
+    return _read_result(definition, database, statement, entry, from_cache=False)
+
+
+def sql_query_tool_executor(arguments: dict[str, Any], resources: dict[str, RuntimeResource] | None) -> dict[str, Any]:
+    """Built-in executor for the ``sql_query`` chat tool."""
+
+    resource_name = str(arguments.get("resource") or "")
+    definition = (resources or {}).get(resource_name)
+    try:
+        if definition is None or definition.kind != "sql_database" or definition.ai_access == "none":
+            raise SQLQueryError(f"Unknown sql_database resource: {resource_name!r}")
+        result = run_sql_query(definition, str(arguments.get("sql") or ""), resource_name=resource_name)
+    except SQLQueryError as exc:
+        output = {"status": "error", "error": str(exc)}
+    else:
+        output = {"status": "ok", "row_count": int(len(result.frame)), "truncated": result.truncated}
+        if result.affected_rows is not None:
+            output["affected_rows"] = result.affected_rows
+        if result.result_resource is not None:
+            output["result_resource"] = result.result_resource
+            output["columns"] = [{"name": str(column), "dtype": str(dtype)} for column, dtype in result.frame.dtypes.items()]
+            output["rows"] = dataframe_records(result.frame.head(_PREVIEW_ROWS))
+    return {
+        "output_text": json.dumps(output, ensure_ascii=True, default=str),
+        "card_policy": "augment",
+        "is_renderer": False,
+    }
+
+
+def has_sql_resources(resources: Mapping[str, RuntimeResource] | None) -> bool:
+    return any(
+        definition.kind == "sql_database" and definition.ai_access != "none" for definition in (resources or {}).values()
+    )
+
+
+def _read_result(
+    definition: RuntimeResource,
+    database: "_Database",
+    statement: "_Statement",
+    entry: dict[str, Any],
+    *,
+    from_cache: bool,
+) -> SQLQueryResult:
+    frame = entry["frame"]
+    digest = hashlib.blake2b(f"{database.key!r}\n{statement.normalized}".encode(), digest_size=6).hexdigest()
+    result_name = f"{_RESULT_PREFIX}{digest}"
+    register_ephemeral_resource(
+        result_name,
+        resource.dataframe(frame, description=f"Result of: {statement.normalized}", max_rows=max(len(frame), 1)),
+        definition.payload,
+    )
+    return SQLQueryResult(
+        sql=statement.normalized,
+        frame=frame,
+        truncated=entry["truncated"],
+        from_cache=from_cache,
+        result_resource=result_name,
+    )
+
+
+# -- statement checks --------------------------------------------------------
+
+
+@dataclass(frozen=True, slots=True)
+class _Statement:
+    text: str
+    normalized: str
+    is_write: bool
+    tables: tuple[str, ...]
+
+
+def _parse_statement(
+    sql: str,
+    *,
+    allowed_tables: list[str],
+    allow_write: bool,
+    resource_name: str,
+    standard_strings: bool = False,
+) -> _Statement:
+    """Check ``sql`` against the resource's rules.
+
+    ``standard_strings`` means the engine treats a backslash in a string
+    literal as an ordinary character, as SQLite does. Elsewhere (MySQL, for
+    one) it may escape the closing quote and the statement would not be split
+    into tokens the way it is read here, so such literals are rejected.
+    """
+
+    ends: list[int] = []
+    tokens = _tokenize(sql, ends)
+    if not standard_strings:
+        for kind, text in tokens:
+            if kind in ("string", "quoted") and text[0] in "'\"" and "\\" in text:
+                raise SQLQueryError("Backslashes in quoted strings are not supported for this database.")
+    while tokens and tokens[-1] == ("other", ";"):
+        tokens.pop()
+        ends.pop()
+    if not tokens:
+        raise SQLQueryError("The SQL query is empty.")
+    if ("other", ";") in tokens:
+        raise SQLQueryError("Only one SQL statement per query is allowed.")
+
+    words = [text.upper() for kind, text in tokens if kind == "word"]
+    is_write = tokens[0][0] != "word" or words[0] not in _READ_STATEMENTS or any(word in _WRITE_KEYWORDS for word in words)
+    if is_write and not allow_write:
+        raise SQLQueryError(f"Resource {resource_name!r} is read-only; only SELECT queries are allowed.")
+
+    tables = _referenced_tables(tokens)
+    if allowed_tables:
+        allowed = {table.lower() for table in allowed_tables}
+        for table in tables:
+            if table.lower() not in allowed and table.rsplit(".", 1)[-1].lower() not in allowed:
+                raise SQLQueryError(
+                    f"Table {table!r} is not allowed for resource {resource_name!r}. Allowed tables: {', '.join(allowed_tables)}."
+                )
+
+    normalized = " ".join(text.upper() if kind == "word" and text.upper() in _NORMALIZED_KEYWORDS else text for kind, text in tokens)
+    return _Statement(text=sql[: ends[-1]], normalized=normalized, is_write=is_write, tables=tuple(tables))
+
+
+_NORMALIZED_KEYWORDS = _READ_STATEMENTS | _WRITE_KEYWORDS | _CLAUSE_KEYWORDS | _TABLE_KEYWORDS | {
+    "IN",
+    "EXISTS",
+    "AND",
+    "OR",
+    "NOT",
+    "ANY",
+    "ALL",
+    "SOME",
+    "RECURSIVE",
+    "LATERAL",
+    "BY",
+    "ASC",
+    "DESC",
+    "DISTINCT",
+    "CASE",
+    "WHEN",
+    "THEN",
+    "ELSE",
+    "END",
+    "IS",
+    "NULL",
+    "LIKE",
+    "BETWEEN",
+    "COUNT",
+    "SUM",
+    "AVG",
+    "MIN",
+    "MAX",
+}
+
+
+def _is_sqlite(engine: Any) -> bool:
+    return isinstance(engine, (str, os.PathLike, sqlite3.Connection))
+
+
+def _tokenize(sql: str, ends: list[int]) -> list[tuple[str, str]]:
+    tokens = []
+    for match in _TOKEN.finditer(sql):
+        kind = match.lastgroup or "other"
+        text = match.group()
+        if kind in ("space", "comment"):
+            continue
+        if kind == "other" and text in "'\"`[" or text == "/" and sql.startswith("/*", match.start()):
+            raise SQLQueryError("The SQL query has an unterminated string, identifier or comment.")
+        tokens.append((kind, text))
+        ends.append(match.end())
+    return tokens
+
+
+def _referenced_tables(tokens: list[tuple[str, str]]) -> list[str]:
+    """Table names after FROM/JOIN/INTO/UPDATE/TABLE, minus references to CTEs in scope.
+
+    This check fails closed: every FROM/JOIN target counts, including one
+    inside function-call parentheses (``EXTRACT(YEAR FROM day)`` is read as
+    table ``day``), and a CTE name only shadows a table after the CTE's own
+    body, within the enclosing query. Parenthesized table references other
+    than subqueries are rejected. Table-valued functions count as tables, so
+    they are rejected unless allowed.
+    """
+
+    tables: list[tuple[str, int]] = []
+    scopes = _cte_scopes(tokens)
+    index = 0
+    while index < len(tokens):
+        kind, text = tokens[index]
+        upper = text.upper() if kind == "word" else text
+        if upper in _TABLE_KEYWORDS:
+            if upper == "TABLE" and index and tokens[index - 1][1].upper() not in ("CREATE", "DROP", "ALTER", "TRUNCATE", "TEMP", "TEMPORARY"):
+                index += 1
+                continue
+            index = _read_table_list(tokens, index + 1, tables, allow_list=upper == "FROM")
+            continue
+        index += 1
+    return [
+        table
+        for table, position in tables
+        if not any(name == table.lower() and start <= position < stop for name, start, stop in scopes)
+    ]
+
+
+def _read_table_list(tokens: list[tuple[str, str]], index: int, tables: list[tuple[str, int]], *, allow_list: bool) -> int:
+    while index < len(tokens):
+        if tokens[index][1].upper() in ("LATERAL", "ONLY", "IF", "NOT", "EXISTS"):
+            index += 1
+            continue
+        if tokens[index][1] == "(":
+            # Subqueries are checked where their own FROM appears; any other
+            # parenthesized reference, e.g. ``JOIN (secret)``, is rejected.
+            inner = index + 1
+            while inner < len(tokens) and tokens[inner][1] == "(":
+                inner += 1
+            if inner >= len(tokens) or tokens[inner][1].upper() not in _READ_STATEMENTS:
+                raise SQLQueryError("Parenthesized table references are not supported; name tables directly.")
+            return index
+        position = index
+        name, index = _read_name(tokens, index)
+        if name is None:
+            return index
+        tables.append((name, position))
+        # Optional alias: ``AS alias`` or a bare non-keyword word.
+        if index < len(tokens) and tokens[index][1].upper() == "AS":
+            index += 2
+        elif index < len(tokens) and tokens[index][0] in ("word", "quoted") and tokens[index][1].upper() not in _CLAUSE_KEYWORDS:
+            index += 1
+        if allow_list and index < len(tokens) and tokens[index][1] == ",":
+            index += 1
+            continue
+        return index
+    return index
+
+
+def _read_name(tokens: list[tuple[str, str]], index: int) -> tuple[str | None, int]:
+    parts = []
+    while index < len(tokens) and tokens[index][0] in ("word", "quoted"):
+        parts.append(_unquote(tokens[index][1]))
+        index += 1
+        if index < len(tokens) and tokens[index][1] == ".":
+            index += 1
+            continue
+        break
+    return (".".join(parts) if parts else None), index
+
+
+def _cte_scopes(tokens: list[tuple[str, str]]) -> list[tuple[str, int, int]]:
+    """``(name, start, stop)`` token ranges in which each CTE name refers to the CTE.
+
+    A CTE is visible from the end of its own body (so ``WITH secret AS
+    (SELECT * FROM secret)`` still reads table ``secret``, even with
+    RECURSIVE) to the end of the query that declares it.
+    """
+
+    scopes = []
+    for index, (kind, text) in enumerate(tokens):
+        if kind != "word" or text.upper() != "WITH":
+            continue
+        stop = _enclosing_close(tokens, index)
+        position = index + 1
+        if position < len(tokens) and tokens[position][1].upper() == "RECURSIVE":
+            position += 1
+        while position < len(tokens) and tokens[position][0] in ("word", "quoted"):
+            name = _unquote(tokens[position][1]).lower()
+            position += 1
+            if position < len(tokens) and tokens[position][1] == "(":
+                position = _skip_parens(tokens, position)  # column list
+            while position < len(tokens) and tokens[position][1] != "(":
+                position += 1  # AS [NOT] MATERIALIZED
+            position = _skip_parens(tokens, position)
+            scopes.append((name, position, stop))
+            if position < len(tokens) and tokens[position][1] == ",":
+                position += 1
+                continue
+            break
+    return scopes
+
+
+def _enclosing_close(tokens: list[tuple[str, str]], index: int) -> int:
+    depth = 0
+    while index < len(tokens):
+        if tokens[index][1] == "(":
+            depth += 1
+        elif tokens[index][1] == ")":
+            depth -= 1
+            if depth < 0:
+                return index
+        index += 1
+    return index
+
+
+def _skip_parens(tokens: list[tuple[str, str]], index: int) -> int:
+    depth = 0
+    while index < len(tokens):
+        if tokens[index][1] == "(":
+            depth += 1
+        elif tokens[index][1] == ")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return index
+
+
+def _unquote(text: str) -> str:
+    if text[:1] in "\"`[" and len(text) >= 2:
+        inner = text[1:-1]
+        return inner.replace('""', '"') if text[0] == '"' else inner.replace("``", "`")
+    return text
+
+
+# -- connections -------------------------------------------------------------
+
+
+class _ConnectionPool:
+    """At most ``size`` connections; idle ones are reused, failed ones discarded."""
+
+    def __init__(self, factory: Callable[[], Any], size: int, *, close: bool = True) -> None:
+        self._factory = factory
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: list[Any] = []
+        self._lock = threading.Lock()
+        self._close = close
+        self.size = size
+        self.created = 0
+
+    @contextmanager
+    def connection(self, wait: float) -> Iterator[Any]:
+        if not self._slots.acquire(timeout=wait):
+            raise SQLQueryError(f"All {self.size} database connections are busy; try again shortly.")
+        try:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._factory()
+                with self._lock:
+                    self.created += 1
+            try:
+                yield connection
+            except BaseException:
+                self._discard(connection)
+                raise
+            with self._lock:
+                self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close idle connections; ones in use are closed when they are discarded."""
+
+        with self._lock:
+            idle, self._idle = self._idle, []
+        if self._close:
+            for connection in idle:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+    def _discard(self, connection: Any) -> None:
+        if not self._close:
+            with self._lock:
+                self._idle.append(connection)
+            return
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class _Database:
+    def __init__(self, key: Any, pool: _ConnectionPool, path: Path | None) -> None:
+        self.key = key
+        self.pool = pool
+        self.path = path
+        self.results = DataframePayloadCache(_RESULT_CACHE_BYTES)
+
+    def version(self) -> int:
+        """The SQLite file's mtime, so edits made outside the pool invalidate results."""
+
+        if self.path is None:
+            return 0
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def execute(self, sql: str, *, max_rows: int, timeout: float | None, is_write: bool) -> tuple[Any, bool, int | None]:
+        import pandas as pd
+
+        with self.pool.connection(wait=max(timeout or 0, _POOL_WAIT_SECONDS)) as connection:
+            timed_out = threading.Event()
+            timer = None
+            if timeout:
+                timer = threading.Timer(timeout, _interrupt, args=(connection, timed_out))
+                timer.daemon = True
+                timer.start()
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql)
+                rows = cursor.fetchmany(max_rows + 1) if cursor.description else []
+                columns = _column_names(cursor.description or [])
+                affected_rows = cursor.rowcount if is_write and cursor.rowcount is not None and cursor.rowcount >= 0 else None
+                if is_write:
+                    connection.commit()
+                else:
+                    _end_transaction(connection)
+            except Exception as exc:
+                _end_transaction(connection)
+                if timed_out.is_set():
+                    raise SQLQueryError(f"The query was cancelled after the {timeout:g}s timeout.") from exc
+                raise SQLQueryError(f"The query failed: {exc}") from exc
+            finally:
+                if timer is not None:
+                    timer.cancel()
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+        frame = pd.DataFrame.from_records([tuple(row) for row in rows[:max_rows]], columns=columns)
+        return frame, len(rows) > max_rows, affected_rows
+
+
+_DATABASES: dict[Any, _Database] = {}
+# Databases of engine objects, dropped (and their pools closed) with the
+# engine, so an engine or factory rebuilt on every rerun does not pile up pools.
+_ENGINE_DATABASES: weakref.WeakKeyDictionary[Any, dict[bool, _Database]] = weakref.WeakKeyDictionary()
+# Engines that cannot be weakly referenced, such as sqlite3.Connection, most recently used last.
+_PINNED_DATABASES: OrderedDict[tuple[int, bool], tuple[Any, _Database]] = OrderedDict()
+_DATABASES_LOCK = threading.Lock()
+
+
+def _database_for(definition: RuntimeResource) -> _Database:
+    engine = definition.payload
+    allow_write = bool(definition.metadata.get("allow_write"))
+    pool_size = int(definition.metadata.get("pool_size") or 1)
+    allowed_tables = frozenset(str(table).lower() for table in definition.metadata.get("allowed_tables") or [])
+    if isinstance(engine, (str, os.PathLike)):
+        path = Path(engine).expanduser().resolve()
+        key: Any = ("sqlite", str(path), allow_write, allowed_tables)
+        with _DATABASES_LOCK:
+            database = _DATABASES.get(key)
+            if database is None:
+                database = _Database(key, _sqlite_pool(path, pool_size, allow_write, allowed_tables), path)
+                _DATABASES[key] = database
+            return database
+
+    key = ("engine", id(engine), allow_write)
+    with _DATABASES_LOCK:
+        try:
+            databases = _ENGINE_DATABASES.get(engine)
+            weak = True
+        except TypeError:
+            weak = False
+        if weak:
+            database = (databases or {}).get(allow_write)
+            if database is None:
+                database = _Database(key, _engine_pool(engine, pool_size, weakref.ref(engine)), None)
+                _ENGINE_DATABASES.setdefault(engine, {})[allow_write] = database
+                weakref.finalize(engine, database.pool.close)
+            return database
+
+        pinned = _PINNED_DATABASES.get((id(engine), allow_write))
+        if pinned is not None and pinned[0] is engine:
+            _PINNED_DATABASES.move_to_end((id(engine), allow_write))
+            return pinned[1]
+        database = _Database(key, _engine_pool(engine, pool_size, lambda: engine), None)
+        _PINNED_DATABASES[(id(engine), allow_write)] = (engine, database)
+        while len(_PINNED_DATABASES) > _MAX_PINNED_DATABASES:
+            _, (_, evicted) = _PINNED_DATABASES.popitem(last=False)
+            evicted.pool.close()
+        return database
+
+
+def _sqlite_pool(path: Path, size: int, allow_write: bool, allowed_tables: frozenset[str]) -> _ConnectionPool:
+    if not path.exists():
+        raise SQLQueryError(f"SQLite database file not found: {str(path)!r}")
+
+    def connect() -> sqlite3.Connection:
+        if allow_write:
+            connection = sqlite3.connect(str(path), check_same_thread=False)
+        else:
+            connection = sqlite3.connect(f"file:{quote(str(path))}?mode=ro", uri=True, check_same_thread=False)
+            connection.execute("PRAGMA query_only = ON")
+        if allowed_tables:
+            connection.set_authorizer(_table_authorizer(allowed_tables, allow_write))
+        return connection
+
+    return _ConnectionPool(connect, size)
+
+
+def _engine_pool(engine: Any, size: int, target: Callable[[], Any]) -> _ConnectionPool:
+    """A pool over ``engine`` that reaches it through ``target``, so a weak reference does not pin it."""
+
+    if hasattr(engine, "raw_connection"):
+        return _ConnectionPool(lambda: _live_engine(target).raw_connection(), size)
+    if hasattr(engine, "cursor"):
+        # A single DB-API connection can only serve one query at a time.
+        return _ConnectionPool(lambda: _live_engine(target), 1, close=False)
+    if callable(engine):
+        return _ConnectionPool(lambda: _live_engine(target)(), size)
+    raise SQLQueryError(f"Unsupported sql_database engine: {type(engine).__name__}")
+
+
+def _live_engine(target: Callable[[], Any]) -> Any:
+    engine = target()
+    if engine is None:
+        raise SQLQueryError("The sql_database engine no longer exists.")
+    return engine
+
+
+_TABLE_ACTIONS = frozenset({sqlite3.SQLITE_READ, sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE})
+
+
+def _table_authorizer(allowed_tables: frozenset[str], allow_write: bool) -> Callable[..., int]:
+    """Enforce ``allowed_tables`` inside SQLite, whatever the statement check missed.
+
+    Reads and writes of any other table are denied, including tables behind a
+    view, so a view's underlying tables must be allowed too. Write-enabled
+    connections may still touch SQLite's own ``sqlite_*`` schema tables, which
+    ``CREATE`` and ``DROP`` update.
+    """
+
+    def authorize(action: int, table: str | None, column: str | None, database: str | None, source: str | None) -> int:
+        if action not in _TABLE_ACTIONS or table is None:
+            return sqlite3.SQLITE_OK
+        name = table.lower()
+        if name in allowed_tables or (database and f"{database.lower()}.{name}" in allowed_tables):
+            return sqlite3.SQLITE_OK
+        if allow_write and name.startswith("sqlite_"):
+            return sqlite3.SQLITE_OK
+        return sqlite3.SQLITE_DENY
+
+    return authorize
+
+
+def _interrupt(connection: Any, timed_out: threading.Event) -> None:
+    timed_out.set()
+    driver = getattr(connection, "driver_connection", None) or getattr(connection, "dbapi_connection", None) or connection
+    for method in ("interrupt", "cancel"):
+        if callable(getattr(driver, method, None)):
+            try:
+                getattr(driver, method)()
+            except Exception:
+                pass
+            return
+
+
+def _end_transaction(connection: Any) -> None:
+    try:
+        connection.rollback()
+    except Exception:
+        pass
+
+
+def _column_names(description: Any) -> list[str]:
+    names: list[str] = []
+    seen: set[str] = set()
+    for column in description:
+        base = str(column[0])
+        name = base
+        index = 1
+        while name in seen:
+            index += 1
+            name = f"{base}_{index}"
+        seen.add(name)
+        names.append(name)
+    return names
@@ -0,0 +1,591 @@
+"""Server-side aggregation and downsampling of Vega-Lite ``data_resource`` data.
+
+Vega-Lite charts over runtime dataframes used to receive the first
+``max_rows`` rows verbatim. For the common single-view specs this module
+evaluates the spec's ``aggregate`` / ``timeUnit`` / ``bin`` encodings and
+transforms over the *whole* dataframe with pandas and NumPy and ships only
+the aggregated rows, and it thins dense line and scatter series with LTTB or
+min-max downsampling. Specs it cannot evaluate exactly are left to the
+regular row-injection path.
+"""
+
+from __future__ import annotations
+
+from copy import deepcopy
+import math
+from typing import Any, Mapping
+
+from .runtime_resources import RuntimeResource, dataframe_records, lookup_resource, resource_frame
+
+
+_DOWNSAMPLE_METHODS = {"lttb", "minmax"}
+_DEFAULT_MAX_POINTS = 2000
+_COMPOSITE_KEYS = ("layer", "concat", "hconcat", "vconcat", "repeat", "facet", "spec")
+_DOWNSAMPLE_MARKS = {"line", "area", "trail", "point", "circle", "square"}
+_SERIES_CHANNELS = ("color", "detail", "strokeDash", "shape", "row", "column", "facet")
+_POSITION_PAIRS = {"x": "x2", "y": "y2"}
+
+# Ops that return their input for a single-row group. Columns aggregated with
+# them keep the field name and the encoding keeps the op, so titles, sorts and
+# tooltips behave exactly as before when Vega-Lite re-aggregates the rows.
+_IDENTITY_OPS = {"sum", "mean", "average", "median", "min", "max", "product"}
+_AGGREGATE_OPS = _IDENTITY_OPS | {
+    "count",
+    "valid",
+    "missing",
+    "distinct",
+    "variance",
+    "variancep",
+    "stdev",
+    "stdevp",
+    "q1",
+    "q3",
+}
+_OP_TITLES = {"mean": "Mean", "average": "Average", "q1": "Q1", "q3": "Q3", "stdevp": "Population stdev"}
+
+# Vega-Lite fills time units that are not part of a ``timeUnit`` from
+# 2012-01-01T00:00:00 (a leap year, so ``monthdate`` can hold Feb 29).
+_TIME_UNIT_PARTS = ("milliseconds", "minutes", "seconds", "quarter", "hours", "month", "year", "date")
+
+
+class _Unsupported(Exception):
+    """The spec needs client-side evaluation; fall back to shipping rows."""
+
+
+def prepare_vega_lite_data(
+    spec: Mapping[str, Any],
+    resources: Mapping[str, RuntimeResource] | None,
+    resource_names: list[str] | tuple[str, ...] | None = None,
+    *,
+    data_resource: str | None = None,
+    downsample: str | None = "lttb",
+    max_points: int = _DEFAULT_MAX_POINTS,
+) -> dict[str, Any] | None:
+    """Return ``spec`` with pre-aggregated ``data.values``, or ``None``.
+
+    The dataframe is ``data_resource`` or the only dataframe among
+    ``resource_names``, and must allow full frontend access. Aggregating
+    encodings and ``aggregate`` / ``timeUnit`` / ``bin`` transforms are
+    computed over every row; the resulting spec keeps the original field
+    names and titles. Without aggregation, line/area/point series longer
+    than ``max_points`` are downsampled with ``"lttb"`` (shape-preserving)
+    or ``"minmax"`` (keeps the extremes of every bucket); ``downsample=None``
+    disables that. Aggregated output is held to ``max_points`` rows too: it
+    is downsampled the same way when it forms such a series, and otherwise
+    keeps the first ``max_points`` groups.
+
+    ``None`` means there is nothing to reduce or the spec uses features that
+    only Vega-Lite can evaluate (composite views, other transforms,
+    ``argmax``-style ops, ...); callers then inject rows as before.
+    """
+
+    if downsample is not None and downsample not in _DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unsupported downsample method: {downsample!r}")
+    if spec.get("data") is not None or not resources:
+        return None
+    definition = _pick_dataframe_resource(resources, resource_names, data_resource)
+    if definition is None:
+        return None
+    df = resource_frame(definition)
+    if definition.frontend_access != "full" or not hasattr(df, "groupby") or not getattr(df.columns, "is_unique", False):
+        return None
+    try:
+        return _VegaLiteReducer(spec, df, downsample=downsample, max_points=max_points).run()
+    except _Unsupported:
+        return None
+
+
+def _pick_dataframe_resource(
+    resources: Mapping[str, RuntimeResource],
+    resource_names: list[str] | tuple[str, ...] | None,
+    data_resource: str | None,
+) -> RuntimeResource | None:
+    candidates = [data_resource] if data_resource else [str(name) for name in resource_names or ()]
+    definitions = [lookup_resource(resources, name) for name in dict.fromkeys(candidates)]
+    dataframes = [definition for definition in definitions if definition is not None and definition.kind == "dataframe"]
+    if len(dataframes) != 1:
+        return None
+    return dataframes[0]
+
+
+class _VegaLiteReducer:
+    def __init__(self, spec: Mapping[str, Any], df: Any, *, downsample: str | None, max_points: int) -> None:
+        self.spec = deepcopy(dict(spec))
+        self.df = df
+        self.downsample = downsample
+        self.max_points = max(int(max_points), 3)
+        self.reduced = False
+
+    def run(self) -> dict[str, Any] | None:
+        spec = self.spec
+        if any(key in spec for key in _COMPOSITE_KEYS):
+            raise _Unsupported
+        encoding = spec.get("encoding")
+        if not isinstance(encoding, dict) or not encoding:
+            raise _Unsupported
+
+        frame = self.df
+        for transform in spec.pop("transform", None) or []:
+            frame = self._apply_transform(frame, transform)
+            self.reduced = self.reduced or "aggregate" in transform
+
+        channels = _encoding_channels(encoding)
+        if any(_channel_aggregate(definition) is not None for _, definition in channels):
+            frame = self._aggregate_encoding(frame, encoding, channels)
+            self.reduced = True
+        if len(frame) > self.max_points:
+            frame = self._limit(frame, encoding)
+
+        if not self.reduced:
+            return None
+        spec["data"] = {"values": dataframe_records(frame.reset_index(drop=True))}
+        return spec
+
+    # -- transforms -------------------------------------------------------
+
+    def _apply_transform(self, frame: Any, transform: Any) -> Any:
+        if not isinstance(transform, dict):
+            raise _Unsupported
+        if "aggregate" in transform and set(transform) <= {"aggregate", "groupby"}:
+            groupby = [_column(frame, field) for field in transform.get("groupby") or []]
+            measures = []
+            for item in transform["aggregate"]:
+                op = item.get("op")
+                field = item.get("field")
+                output = item.get("as") or (f"{op}_{field}" if field else op)
+                measures.append((op, None if op == "count" and field is None else _column(frame, field), str(output)))
+            return _group_aggregate(frame, groupby, measures)
+        if "timeUnit" in transform and set(transform) <= {"timeUnit", "field", "as"}:
+            frame = frame.copy(deep=False)
+            frame[str(transform["as"])] = _time_unit_values(frame[_column(frame, transform.get("field"))], transform["timeUnit"])
+            return frame
+        if "bin" in transform and set(transform) <= {"bin", "field", "as"}:
+            output = transform["as"]
+            start, end = (output if isinstance(output, list) and len(output) == 2 else [output, f"{output}_end"])
+            if not isinstance(start, str) or not isinstance(end, str):
+                raise _Unsupported
+            values = frame[_column(frame, transform.get("field"))]
+            bins, step = _bin_values(values, transform["bin"], default_maxbins=10)
+            frame = frame.copy(deep=False)
+            frame[start] = bins
+            frame[end] = bins + step
+            return frame
+        raise _Unsupported
+
+    # -- encoding aggregation ---------------------------------------------
+
+    def _aggregate_encoding(self, frame: Any, encoding: dict[str, Any], channels: list[tuple[str, dict[str, Any]]]) -> Any:
+        import pandas as pd
+
+        keys: dict[str, Any] = {}
+        measures: list[tuple[str, str | None, str]] = []
+        bin_steps: dict[str, tuple[str, float]] = {}
+        taken = {field for _, definition in channels if isinstance(field := definition.get("field"), str)}
+        claimed: set[str] = set()
+        raw_columns: dict[str, str] = {}
+
+        def claim(preferred: str, fallback: str) -> str:
+            name = preferred if preferred not in claimed else fallback
+            index = 1
+            while name in claimed or (name != preferred and name in taken):
+                index += 1
+                name = f"{fallback}_{index}"
+            claimed.add(name)
+            return name
+
+        # Dimensions first, so measures cannot take the name of a group key.
+        for channel, definition in channels:
+            if _channel_aggregate(definition) is not None:
+                continue
+            if "condition" in definition or "sort" in definition and isinstance(definition["sort"], dict):
+                raise _Unsupported
+            field = definition.get("field")
+            if field is None:
+                continue
+            source = frame[_column(frame, field)]
+            time_unit = definition.get("timeUnit")
+            bin_spec = definition.get("bin")
+            if bin_spec not in (None, False, "binned"):
+                pair = _POSITION_PAIRS.get(channel)
+                if pair is None or pair in encoding:
+                    raise _Unsupported
+                values, step = _bin_values(source, bin_spec, default_maxbins=10)
+                start = claim(f"bin_{field}", f"bin_{field}")
+                end = claim(f"bin_{field}_end", f"bin_{field}_end")
+                keys[start] = values
+                bin_steps[start] = (end, step)
+                definition["field"] = start
+                definition["bin"] = {"binned": True, "step": step}
+                definition.setdefault("title", f"{field} (binned)")
+                encoding[pair] = {"field": end}
+            elif time_unit is not None:
+                column = claim(field, f"{_time_unit_name(time_unit)}_{field}")
+                keys[column] = _time_unit_values(source, time_unit)
+                if column != field:
+                    definition["field"] = column
+                    definition.setdefault("title", f"{field} ({_time_unit_name(time_unit)})")
+            elif field in raw_columns:
+                definition["field"] = raw_columns[field]
+            else:
+                column = raw_columns[field] = claim(field, f"{field}_value")
+                keys[column] = source
+                if column != field:
+                    definition["field"] = column
+                    definition.setdefault("title", field)
+
+        for channel, definition in channels:
+            op = _channel_aggregate(definition)
+            if op is None:
+                continue
+            if op not in _AGGREGATE_OPS or "condition" in definition or "bin" in definition or "timeUnit" in definition:
+                raise _Unsupported
+            if isinstance(definition.get("sort"), dict):
+                raise _Unsupported
+            field = definition.get("field")
+            if op == "count" and field is None:
+                column = claim("__count", "__count")
+                measures.append(("count", None, column))
+            else:
+                if field is None:
+                    raise _Unsupported
+                source = _column(frame, field)
+                fallback = f"{op}_{field}"
+                column = claim(field, fallback) if op in _IDENTITY_OPS and field not in keys else claim(fallback, fallback)
+                measures.append((op, source, column))
+            if op in _IDENTITY_OPS and column == field:
+                continue
+            definition.setdefault("title", _aggregate_title(op, field))
+            definition["field"] = column
+            definition["aggregate"] = op if op in _IDENTITY_OPS else "sum"
+
+        work = pd.DataFrame(keys, index=frame.index)
+        for _, source, _ in measures:
+            if source is not None and source not in work:
+                work[source] = frame[source]
+        result = _group_aggregate(work, list(keys), measures)
+        for start, (end, step) in bin_steps.items():
+            result[end] = result[start] + step
+        return result
+
+    # -- downsampling -----------------------------------------------------
+
+    def _limit(self, frame: Any, encoding: dict[str, Any]) -> Any:
+        # Grouping by an ID-like field can leave nearly as many rows as the
+        # source, so aggregated rows are held to ``max_points`` as well: series
+        # are downsampled where possible, otherwise the first groups are kept.
+        downsampled = self._downsample(frame, encoding) if self.downsample is not None else None
+        if downsampled is not None:
+            self.reduced = True
+            return downsampled
+        if self.reduced:
+            return frame.iloc[: self.max_points]
+        return frame
+
+    def _downsample(self, frame: Any, encoding: dict[str, Any]) -> Any | None:
+        import numpy as np
+        import pandas as pd
+
+        mark = self.spec.get("mark")
+        mark_type = mark.get("type") if isinstance(mark, dict) else mark
+        x, y = encoding.get("x"), encoding.get("y")
+        if mark_type not in _DOWNSAMPLE_MARKS or "order" in encoding or not isinstance(x, dict) or not isinstance(y, dict):
+            return None
+        # Aggregated rows hold one row per group with ``timeUnit`` already
+        # applied, and every remaining aggregate is the identity on one row.
+        excluded = ("bin", "condition") if self.reduced else ("bin", "timeUnit", "aggregate", "condition")
+        if any(key in definition for definition in (x, y) for key in excluded):
+            return None
+        if x.get("type") not in ("quantitative", "temporal") or y.get("type") != "quantitative":
+            return None
+        x_field, y_field = x.get("field"), y.get("field")
+        if not isinstance(x_field, str) or not isinstance(y_field, str) or x_field not in frame or y_field not in frame:
+            return None
+        x_values, y_values = frame[x_field], frame[y_field]
+        if x_values.dtype.kind not in "iufM" or y_values.dtype.kind not in "iuf":
+            return None
+
+        series_fields = []
+        for channel in _SERIES_CHANNELS:
+            for definition in _as_list(encoding.get(channel)):
+                field = definition.get("field") if isinstance(definition, dict) else None
+                if isinstance(field, str) and definition.get("type") in ("nominal", "ordinal", None):
+                    series_fields.append(_column(frame, field))
+
+        valid = frame[x_values.notna() & y_values.notna()]
+        groups = valid.groupby(series_fields, dropna=False, sort=False, observed=True) if series_fields else [(None, valid)]
+        picked = []
+        total = len(valid)
+        for _, group in groups:
+            group = group.sort_values(x_field, kind="stable")
+            budget = max(3, round(self.max_points * len(group) / total)) if total else 3
+            xs = group[x_field].astype("int64") if x_values.dtype.kind == "M" else group[x_field]
+            xs = xs.to_numpy(dtype=np.float64)
+            ys = group[y_field].to_numpy(dtype=np.float64)
+            indices = _lttb_indices(xs, ys, budget) if self.downsample == "lttb" else _minmax_indices(ys, budget)
+            picked.append(group.iloc[indices])
+        if not picked:
+            return None
+        return pd.concat(picked)
+
+
+# -- helpers ----------------------------------------------------------------
+
+
+def _encoding_channels(encoding: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+    channels = []
+    for channel, value in encoding.items():
+        for definition in _as_list(value):
+            if not isinstance(definition, dict):
+                raise _Unsupported
+            field = definition.get("field")
+            if field is not None and not isinstance(field, str):
+                raise _Unsupported
+            channels.append((channel, definition))
+    return channels
+
+
+def _as_list(value: Any) -> list[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _channel_aggregate(definition: dict[str, Any]) -> str | None:
+    aggregate = definition.get("aggregate")
+    if aggregate is None:
+        return None
+    if not isinstance(aggregate, str):
+        raise _Unsupported
+    return aggregate
+
+
+def _aggregate_title(op: str, field: str | None) -> str:
+    if op == "count":
+        return "Count of Records"
+    return f"{_OP_TITLES.get(op, op.title())} of {field}"
+
+
+def _column(frame: Any, field: Any) -> str:
+    if not isinstance(field, str) or field not in frame.columns:
+        raise _Unsupported
+    return field
+
+
+def _group_aggregate(frame: Any, keys: list[str], measures: list[tuple[str, str | None, str]]) -> Any:
+    import numpy as np
+    import pandas as pd
+
+    by: Any = keys if keys else np.zeros(len(frame), dtype=np.int8)
+    grouped = frame.groupby(by, dropna=False, sort=False, observed=True)
+    size = grouped.size()
+    columns = {}
+    for op, field, output in measures:
+        if op not in _AGGREGATE_OPS or (field is None and op != "count"):
+            raise _Unsupported
+        if op == "count":
+            columns[output] = size
+            continue
+        try:
+            columns[output] = _aggregate_column(grouped[field], op, size)
+        except (TypeError, ValueError) as exc:
+            raise _Unsupported from exc
+    result = pd.DataFrame(columns, index=size.index)
+    if keys:
+        return result.reset_index()
+    return result.reset_index(drop=True)
+
+
+def _aggregate_column(values: Any, op: str, size: Any) -> Any:
+    if op in ("mean", "average"):
+        return values.mean()
+    if op in ("sum", "min", "max", "median"):
+        return getattr(values, op)()
+    if op == "product":
+        return values.prod()
+    if op == "valid":
+        return values.count()
+    if op == "missing":
+        return size - values.count()
+    if op == "distinct":
+        return values.nunique(dropna=False)
+    if op in ("variance", "variancep"):
+        return values.var(ddof=1 if op == "variance" else 0)
+    if op in ("stdev", "stdevp"):
+        return values.std(ddof=1 if op == "stdev" else 0)
+    return values.quantile(0.25 if op == "q1" else 0.75)
+
+
+def _time_unit_name(time_unit: Any) -> str:
+    if isinstance(time_unit, dict) and set(time_unit) == {"unit"}:
+        time_unit = time_unit["unit"]
+    if not isinstance(time_unit, str):
+        raise _Unsupported
+    return time_unit
+
+
+def _time_unit_values(series: Any, time_unit: Any) -> Any:
+    """Timestamps that Vega-Lite maps to the same ``time_unit`` bucket as ``series``.
+
+    Applying the unit again in the browser is then a no-op. Naive columns are
+    parsed as local time by the browser and need a local unit; tz-aware
+    columns are sent in UTC and need a ``utc`` unit.
+    """
+
+    import numpy as np
+    import pandas as pd
+
+    unit = _time_unit_name(time_unit)
+    utc = unit.startswith("utc")
+    if utc:
+        unit = unit[3:]
+    aware = isinstance(series.dtype, pd.DatetimeTZDtype)
+    if series.dtype.kind != "M" or aware != utc:
+        raise _Unsupported
+    if aware:
+        series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+    parts = _time_unit_parts(unit)
+
+    values = series.to_numpy(dtype="datetime64[ms]")
+    years = values.astype("datetime64[Y]")
+    months = values.astype("datetime64[M]")
+    days = values.astype("datetime64[D]")
+    result = (years if "year" in parts else np.datetime64("2012", "Y")).astype("datetime64[M]")
+    if "month" in parts:
+        result = result + (months - years.astype("datetime64[M]"))
+    elif "quarter" in parts:
+        result = result + (months - years.astype("datetime64[M]")) // 3 * 3
+    result = result.astype("datetime64[ms]")
+    if "date" in parts:
+        result = result + (days - months.astype("datetime64[D]"))
+    for part, unit_type, coarser in (
+        ("hours", "datetime64[h]", days),
+        ("minutes", "datetime64[m]", values.astype("datetime64[h]")),
+        ("seconds", "datetime64[s]", values.astype("datetime64[m]")),
+        ("milliseconds", "datetime64[ms]", values.astype("datetime64[s]")),
+    ):
+        if part in parts:
+            result = result + (values.astype(unit_type) - coarser)
+    result[np.isnat(values)] = np.datetime64("NaT")
+    output = pd.Series(result, index=series.index)
+    return output.dt.tz_localize("UTC") if aware else output
+
+
+def _time_unit_parts(unit: str) -> set[str]:
+    parts = set()
+    position = 0
+    while position < len(unit):
+        for part in _TIME_UNIT_PARTS:
+            if unit.startswith(part, position):
+                parts.add(part)
+                position += len(part)
+                break
+        else:
+            # ``week``, ``day`` (of week) and ``dayofyear`` have no cheap
+            # equivalent here.
+            raise _Unsupported
+    return parts
+
+
+def _bin_values(series: Any, bin_spec: Any, *, default_maxbins: int) -> tuple[Any, float]:
+    """Bin starts and the step, using Vega's ``bin`` algorithm over the data extent."""
+
+    import numpy as np
+    import pandas as pd
+
+    if bin_spec is True:
+        options: dict[str, Any] = {}
+    elif isinstance(bin_spec, dict) and set(bin_spec) <= {"maxbins", "step", "steps", "base", "divide", "nice", "minstep"}:
+        options = bin_spec
+    else:
+        raise _Unsupported
+    if series.dtype.kind not in "iuf":
+        raise _Unsupported
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        raise _Unsupported
+    start, stop, step = _bin_extent(float(finite.min()), float(finite.max()), options, default_maxbins)
+    clipped = np.clip(values, start, stop - step)
+    bins = start + step * np.floor(1e-14 + (clipped - start) / step)
+    bins[~np.isfinite(values)] = np.nan
+    return pd.Series(bins, index=series.index), step
+
+
+def _bin_extent(minimum: float, maximum: float, options: Mapping[str, Any], default_maxbins: int) -> tuple[float, float, float]:
+    # Port of vega-statistics ``bin``.
+    maxbins = options.get("maxbins") or default_maxbins
+    base = options.get("base") or 10
+    log_base = math.log(base)
+    divide = options.get("divide") or [5, 2]
+    span = (maximum - minimum) or abs(minimum) or 1
+    if options.get("step"):
+        step = float(options["step"])
+    elif options.get("steps"):
+        target = span / maxbins
+        steps = list(options["steps"])
+        index = 0
+        while index < len(steps) and steps[index] < target:
+            index += 1
+        step = float(steps[max(0, index - 1)])
+    else:
+        level = math.ceil(math.log(maxbins) / log_base)
+        minstep = options.get("minstep") or 0
+        step = max(minstep, base ** (round(math.log(span) / log_base) - level))
+        while math.ceil(span / step) > maxbins:
+            step *= base
+        for divisor in divide:
+            candidate = step / divisor
+            if candidate >= minstep and span / candidate <= maxbins:
+                step = candidate
+    log_step = math.log(step)
+    precision = 0 if log_step >= 0 else int(-log_step / log_base) + 1
+    eps = base ** (-precision - 1)
+    if options.get("nice", True):
+        nice = math.floor(minimum / step + eps) * step
+        minimum = nice - step if minimum < nice else nice
+        maximum = math.ceil(maximum / step) * step
+    return minimum, (minimum + step if maximum == minimum else maximum), step
+
+
+def _lttb_indices(x: Any, y: Any, threshold: int) -> Any:
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` representative points."""
+
+    import numpy as np
+
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+    picked = np.empty(threshold, dtype=np.int64)
+    picked[0], picked[-1] = 0, count - 1
+    every = (count - 2) / (threshold - 2)
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        average_x = x[end:next_end].mean()
+        average_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[anchor] - average_x) * (y[start:end] - y[anchor]) - (x[anchor] - x[start:end]) * (average_y - y[anchor])
+        )
+        anchor = start + int(areas.argmax())
+        picked[bucket + 1] = anchor
+    return picked
+
+
+def _minmax_indices(y: Any, threshold: int) -> Any:
+    """First and last point plus the minimum and maximum of each bucket, in order."""
+
+    import numpy as np
+
+    count = len(y)
+    buckets = max((threshold - 2) // 2, 1)
+    if threshold >= count:
+        return np.arange(count)
+    edges = np.linspace(1, count - 1, buckets + 1).astype(np.int64)
+    picked = [0, count - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            window = y[start:end]
+            picked.extend((start + int(window.argmin()), start + int(window.argmax())))
+    return np.unique(np.asarray(picked, dtype=np.int64))
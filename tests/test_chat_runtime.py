@@ -0,0 +1,720 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from streamlit_ai_elements.chat.adapters import ResponsesStreamAdapter, StreamingAdapterRequest, _abatch_deltas
+from streamlit_ai_elements.chat.runtime import (
+    astream_assistant_turn,
+    astream_chat_turn,
+    stream_assistant_turn,
+    stream_chat_turn,
+)
+from streamlit_ai_elements.chat import tools
+from streamlit_ai_elements.chat.tools import (
+    _TOOL_EXECUTORS,
+    build_chat_completions_tools,
+    build_responses_tools,
+    register_tool_executor,
+    tool_schema_hash,
+)
+from streamlit_ai_elements.chat.types import (
+    ChatBackendConfig,
+    DeltaBatchingPolicy,
+    ToolExecutionPolicy,
+    create_session_state,
+)
+
+
+SANDBOX_ARGUMENTS = json.dumps({"js": "container.textContent = 'ok'"})
+
+
+def tool_call_chunks(arguments=SANDBOX_ARGUMENTS, call_id="call_1", name="sandbox", index=0):
+    midpoint = len(arguments) // 2
+    return [
+        {"choices": [{"delta": {"tool_calls": [{"index": index, "id": call_id, "function": {"name": name}}]}}]},
+        {"choices": [{"delta": {"tool_calls": [{"index": index, "function": {"arguments": arguments[:midpoint]}}]}}]},
+        {"choices": [{"delta": {"tool_calls": [{"index": index, "function": {"arguments": arguments[midpoint:]}}]}}]},
+    ]
+
+
+def text_chunks(text="Rendered."):
+    return [
+        {"choices": [{"delta": {"content": text}}]},
+        {"choices": [{"delta": {}, "finish_reason": "stop"}]},
+    ]
+
+
+def finish_with_tool_calls():
+    return [{"choices": [{"delta": {}, "finish_reason": "tool_calls"}]}]
+
+
+class FakeChatCompletions:
+    def __init__(self, cycles):
+        self._cycles = list(cycles)
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return iter(self._cycles.pop(0))
+
+
+class FakeAsyncChatCompletions(FakeChatCompletions):
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return _aiter(self._cycles.pop(0))
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+def make_client(cycles, *, asynchronous=False):
+    completions_type = FakeAsyncChatCompletions if asynchronous else FakeChatCompletions
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions_type(cycles)))
+
+
+def sandbox_turn_cycles():
+    return [tool_call_chunks() + finish_with_tool_calls(), text_chunks()]
+
+
+async def collect(async_events):
+    return [event async for event in async_events]
+
+
+CONFIG = ChatBackendConfig(model="test-model", backend="chat_completions")
+
+
+class StreamAssistantTurnTests(unittest.TestCase):
+    def test_tool_cycle_renders_element_and_continues_with_tool_outputs(self):
+        client = make_client(sandbox_turn_cycles())
+        session = create_session_state()
+
+        events = list(stream_chat_turn(client, "make a dashboard", state=session, config=CONFIG))
+
+        self.assertEqual(
+            [event["type"] for event in events],
+            [
+                "message_started",
+                "tool_call_started",
+                "tool_call_delta",
+                "tool_call_delta",
+                "tool_call_completed",
+                "renderer_placeholder_started",
+                "renderer_completed",
+                "tool_call_completed",
+                "text_delta",
+                "message_completed",
+            ],
+        )
+        follow_up_messages = client.chat.completions.calls[1]["messages"]
+        self.assertEqual(follow_up_messages[-2]["tool_calls"][0]["function"]["arguments"], SANDBOX_ARGUMENTS)
+        self.assertEqual(follow_up_messages[-1]["role"], "tool")
+        assistant_message = session.messages[-1]
+        self.assertEqual(assistant_message.status, "completed")
+        self.assertEqual(assistant_message.content, "Rendered.")
+        self.assertEqual(assistant_message.rendered_elements[0]["type"], "sandbox")
+
+
+class AsyncStreamAssistantTurnTests(unittest.TestCase):
+    def test_async_turn_matches_sync_event_stream(self):
+        sync_session = create_session_state()
+        sync_events = list(
+            stream_chat_turn(make_client(sandbox_turn_cycles()), "dashboard", state=sync_session, config=CONFIG)
+        )
+        async_session = create_session_state()
+        async_events = asyncio.run(
+            collect(
+                astream_chat_turn(
+                    make_client(sandbox_turn_cycles(), asynchronous=True),
+                    "dashboard",
+                    state=async_session,
+                    config=CONFIG,
+                )
+            )
+        )
+
+        strip = lambda event: {key: value for key, value in event.items() if key not in {"event_id", "message_id"}}
+        self.assertEqual([strip(event) for event in async_events], [strip(event) for event in sync_events])
+        self.assertEqual(async_session.messages[-1].content, sync_session.messages[-1].content)
+        self.assertEqual(len(async_session.timeline), len(sync_session.timeline))
+
+    def test_async_turns_can_run_concurrently(self):
+        async def run_turns():
+            sessions = [create_session_state() for _ in range(3)]
+            clients = [make_client([text_chunks(f"answer {index}")], asynchronous=True) for index in range(3)]
+            await asyncio.gather(
+                *(
+                    collect(astream_assistant_turn(client, state=session, config=CONFIG))
+                    for client, session in zip(clients, sessions)
+                )
+            )
+            return sessions
+
+        sessions = asyncio.run(run_turns())
+
+        self.assertEqual([str(session.messages[-1].content) for session in sessions], ["answer 0", "answer 1", "answer 2"])
+
+
+def parallel_lookup_cycles(delays):
+    first_cycle = []
+    for index, delay in enumerate(delays):
+        first_cycle.extend(
+            tool_call_chunks(
+                arguments=json.dumps({"delay": delay, "label": f"lookup {index}"}),
+                call_id=f"call_{index}",
+                name="slow_lookup",
+                index=index,
+            )
+        )
+    return [first_cycle + finish_with_tool_calls(), text_chunks("Done.")]
+
+
+def slow_lookup(arguments, resources):
+    del resources
+    time.sleep(arguments["delay"])
+    return {"output_text": arguments["label"], "card_policy": "augment", "is_renderer": False}
+
+
+class ToolExecutionPolicyTests(unittest.TestCase):
+    def setUp(self):
+        register_tool_executor("slow_lookup", slow_lookup)
+
+    def tearDown(self):
+        _TOOL_EXECUTORS.pop("slow_lookup", None)
+
+    def completed_outputs(self, events):
+        return [event["output"] for event in events if event["type"] == "tool_call_completed" and "output" in event]
+
+    def test_concurrent_tool_calls_keep_request_order(self):
+        client = make_client(parallel_lookup_cycles([0.3, 0.1, 0.2]))
+        started = time.monotonic()
+
+        events = list(
+            stream_assistant_turn(
+                client,
+                state=create_session_state(),
+                config=CONFIG,
+                tool_execution=ToolExecutionPolicy(max_concurrency=3),
+            )
+        )
+
+        self.assertLess(time.monotonic() - started, 0.55)
+        self.assertEqual(self.completed_outputs(events), ["lookup 0", "lookup 1", "lookup 2"])
+        follow_up_messages = client.chat.completions.calls[1]["messages"]
+        self.assertEqual(
+            [message["content"] for message in follow_up_messages if message["role"] == "tool"],
+            ["lookup 0", "lookup 1", "lookup 2"],
+        )
+
+    def test_concurrency_limit_bounds_running_tool_calls(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def tracked_lookup(arguments, resources):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            try:
+                return slow_lookup(arguments, resources)
+            finally:
+                with lock:
+                    running.pop()
+
+        register_tool_executor("slow_lookup", tracked_lookup)
+        list(
+            stream_assistant_turn(
+                make_client(parallel_lookup_cycles([0.05] * 5)),
+                state=create_session_state(),
+                config=CONFIG,
+                tool_execution=ToolExecutionPolicy(max_concurrency=2),
+            )
+        )
+
+        self.assertEqual(max(peak), 2)
+
+    def test_timed_out_tool_call_is_reported_to_the_model(self):
+        client = make_client(parallel_lookup_cycles([1.0, 0.0]))
+
+        events = list(
+            stream_assistant_turn(
+                client,
+                state=create_session_state(),
+                config=CONFIG,
+                tool_execution=ToolExecutionPolicy(max_concurrency=2, timeout=0.1),
+            )
+        )
+
+        outputs = self.completed_outputs(events)
+        self.assertIn("timed out", outputs[0])
+        self.assertEqual(outputs[1], "lookup 1")
+        self.assertEqual(events[-1]["type"], "message_completed")
+
+    def test_calls_queued_behind_a_stalled_worker_are_skipped(self):
+        started = time.monotonic()
+
+        events = list(
+            stream_assistant_turn(
+                make_client(parallel_lookup_cycles([1.0, 0.0])),
+                state=create_session_state(),
+                config=CONFIG,
+                tool_execution=ToolExecutionPolicy(timeout=0.1),
+            )
+        )
+
+        outputs = self.completed_outputs(events)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertIn("timed out", outputs[0])
+        self.assertIn("was not run", outputs[1])
+        self.assertEqual(events[-1]["type"], "message_completed")
+
+    def test_failed_tool_call_cancels_calls_that_have_not_started(self):
+        calls = []
+
+        def failing_lookup(arguments, resources):
+            calls.append(arguments["label"])
+            if arguments["label"] == "lookup 0":
+                time.sleep(0.05)
+                raise RuntimeError("lookup failed")
+            return slow_lookup(arguments, resources)
+
+        register_tool_executor("slow_lookup", failing_lookup)
+        events = list(
+            stream_assistant_turn(
+                make_client(parallel_lookup_cycles([0.0, 0.2, 0.2])),
+                state=create_session_state(),
+                config=CONFIG,
+                tool_execution=ToolExecutionPolicy(eager=True),
+            )
+        )
+        time.sleep(0.3)
+
+        self.assertEqual(events[-1]["type"], "message_error")
+        self.assertIn("lookup failed", events[-1]["error"])
+        # The worker may pick up the next call before the failure is seen.
+        self.assertEqual(calls[0], "lookup 0")
+        self.assertNotIn("lookup 2", calls)
+
+    def test_async_concurrent_tool_calls_keep_request_order(self):
+        async def run_turn():
+            return await collect(
+                astream_assistant_turn(
+                    make_client(parallel_lookup_cycles([0.2, 0.0, 0.1]), asynchronous=True),
+                    state=create_session_state(),
+                    config=CONFIG,
+                    tool_execution=ToolExecutionPolicy(max_concurrency=3, timeout=1.0),
+                )
+            )
+
+        events = asyncio.run(run_turn())
+
+        self.assertEqual(self.completed_outputs(events), ["lookup 0", "lookup 1", "lookup 2"])
+
+    def test_async_timed_out_calls_keep_their_slot_until_they_return(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def tracked_lookup(arguments, resources):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            try:
+                return slow_lookup(arguments, resources)
+            finally:
+                with lock:
+                    running.pop()
+
+        register_tool_executor("slow_lookup", tracked_lookup)
+
+        async def run_turn():
+            started = time.monotonic()
+            events = await collect(
+                astream_assistant_turn(
+                    make_client(parallel_lookup_cycles([0.5, 0.0, 0.0]), asynchronous=True),
+                    state=create_session_state(),
+                    config=CONFIG,
+                    tool_execution=ToolExecutionPolicy(timeout=0.1),
+                )
+            )
+            return events, time.monotonic() - started
+
+        # asyncio.run itself waits for the hung worker thread on exit.
+        events, elapsed = asyncio.run(run_turn())
+
+        outputs = self.completed_outputs(events)
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual(max(peak), 1)
+        self.assertIn("timed out", outputs[0])
+        self.assertEqual(["was not run" in output for output in outputs[1:]], [True, True])
+
+    def test_closing_an_async_turn_cancels_tool_calls_that_have_not_started(self):
+        calls = []
+
+        def recorded_lookup(arguments, resources):
+            calls.append(arguments["label"])
+            return slow_lookup(arguments, resources)
+
+        register_tool_executor("slow_lookup", recorded_lookup)
+
+        async def slow_cycle():
+            specs = [(f"call_{index}", json.dumps({"delay": 0.2, "label": f"lookup {index}"})) for index in range(2)]
+            for event in responses_tool_cycle(specs):
+                yield event
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                yield {"type": "response.output_text.delta", "delta": "."}
+
+        class AsyncResponses(FakeResponses):
+            async def create(self, **kwargs):
+                return FakeResponses.create(self, **kwargs)
+
+        async def run_turn():
+            turn = astream_assistant_turn(
+                SimpleNamespace(responses=AsyncResponses([slow_cycle()])),
+                state=create_session_state(),
+                config=ChatBackendConfig(model="test-model", backend="responses"),
+                tool_execution=ToolExecutionPolicy(eager=True),
+            )
+            async for event in turn:
+                if event["type"] == "text_delta":
+                    break
+            await turn.aclose()
+            await asyncio.sleep(0.4)
+
+        asyncio.run(run_turn())
+
+        self.assertEqual(calls, ["lookup 0"])
+
+
+
+def responses_tool_cycle(call_specs, *, trailing_text_deltas=0, delay=0.0):
+    yield {"type": "response.created", "response": {"id": "resp_1"}}
+    for index, (call_id, arguments) in enumerate(call_specs):
+        item = {"type": "function_call", "id": f"fc_{index}", "call_id": call_id, "name": "slow_lookup", "arguments": ""}
+        yield {"type": "response.output_item.added", "output_index": index, "item": item}
+        yield {"type": "response.function_call_arguments.delta", "item_id": f"fc_{index}", "output_index": index, "delta": arguments}
+        yield {"type": "response.function_call_arguments.done", "item_id": f"fc_{index}", "output_index": index, "arguments": arguments}
+    for _ in range(trailing_text_deltas):
+        time.sleep(delay)
+        yield {"type": "response.output_text.delta", "delta": "."}
+
+
+class FakeResponses:
+    def __init__(self, cycles):
+        self._cycles = list(cycles)
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return self._cycles.pop(0)
+
+
+class EagerToolExecutionTests(unittest.TestCase):
+    def setUp(self):
+        register_tool_executor("slow_lookup", slow_lookup)
+
+    def tearDown(self):
+        _TOOL_EXECUTORS.pop("slow_lookup", None)
+
+    def test_eager_mode_emits_tool_results_while_the_model_is_still_streaming(self):
+        arguments = json.dumps({"delay": 0.0, "label": "early"})
+        responses = FakeResponses(
+            [
+                responses_tool_cycle([("call_1", arguments)], trailing_text_deltas=20, delay=0.01),
+                iter([{"type": "response.output_text.delta", "delta": "Done."}]),
+            ]
+        )
+        client = SimpleNamespace(responses=responses)
+
+        events = list(
+            stream_assistant_turn(
+                client,
+                state=create_session_state(),
+                config=ChatBackendConfig(model="test-model", backend="responses"),
+                tool_execution=ToolExecutionPolicy(eager=True),
+            )
+        )
+
+        event_types = [event["type"] for event in events]
+        result_index = next(
+            index for index, event in enumerate(events) if event["type"] == "tool_call_completed" and "output" in event
+        )
+        last_stream_delta = max(index for index, event_type in enumerate(event_types) if event_type == "text_delta" and events[index]["delta"] == ".")
+        self.assertLess(result_index, last_stream_delta)
+        self.assertEqual(events[result_index]["output"], "early")
+        self.assertEqual(responses.calls[1]["input"], [{"type": "function_call_output", "call_id": "call_1", "output": "early"}])
+        self.assertEqual(event_types[-1], "message_completed")
+
+    def test_eager_mode_keeps_submission_order_for_parallel_calls(self):
+        specs = [
+            ("call_a", json.dumps({"delay": 0.2, "label": "a"})),
+            ("call_b", json.dumps({"delay": 0.0, "label": "b"})),
+        ]
+        responses = FakeResponses([responses_tool_cycle(specs), iter([])])
+
+        events = list(
+            stream_assistant_turn(
+                SimpleNamespace(responses=responses),
+                state=create_session_state(),
+                config=ChatBackendConfig(model="test-model", backend="responses"),
+                tool_execution=ToolExecutionPolicy(max_concurrency=2, eager=True),
+            )
+        )
+
+        outputs = [event["output"] for event in events if event["type"] == "tool_call_completed" and "output" in event]
+        self.assertEqual(outputs, ["a", "b"])
+        self.assertEqual([item["call_id"] for item in responses.calls[1]["input"]], ["call_a", "call_b"])
+
+    def test_eager_calls_submitted_after_every_worker_stalled_are_skipped(self):
+        def cycle():
+            hang = json.dumps({"delay": 1.0, "label": "hang"})
+            yield from responses_tool_cycle([("call_1", hang)], trailing_text_deltas=8, delay=0.05)
+            item = {"type": "function_call", "id": "fc_1", "call_id": "call_2", "name": "slow_lookup", "arguments": ""}
+            arguments = json.dumps({"delay": 0.0, "label": "late"})
+            yield {"type": "response.output_item.added", "output_index": 1, "item": item}
+            yield {"type": "response.function_call_arguments.done", "item_id": "fc_1", "output_index": 1, "arguments": arguments}
+
+        started = time.monotonic()
+        events = list(
+            stream_assistant_turn(
+                SimpleNamespace(responses=FakeResponses([cycle(), iter([])])),
+                state=create_session_state(),
+                config=ChatBackendConfig(model="test-model", backend="responses"),
+                tool_execution=ToolExecutionPolicy(timeout=0.2, eager=True),
+            )
+        )
+
+        outputs = [event["output"] for event in events if event["type"] == "tool_call_completed" and "output" in event]
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertIn("timed out", outputs[0])
+        self.assertIn("was not run", outputs[1])
+        self.assertEqual(events[-1]["type"], "message_completed")
+
+    def test_async_eager_mode_runs_tool_calls_during_the_stream(self):
+        arguments = json.dumps({"delay": 0.0, "label": "early"})
+
+        async def slow_cycle():
+            for event in responses_tool_cycle([("call_1", arguments)]):
+                yield event
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                yield {"type": "response.output_text.delta", "delta": "."}
+
+        class AsyncResponses(FakeResponses):
+            async def create(self, **kwargs):
+                return FakeResponses.create(self, **kwargs)
+
+        responses = AsyncResponses([slow_cycle(), _aiter([])])
+
+        events = asyncio.run(
+            collect(
+                astream_assistant_turn(
+                    SimpleNamespace(responses=responses),
+                    state=create_session_state(),
+                    config=ChatBackendConfig(model="test-model", backend="responses"),
+                    tool_execution=ToolExecutionPolicy(eager=True),
+                )
+            )
+        )
+
+        event_types = [event["type"] for event in events]
+        result_index = next(
+            index for index, event in enumerate(events) if event["type"] == "tool_call_completed" and "output" in event
+        )
+        self.assertIn("text_delta", event_types[result_index:])
+        self.assertEqual(event_types[-1], "message_completed")
+
+
+LOOKUP_DEFINITION = {
+    "description": "Look up a label.",
+    "parameters": {"type": "object", "properties": {"label": {"type": "string"}}, "required": ["label"]},
+}
+
+
+class ToolRegistryTests(unittest.TestCase):
+    def tearDown(self):
+        _TOOL_EXECUTORS.pop("lookup", None)
+        tools._CUSTOM_TOOL_DEFINITIONS.pop("lookup", None)
+        tools._TOOL_PAYLOADS.clear()
+
+    def test_tool_payloads_are_built_once_and_read_only(self):
+        first = build_responses_tools()
+
+        self.assertIs(build_responses_tools(), first)
+        self.assertIs(build_chat_completions_tools(), build_chat_completions_tools())
+        self.assertEqual(json.dumps(first), json.dumps(build_responses_tools()))
+        with self.assertRaises(TypeError):
+            first.append({"type": "function"})
+        with self.assertRaises(TypeError):
+            first[0]["parameters"]["properties"].clear()
+        self.assertEqual(tool_schema_hash("responses"), tool_schema_hash("responses"))
+        self.assertNotEqual(tool_schema_hash("responses"), tool_schema_hash("chat_completions"))
+        with self.assertRaises(ValueError):
+            tool_schema_hash("completions")
+
+    def test_registered_definitions_are_offered_to_both_backends(self):
+        before = tool_schema_hash("responses")
+
+        register_tool_executor("lookup", slow_lookup, LOOKUP_DEFINITION)
+
+        self.assertEqual(build_responses_tools()[-1], {"type": "function", "name": "lookup", **LOOKUP_DEFINITION})
+        self.assertEqual(build_chat_completions_tools()[-1]["function"]["name"], "lookup")
+        self.assertNotEqual(tool_schema_hash("responses"), before)
+        self.assertIs(_TOOL_EXECUTORS["lookup"], slow_lookup)
+
+    def test_definitions_cannot_rename_or_shadow_tools(self):
+        with self.assertRaises(ValueError):
+            register_tool_executor("lookup", slow_lookup, {**LOOKUP_DEFINITION, "name": "other"})
+        with self.assertRaises(ValueError):
+            register_tool_executor("sandbox", slow_lookup, LOOKUP_DEFINITION)
+        self.assertNotIn("lookup", _TOOL_EXECUTORS)
+
+
+def streamed_text_chunks(tokens):
+    return [{"choices": [{"delta": {"content": token}}]} for token in tokens] + [
+        {"choices": [{"delta": {}, "finish_reason": "stop"}]}
+    ]
+
+
+class DeltaBatchingTests(unittest.TestCase):
+    def run_turn(self, cycles, policy, *, asynchronous=False):
+        session = create_session_state()
+        client = make_client(cycles, asynchronous=asynchronous)
+        if asynchronous:
+            events = asyncio.run(collect(astream_chat_turn(client, "hi", state=session, config=CONFIG, delta_batching=policy)))
+        else:
+            events = list(stream_chat_turn(client, "hi", state=session, config=CONFIG, delta_batching=policy))
+        return session, [event for event in events if event["message_id"] == session.messages[-1].id]
+
+    def test_adjacent_deltas_merge_up_to_max_chars(self):
+        tokens = [f"t{index} " for index in range(10)]
+        session, events = self.run_turn([streamed_text_chunks(tokens)], DeltaBatchingPolicy(max_chars=12, max_latency=60))
+
+        deltas = [event["delta"] for event in events if event["type"] == "text_delta"]
+        self.assertEqual(deltas, ["t0 t1 t2 t3 ", "t4 t5 t6 t7 ", "t8 t9 "])
+        self.assertEqual(str(session.messages[-1].content), "".join(tokens))
+
+    def test_tool_argument_deltas_merge_without_crossing_other_events(self):
+        arguments = SANDBOX_ARGUMENTS
+        cycles = [
+            streamed_text_chunks(["Let", " me", " draw."])[:-1] + tool_call_chunks(arguments) + finish_with_tool_calls(),
+            text_chunks(),
+        ]
+
+        _, unbatched = self.run_turn(cycles, None)
+        _, batched = self.run_turn(cycles, DeltaBatchingPolicy(max_latency=60))
+
+        self.assertEqual(
+            [(event["type"], event.get("delta")) for event in batched[:5]],
+            [
+                ("message_started", None),
+                ("text_delta", "Let me draw."),
+                ("tool_call_started", None),
+                ("tool_call_delta", arguments),
+                ("tool_call_completed", None),
+            ],
+        )
+        self.assertLess(len(batched), len(unbatched))
+        self.assertEqual(
+            [event["type"] for event in batched if event["type"] not in {"text_delta", "tool_call_delta"}],
+            [event["type"] for event in unbatched if event["type"] not in {"text_delta", "tool_call_delta"}],
+        )
+
+    def test_deltas_after_max_latency_start_a_new_batch(self):
+        clock = iter([0.0, 0.01, 0.2, 0.21, 0.22])
+        with patch("streamlit_ai_elements.chat.adapters.time.monotonic", side_effect=lambda: next(clock)):
+            _, events = self.run_turn([streamed_text_chunks(["a", "b", "c", "d"])], DeltaBatchingPolicy(max_latency=0.05))
+
+        self.assertEqual([event["delta"] for event in events if event["type"] == "text_delta"], ["ab", "cd"])
+
+    def test_async_turns_batch_like_sync_turns(self):
+        policy = DeltaBatchingPolicy(max_chars=5, max_latency=60)
+        tokens = list("streaming")
+        _, sync_events = self.run_turn([streamed_text_chunks(tokens)], policy)
+        _, async_events = self.run_turn([streamed_text_chunks(tokens)], policy, asynchronous=True)
+
+        strip = lambda event: {key: value for key, value in event.items() if key not in {"event_id", "message_id"}}
+        self.assertEqual([strip(event) for event in async_events], [strip(event) for event in sync_events])
+        self.assertEqual([event["delta"] for event in sync_events if event["type"] == "text_delta"], ["strea", "ming"])
+
+    def test_async_batches_are_flushed_when_the_stream_stalls_past_max_latency(self):
+        async def stalled_stream():
+            yield {"type": "text_delta", "delta": "a"}
+            yield {"type": "text_delta", "delta": "b"}
+            await asyncio.sleep(0.5)
+            yield {"type": "text_delta", "delta": "c"}
+
+        async def run():
+            started = time.monotonic()
+            arrivals = []
+            async for event in _abatch_deltas(stalled_stream(), DeltaBatchingPolicy(max_latency=0.05)):
+                arrivals.append((event["delta"], time.monotonic() - started))
+            return arrivals
+
+        arrivals = asyncio.run(run())
+
+        self.assertEqual([delta for delta, _ in arrivals], ["ab", "c"])
+        self.assertLess(arrivals[0][1], 0.3)
+
+
+def as_sdk_object(value):
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: as_sdk_object(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [as_sdk_object(item) for item in value]
+    return value
+
+
+class ResponsesStreamAdapterTests(unittest.TestCase):
+    RAW_EVENTS = [
+        {"type": "response.created", "response": {"id": "resp_1"}},
+        {"type": "response.in_progress"},
+        {"type": "response.reasoning_summary_text.delta", "delta": "Thinking"},
+        {"type": "response.output_item.done", "item": {"type": "reasoning", "id": "rs_1", "summary": [{"text": "Plan"}]}},
+        {"type": "response.output_text.delta", "delta": "Hel"},
+        {"type": "response.output_text.delta", "delta": None},
+        {"type": "response.output_item.added", "output_index": 1, "item": {"type": "function_call", "id": "fc_1", "call_id": "call_1", "name": "sandbox"}},
+        {"type": "response.function_call_arguments.delta", "item_id": "fc_1", "delta": '{"js":'},
+        {"type": "response.function_call_arguments.delta", "output_index": 1, "delta": ' ""}'},
+        {"type": "response.function_call_arguments.done", "item_id": "fc_1", "item": {}},
+        {"type": "response.function_call_arguments.delta", "item_id": "fc_missing", "delta": "x"},
+        {"type": "error", "error": {"message": "Rate limited"}},
+    ]
+
+    def normalize(self, raw_events):
+        responses = FakeResponses([iter(raw_events)])
+        adapter = ResponsesStreamAdapter()
+        request = StreamingAdapterRequest(config=ChatBackendConfig(model="test"), instructions="", messages=[])
+        events = list(adapter.stream(SimpleNamespace(responses=responses), request))
+        return [{key: value for key, value in event.items() if key != "event_id"} for event in events]
+
+    def test_dict_events_and_sdk_objects_normalize_identically(self):
+        from_dicts = self.normalize(self.RAW_EVENTS)
+        from_objects = self.normalize([as_sdk_object(event) for event in self.RAW_EVENTS])
+
+        self.assertEqual(from_dicts, from_objects)
+        self.assertEqual(
+            [(event["type"], next(event[key] for key in ("delta", "arguments", "error") if key in event)) for event in from_dicts],
+            [
+                ("reasoning_delta", "Thinking"),
+                ("reasoning_delta", "Plan"),
+                ("text_delta", "Hel"),
+                ("text_delta", ""),
+                ("tool_call_started", ""),
+                ("tool_call_delta", '{"js":'),
+                ("tool_call_delta", ' ""}'),
+                ("tool_call_completed", '{"js": ""}'),
+                ("message_error", "Rate limited"),
+            ],
+        )
+        self.assertTrue(all(event["backend_response_id"] == "resp_1" for event in from_dicts))
+
+
+if __name__ == "__main__":
+    unittest.main()
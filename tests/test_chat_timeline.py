@@ -0,0 +1,194 @@
+import json
+import os
+import unittest
+
+from streamlit_ai_elements.chat.types import (
+    ChatMessage,
+    TextBuffer,
+    append_event,
+    create_session_state,
+    make_event,
+    new_event_id,
+    replay_timeline,
+)
+
+
+def build_tool_turn_events(message_id="msg_1", tool_call_id="call_1"):
+    element = {"type": "js_raw", "args": {"html": "<b>hi</b>"}}
+    return [
+        make_event("message_started", message_id=message_id, role="assistant"),
+        make_event("reasoning_delta", message_id=message_id, delta="Thinking "),
+        make_event("reasoning_delta", message_id=message_id, delta="hard"),
+        make_event("tool_call_started", message_id=message_id, tool_call_id=tool_call_id, tool_name="js_raw"),
+        make_event("tool_call_delta", message_id=message_id, tool_call_id=tool_call_id, delta='{"html": '),
+        make_event("tool_call_delta", message_id=message_id, tool_call_id=tool_call_id, delta='"<b>hi</b>"}'),
+        make_event(
+            "renderer_placeholder_started",
+            message_id=message_id,
+            tool_call_id=tool_call_id,
+            tool_name="js_raw",
+            card_policy="replace",
+        ),
+        make_event(
+            "renderer_completed",
+            message_id=message_id,
+            tool_call_id=tool_call_id,
+            tool_name="js_raw",
+            element=element,
+            card_policy="replace",
+        ),
+        make_event(
+            "tool_call_completed",
+            message_id=message_id,
+            tool_call_id=tool_call_id,
+            tool_name="js_raw",
+            arguments='{"html": "<b>hi</b>"}',
+            output="Element rendered successfully in the chat.",
+        ),
+        make_event("text_delta", message_id=message_id, delta="Done"),
+        make_event("text_delta", message_id=message_id, delta="."),
+        make_event("message_completed", message_id=message_id),
+    ]
+
+
+class TimelineReducerTests(unittest.TestCase):
+    def test_append_event_matches_cold_replay(self):
+        events = build_tool_turn_events()
+        session = create_session_state(session_id="session_test")
+        for event in events:
+            append_event(session, event)
+
+        replayed = replay_timeline(events, session_id="session_test")
+
+        self.assertEqual(session.timeline, replayed.timeline)
+        self.assertEqual(session.messages, replayed.messages)
+        message = session.messages[0]
+        self.assertEqual(message.content, "Done.")
+        self.assertEqual(message.reasoning, "Thinking hard")
+        self.assertEqual(message.status, "completed")
+        self.assertEqual(message.tool_calls[0].argument_preview, '{"html": "<b>hi</b>"}')
+        self.assertEqual(message.tool_calls[0].output_preview, "Element rendered successfully in the chat.")
+        self.assertEqual(len(message.rendered_elements), 1)
+
+    def test_append_event_updates_messages_in_place(self):
+        session = create_session_state()
+        append_event(session, make_event("message_started", message_id="msg_1", role="assistant"))
+        message = session.messages[0]
+
+        append_event(session, make_event("text_delta", message_id="msg_1", delta="Hello"))
+
+        self.assertIs(session.messages[0], message)
+        self.assertIs(session.messages_by_id["msg_1"], message)
+        self.assertEqual(message.content, "Hello")
+
+    def test_events_for_unknown_messages_are_ignored(self):
+        session = create_session_state()
+        append_event(session, make_event("text_delta", message_id="missing", delta="orphan"))
+
+        self.assertEqual(len(session.timeline), 1)
+        self.assertEqual(session.messages, [])
+
+    def test_create_session_state_replays_existing_timeline(self):
+        events = build_tool_turn_events()
+        session = create_session_state(timeline=events)
+        append_event(session, make_event("message_started", message_id="msg_2", role="user"))
+        append_event(session, make_event("text_delta", message_id="msg_2", delta="again"))
+
+        self.assertEqual([message.id for message in session.messages], ["msg_1", "msg_2"])
+        self.assertEqual(session.messages[1].content, "again")
+        self.assertIn(("msg_1", "call_1"), session.tool_states)
+
+    def test_tool_cards_are_updated_in_place_for_parallel_calls(self):
+        session = create_session_state()
+        append_event(session, make_event("message_started", message_id="msg_1", role="assistant"))
+        for tool_call_id in ("call_a", "call_b"):
+            append_event(
+                session,
+                make_event("tool_call_started", message_id="msg_1", tool_call_id=tool_call_id, tool_name="sandbox"),
+            )
+        card_a, card_b = session.messages[0].tool_calls
+
+        for index in range(3):
+            for tool_call_id in ("call_a", "call_b"):
+                append_event(
+                    session,
+                    make_event("tool_call_delta", message_id="msg_1", tool_call_id=tool_call_id, delta=f"{tool_call_id}{index};"),
+                )
+        append_event(
+            session,
+            make_event("tool_call_completed", message_id="msg_1", tool_call_id="call_b", arguments="{}", output="ok"),
+        )
+
+        self.assertIs(session.messages[0].tool_calls[0], card_a)
+        self.assertIs(session.messages[0].tool_calls[1], card_b)
+        self.assertEqual(card_a.argument_preview, "call_a0;call_a1;call_a2;")
+        self.assertEqual(card_a.status, "streaming")
+        self.assertEqual(card_b.argument_preview, "{}")
+        self.assertEqual(card_b.status, "completed")
+        self.assertEqual(card_b.output_preview, "ok")
+        self.assertIs(type(card_a.argument_preview), str)
+        self.assertIs(type(session.tool_states[("msg_1", "call_a")].arguments), str)
+        self.assertEqual(json.loads(card_b.argument_preview), {})
+
+
+class TextBufferTests(unittest.TestCase):
+    def test_text_buffer_joins_lazily_and_behaves_like_str(self):
+        buffer = TextBuffer("Hel")
+        buffer += "lo"
+        buffer.append(", world")
+
+        self.assertEqual(buffer, "Hello, world")
+        self.assertEqual(len(buffer), 12)
+        self.assertTrue(buffer.startswith("Hello"))
+        self.assertIn("world", buffer)
+        self.assertEqual(f"{buffer}!", "Hello, world!")
+        self.assertEqual(json.dumps(str(buffer)), '"Hello, world"')
+        self.assertFalse(TextBuffer())
+
+    def test_chat_message_exposes_buffered_text_as_str(self):
+        message = ChatMessage(id="msg_1", role="user", content="hi")
+        message.append_content(" there")
+        message.reasoning += "because"
+
+        self.assertIs(type(message.content), str)
+        self.assertEqual(json.dumps([message.content, message.reasoning]), '["hi there", "because"]')
+        self.assertEqual(message, ChatMessage(id="msg_1", role="user", content="hi there", reasoning="because"))
+
+
+class EventIdTests(unittest.TestCase):
+    def test_event_ids_are_unique_and_sort_in_creation_order(self):
+        ids = [make_event("text_delta", delta="x")["event_id"] for _ in range(1000)]
+
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(sorted(ids), ids)
+        self.assertEqual({len(event_id) for event_id in ids}, {len(ids[0])})
+
+    def test_replay_keeps_event_ids_and_new_events_sort_after_them(self):
+        timeline = build_tool_turn_events()
+        session = replay_timeline(timeline)
+        append_event(session, make_event("message_completed", message_id="msg_1"))
+
+        ids = [event["event_id"] for event in session.timeline]
+        self.assertEqual(ids[:-1], [event["event_id"] for event in timeline])
+        self.assertEqual(sorted(ids), ids)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_forked_processes_do_not_reuse_event_ids(self):
+        parent_id = new_event_id()
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            os.write(write_end, new_event_id().encode())
+            os._exit(0)
+        os.close(write_end)
+        with os.fdopen(read_end) as pipe:
+            child_id = pipe.read()
+        os.waitpid(pid, 0)
+
+        self.assertNotEqual(child_id[:-10], parent_id[:-10])
+        self.assertNotEqual(child_id, new_event_id())
+
+
+if __name__ == "__main__":
+    unittest.main()
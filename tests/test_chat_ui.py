@@ -0,0 +1,149 @@
+import unittest
+from unittest.mock import patch
+
+from streamlit_ai_elements.chat.types import append_event, create_session_state, make_event
+from streamlit_ai_elements.chat.ui import _LiveMessageView, chat_stream
+
+
+def produce_assistant_turn(session):
+    element = {"type": "js_raw", "args": {"html": "<b>hi</b>"}}
+    events = [
+        make_event("message_started", message_id="msg_1", role="assistant"),
+        make_event("tool_call_started", message_id="msg_1", tool_call_id="call_1", tool_name="js_raw"),
+        make_event("tool_call_delta", message_id="msg_1", tool_call_id="call_1", delta='{"html": '),
+        make_event("tool_call_delta", message_id="msg_1", tool_call_id="call_1", delta='"<b>hi</b>"}'),
+        make_event("renderer_completed", message_id="msg_1", tool_call_id="call_1", tool_name="js_raw", element=element),
+        make_event(
+            "tool_call_completed",
+            message_id="msg_1",
+            tool_call_id="call_1",
+            tool_name="js_raw",
+            output="Element rendered successfully in the chat.",
+        ),
+        make_event("text_delta", message_id="msg_1", delta="Here "),
+        make_event("text_delta", message_id="msg_1", delta="you go."),
+        make_event("message_completed", message_id="msg_1"),
+    ]
+    for event in events:
+        append_event(session, event)
+        yield event
+
+
+class ChatStreamTests(unittest.TestCase):
+    def test_chat_stream_keeps_tool_keys_stable_and_mounts_renderers_once(self):
+        session = create_session_state()
+        rendered = []
+
+        def record_tool_card(card, *, key, resources=None):
+            rendered.append((key, card.status, card.element is not None))
+
+        with patch("streamlit_ai_elements.chat.ui.chat_tool_card", side_effect=record_tool_card):
+            chat_stream(produce_assistant_turn(session), state=session, key_prefix="live")
+
+        self.assertEqual({key for key, _, _ in rendered}, {"live_msg_1_tool_call_1"})
+        self.assertEqual(sum(1 for _, _, has_element in rendered if has_element), 1)
+        self.assertTrue(rendered[-1][2])
+
+    def test_chat_stream_does_not_duplicate_events_recorded_by_producer(self):
+        session = create_session_state()
+
+        with patch("streamlit_ai_elements.chat.ui.chat_tool_card"):
+            chat_stream(produce_assistant_turn(session), state=session)
+
+        self.assertEqual(len(session.timeline), 9)
+        self.assertEqual(session.messages[0].content, "Here you go.")
+        self.assertEqual(session.messages[0].status, "completed")
+
+    def test_chat_stream_appends_events_from_detached_producers(self):
+        session = create_session_state()
+        detached = create_session_state()
+
+        with patch("streamlit_ai_elements.chat.ui.chat_tool_card"):
+            chat_stream(produce_assistant_turn(detached), state=session)
+
+        self.assertEqual(len(session.timeline), 9)
+        self.assertEqual(session.messages, detached.messages)
+
+    def test_chat_stream_coalesces_deltas_within_the_frame_budget(self):
+        session = create_session_state()
+        events = [make_event("message_started", message_id="msg_1", role="assistant")]
+        events.extend(make_event("text_delta", message_id="msg_1", delta="x") for _ in range(50))
+        events.append(make_event("message_completed", message_id="msg_1"))
+
+        with patch("time.monotonic", return_value=100.0), patch.object(
+            _LiveMessageView, "update", autospec=True
+        ) as mock_update:
+            chat_stream(iter(events), state=session, max_redraws_per_second=10)
+
+        # One redraw for message_started, one for message_completed.
+        self.assertEqual(mock_update.call_count, 2)
+        self.assertEqual(session.messages[0].content, "x" * 50)
+
+    def test_chat_stream_flushes_pending_deltas_when_the_stream_ends(self):
+        session = create_session_state()
+        events = [
+            make_event("message_started", message_id="msg_1", role="assistant"),
+            make_event("text_delta", message_id="msg_1", delta="a"),
+            make_event("text_delta", message_id="msg_1", delta="b"),
+        ]
+        flushed_content = []
+
+        def record_update(view, message):
+            flushed_content.append(str(message.content))
+
+        with patch("time.monotonic", return_value=5.0), patch.object(
+            _LiveMessageView, "update", autospec=True, side_effect=record_update
+        ):
+            chat_stream(iter(events), state=session, max_redraws_per_second=10)
+
+        self.assertEqual(flushed_content[-1], "ab")
+
+    def test_chat_stream_redraws_every_event_without_a_budget(self):
+        session = create_session_state()
+        events = [make_event("message_started", message_id="msg_1", role="assistant")]
+        events.extend(make_event("text_delta", message_id="msg_1", delta="x") for _ in range(5))
+
+        with patch.object(_LiveMessageView, "update", autospec=True) as mock_update:
+            chat_stream(iter(events), state=session, max_redraws_per_second=None)
+
+        self.assertEqual(mock_update.call_count, 6)
+
+
+class RendererPreviewTests(unittest.TestCase):
+    def test_chat_stream_previews_partial_excalidraw_shapes_under_fresh_keys(self):
+        session = create_session_state()
+        shape = '{"id": "%s", "type": "rectangle", "x": 0, "y": 0}'
+        deltas = [
+            '{"component": "excalidraw", "shapes": [',
+            shape % "a",
+            ", " + shape % "b",
+            ', {"id": "c", "x": 4',
+            "}]}",
+        ]
+        events = [
+            make_event("message_started", message_id="msg_1", role="assistant"),
+            make_event("tool_call_started", message_id="msg_1", tool_call_id="call_1", tool_name="prebuilt_component"),
+        ]
+        events.extend(
+            make_event("tool_call_delta", message_id="msg_1", tool_call_id="call_1", delta=delta) for delta in deltas
+        )
+        rendered = []
+
+        def record_render(element, key, resources=None):
+            rendered.append((key, [shape["id"] for shape in element["args"]["shapes"]]))
+
+        with patch("streamlit_ai_elements.chat.ui.render_element", side_effect=record_render):
+            chat_stream(iter(events), state=session, max_redraws_per_second=None)
+
+        self.assertEqual(
+            rendered,
+            [
+                ("chat_stream_msg_1_tool_call_1_preview_1_0", ["a"]),
+                ("chat_stream_msg_1_tool_call_1_preview_2_0", ["a", "b"]),
+                ("chat_stream_msg_1_tool_call_1_preview_3_0", ["a", "b", "c"]),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import unittest
+
+from streamlit_ai_elements.chat.partial_json import IncrementalJSONParser
+from streamlit_ai_elements.chat.tools import partial_element_from_tool_call
+
+
+def feed_in_pieces(text, size):
+    parser = IncrementalJSONParser()
+    snapshots = []
+    for start in range(0, len(text), size):
+        parser.feed(text[start : start + size])
+        snapshots.append(parser.value)
+    return parser, snapshots
+
+
+class IncrementalJSONParserTests(unittest.TestCase):
+    def test_every_prefix_yields_a_valid_snapshot_and_the_full_document_matches(self):
+        document = {
+            "component": "excalidraw",
+            "shapes": [
+                {"id": "a", "text": 'Say "hi" \\ café \U0001f600', "x": -1.5e2, "ok": True, "note": None},
+                {"id": "b", "x": 20, "y": [1, [2, {}]]},
+            ],
+            "connectors": [{"from": "a", "to": "b"}],
+        }
+        text = json.dumps(document)
+
+        for size in (1, 2, 3, 7):
+            parser, snapshots = feed_in_pieces(text, size)
+            self.assertTrue(all(isinstance(snapshot, dict) for snapshot in snapshots), size)
+            self.assertTrue(parser.complete)
+            self.assertEqual(parser.value, document)
+
+    def test_partial_string_values_are_closed_but_partial_keys_and_scalars_are_dropped(self):
+        parser = IncrementalJSONParser('{"html": "<div>he')
+        self.assertEqual(parser.value, {"html": "<div>he"})
+        self.assertEqual(parser.path, ("html",))
+
+        parser.feed('llo</div>", "cs')
+        self.assertEqual(parser.value, {"html": "<div>hello</div>"})
+        self.assertEqual(parser.path, ())
+
+        parser.feed('s": "a", "n": 12')
+        self.assertEqual(parser.value, {"html": "<div>hello</div>", "css": "a"})
+        parser.feed("3}")
+        self.assertEqual(parser.value["n"], 123)
+
+    def test_escapes_split_across_deltas_are_not_emitted_half_way(self):
+        parser = IncrementalJSONParser('{"s": "caf\\')
+        self.assertEqual(parser.value, {"s": "caf"})
+        parser.feed("u00")
+        self.assertEqual(parser.value, {"s": "caf"})
+        parser.feed('e9 \\ud83d')
+        self.assertEqual(parser.value, {"s": "café "})
+        parser.feed('\\ude00"}')
+        self.assertEqual(parser.value, {"s": "café \U0001f600"})
+
+    def test_path_points_at_the_open_array_item(self):
+        parser = IncrementalJSONParser('{"shapes": [{"id": "a"}, {"id": "b", "text": "x')
+        self.assertEqual(parser.path, ("shapes", 1, "text"))
+        parser.feed('"}')
+        self.assertEqual(parser.path, ("shapes",))
+
+    def test_malformed_input_keeps_the_last_valid_prefix(self):
+        parser = IncrementalJSONParser('{"a": [1, 2], "b": oops')
+        parser.feed(', "c": 3}')
+
+        self.assertTrue(parser.failed)
+        self.assertEqual(parser.value, {"a": [1, 2]})
+
+
+class PartialElementTests(unittest.TestCase):
+    def test_excalidraw_preview_only_includes_complete_shapes(self):
+        parser = IncrementalJSONParser(
+            '{"component": "excalidraw", "shapes": [{"id": "a", "type": "rectangle", "x": 0, "y": 0}, {"id": "b", "x": 1'
+        )
+
+        element = partial_element_from_tool_call("prebuilt_component", parser)
+
+        self.assertEqual(element["component"], "excalidraw")
+        self.assertEqual([shape["id"] for shape in element["args"]["shapes"]], ["a"])
+        self.assertEqual(element["args"]["connectors"], [])
+
+    def test_js_raw_preview_cuts_markup_at_the_last_closed_tag_and_skips_js(self):
+        parser = IncrementalJSONParser('{"css": "b { color: red; }", "js": "alert(1)", "html": "<b>bold</b><i')
+
+        element = partial_element_from_tool_call("js_raw", parser)
+
+        self.assertEqual(element, {"type": "js_raw", "args": {"html": "<b>bold</b>", "css": "b { color: red; }"}})
+
+    def test_no_preview_before_anything_is_drawable(self):
+        self.assertIsNone(partial_element_from_tool_call("prebuilt_component", IncrementalJSONParser('{"component": "exc')))
+        self.assertIsNone(partial_element_from_tool_call("js_raw", IncrementalJSONParser('{"html": "<b')))
+        self.assertIsNone(partial_element_from_tool_call("sandbox", IncrementalJSONParser('{"js": "x"}')))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import streamlit_ai_elements as ai
+from streamlit_ai_elements import row_paging
+from streamlit_ai_elements.row_paging import page_resource_rows
+
+
+def make_frame(rows=10_000):
+    return pd.DataFrame(
+        {
+            "day": pd.date_range("2024-01-01", periods=rows, freq="h"),
+            "region": np.array(["north", "south", "east", "west"])[np.arange(rows) % 4],
+            "amount": np.arange(rows, dtype=float),
+        }
+    )
+
+
+class PageResourceRowsTests(unittest.TestCase):
+    def setUp(self):
+        row_paging.clear_row_views()
+        self.registry = ai.resources(
+            sales=ai.resource.dataframe(make_frame(), max_rows=100),
+            hidden=ai.resource.dataframe(make_frame(rows=10), frontend_access="summary"),
+        )
+
+    def page(self, request, resource_names=("sales", "hidden")):
+        return page_resource_rows(self.registry, {"id": 1, "resource": "sales", **request}, resource_names=resource_names)
+
+    def test_pages_slice_rows_beyond_max_rows(self):
+        page = self.page({"offset": 5000, "limit": 3, "columns": ["amount"]})
+
+        self.assertEqual(page["id"], 1)
+        self.assertEqual(page["total_rows"], 10_000)
+        self.assertEqual(page["columns"], ["amount"])
+        self.assertEqual(page["rows"], [{"amount": 5000.0}, {"amount": 5001.0}, {"amount": 5002.0}])
+        self.assertEqual(len(self.page({"limit": 10**6})["rows"]), 5000)
+
+    def test_filters_and_sort_are_applied_before_slicing(self):
+        request = {
+            "filters": [
+                {"column": "region", "op": "in", "value": ["north", "east"]},
+                {"column": "day", "op": ">=", "value": "2024-01-10T00:00:00"},
+                {"column": "amount", "op": "<", "value": 400},
+            ],
+            "sort": [{"column": "amount", "descending": True}],
+            "limit": 2,
+        }
+
+        with patch.object(row_paging, "_filter_mask", side_effect=row_paging._filter_mask) as filter_mask:
+            first = self.page(request)
+            second = self.page(dict(request, offset=2))
+
+        self.assertEqual(first["total_rows"], 92)
+        self.assertEqual([row["amount"] for row in first["rows"] + second["rows"]], [398.0, 396.0, 394.0, 392.0])
+        self.assertEqual(filter_mask.call_count, 3)
+
+    def test_invalid_requests_are_reported_not_raised(self):
+        errors = [
+            self.page({"columns": ["missing"]}),
+            self.page({"filters": [{"column": "amount", "op": "~", "value": 1}]}),
+            self.page({}, resource_names=["hidden"]),
+            page_resource_rows(self.registry, {"id": 2, "resource": "hidden"}, resource_names=["hidden"]),
+            page_resource_rows(self.registry, {"id": 3, "resource": "nope"}),
+        ]
+
+        for error in errors:
+            self.assertIn("error", error)
+            self.assertNotIn("rows", error)
+        self.assertIn("not requested", errors[2]["error"])
+        self.assertIn("not available", errors[3]["error"])
+
+    def test_non_string_column_labels_are_addressed_by_their_string_form(self):
+        registry = ai.resources(grid=ai.resource.dataframe(pd.DataFrame({0: [3, 1, 2], 1: ["c", "a", "b"]})))
+
+        page = page_resource_rows(
+            registry,
+            {"resource": "grid", "filters": [{"column": "0", "op": ">", "value": 1}], "sort": "1", "columns": ["1"]},
+        )
+
+        self.assertEqual(page["columns"], ["1"])
+        self.assertEqual(page["rows"], [{"1": "b"}, {"1": "c"}])
+
+    def test_sorting_a_column_of_incomparable_values_is_reported(self):
+        registry = ai.resources(mixed=ai.resource.dataframe(pd.DataFrame({"value": [1, "a", 2.5]})))
+
+        page = page_resource_rows(registry, {"id": 4, "resource": "mixed", "sort": "value"})
+
+        self.assertNotIn("rows", page)
+        self.assertIn("Cannot sort", page["error"])
+
+
+
+class RendererPagingTests(unittest.TestCase):
+    def setUp(self):
+        for name in list(st.session_state):
+            del st.session_state[name]
+
+    def test_sandbox_answers_a_stashed_row_request_on_the_rerun(self):
+        registry = ai.resources(sales=ai.resource.dataframe(make_frame(), max_rows=50))
+        renderer = MagicMock()
+
+        with patch("streamlit_ai_elements._ensure", return_value=renderer):
+            ai.sandbox(js="requestRows('sales')", resource_names=["sales"], resources=registry)
+            first = renderer.call_args.kwargs
+            st.session_state[first["key"]] = {"row_request": {"id": 7, "resource": "sales", "offset": 50, "limit": 2}}
+            first["on_row_request_change"]()
+            ai.sandbox(js="requestRows('sales')", resource_names=["sales"], resources=registry)
+            second = renderer.call_args.kwargs
+
+        self.assertNotIn("row_page", first["data"])
+        self.assertEqual(second["key"], first["key"])
+        self.assertEqual(second["data"]["row_page"]["id"], 7)
+        self.assertEqual([row["amount"] for row in second["data"]["row_page"]["rows"]], [50.0, 51.0])
+        self.assertEqual(len(second["data"]["rows"]), 50)
+
+    def test_unkeyed_calls_that_differ_in_any_argument_get_distinct_keys(self):
+        registry = ai.resources(sales=ai.resource.dataframe(make_frame(), max_rows=50))
+        renderer = MagicMock()
+
+        with patch("streamlit_ai_elements._ensure", return_value=renderer):
+            for context in ({"title": "North"}, {"title": "South"}, {"title": "North"}):
+                ai.sandbox(js="requestRows('sales')", context=context, resource_names=["sales"], resources=registry)
+            for css in ("", "b { color: red }"):
+                ai.js_raw(html="<b></b>", css=css, js="requestRows('sales')", resource_names=["sales"], resources=registry)
+
+        keys = [call.kwargs["key"] for call in renderer.call_args_list]
+        self.assertEqual(len(set(keys)), 4)
+        self.assertEqual(keys[0], keys[2])
+
+    def test_components_without_pageable_resources_are_unchanged(self):
+        renderer = MagicMock()
+
+        with patch("streamlit_ai_elements._ensure", return_value=renderer):
+            ai.js_raw(html="<b>hi</b>")
+
+        self.assertIsNone(renderer.call_args.kwargs["key"])
+        self.assertNotIn("on_row_request_change", renderer.call_args.kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
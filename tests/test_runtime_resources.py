@@ -0,0 +1,504 @@
+import base64
+import copy
+import datetime
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import streamlit_ai_elements as ai
+from streamlit_ai_elements import dataframe_profile, runtime_resources
+from streamlit_ai_elements.runtime_resources import (
+    clear_payload_cache,
+    payload_cache_info,
+    resolve_frontend_resources,
+    set_payload_cache_limit,
+)
+
+
+def make_frame(rows=1000, offset=0):
+    return pd.DataFrame(
+        {
+            "day": pd.date_range("2024-01-01", periods=rows, freq="D"),
+            "region": [f"r{index % 7}" for index in range(rows)],
+            "amount": [float(index + offset) for index in range(rows)],
+        }
+    )
+
+
+class DataframePayloadCacheTests(unittest.TestCase):
+    def setUp(self):
+        clear_payload_cache()
+
+    def tearDown(self):
+        set_payload_cache_limit(64 * 1024 * 1024)
+        clear_payload_cache()
+
+    def test_replayed_history_materializes_each_dataset_once(self):
+        registry = ai.resources(sales=ai.resource.dataframe(make_frame()))
+
+        with patch(
+            "streamlit_ai_elements.runtime_resources.dataframe_records",
+            side_effect=runtime_resources.dataframe_records,
+        ) as materialize:
+            payloads = [resolve_frontend_resources(registry, ["sales"])["sales"] for _ in range(20)]
+
+        self.assertEqual(materialize.call_count, 1)
+        info = payload_cache_info()
+        self.assertEqual((info.hits, info.misses, info.entries), (19, 1, 1))
+        self.assertEqual(len(payloads[-1]["rows"]), 1000)
+        self.assertEqual(payloads[-1]["rows"][0]["day"], "2024-01-01T00:00:00.000")
+        self.assertIsNot(payloads[0], payloads[1])
+
+    def test_equal_frames_share_an_entry_and_changed_frames_do_not(self):
+        first = ai.resources(sales=ai.resource.dataframe(make_frame()))
+        copy = ai.resources(other=ai.resource.dataframe(make_frame()))
+        changed = ai.resources(sales=ai.resource.dataframe(make_frame(offset=1)))
+
+        resolve_frontend_resources(first, ["sales"])
+        copied = resolve_frontend_resources(copy, ["other"])["other"]
+        resolved = resolve_frontend_resources(changed, ["sales"])["sales"]
+
+        self.assertEqual(copied["name"], "other")
+        self.assertEqual(resolved["rows"][0]["amount"], 1.0)
+        self.assertEqual(payload_cache_info().hits, 1)
+        self.assertEqual(payload_cache_info().entries, 2)
+
+    def test_row_limits_are_part_of_the_key(self):
+        frame = make_frame()
+        registry = ai.resources(
+            full=ai.resource.dataframe(frame, max_rows=100),
+            summary=ai.resource.dataframe(frame, frontend_access="summary"),
+        )
+
+        payloads = resolve_frontend_resources(registry, ["full", "summary"])
+
+        self.assertEqual(len(payloads["full"]["rows"]), 100)
+        self.assertNotIn("rows", payloads["summary"])
+        self.assertEqual(len(payloads["summary"]["sample_rows"]), 5)
+        self.assertEqual(payload_cache_info().entries, 2)
+
+    def test_least_recently_used_entries_are_evicted_by_size(self):
+        frames = [ai.resources(data=ai.resource.dataframe(make_frame(offset=index))) for index in range(3)]
+        resolve_frontend_resources(frames[0], ["data"])
+        entry_bytes = payload_cache_info().current_bytes
+        set_payload_cache_limit(int(entry_bytes * 2.5))
+
+        resolve_frontend_resources(frames[1], ["data"])
+        resolve_frontend_resources(frames[0], ["data"])
+        resolve_frontend_resources(frames[2], ["data"])
+
+        info = payload_cache_info()
+        self.assertEqual(info.evictions, 1)
+        self.assertEqual(info.entries, 2)
+        resolve_frontend_resources(frames[0], ["data"])
+        self.assertEqual(payload_cache_info().hits, 2)
+
+    def test_unhashable_frames_are_materialized_without_caching(self):
+        frame = pd.DataFrame({"tags": [["a"], ["b", "c"]]})
+        registry = ai.resources(tags=ai.resource.dataframe(frame))
+
+        payload = resolve_frontend_resources(registry, ["tags"])["tags"]
+
+        self.assertEqual(payload["rows"], [{"tags": ["a"]}, {"tags": ["b", "c"]}])
+        self.assertEqual(payload_cache_info().entries, 0)
+
+
+class PromptBlockCacheTests(unittest.TestCase):
+    def setUp(self):
+        clear_payload_cache()
+
+    def tearDown(self):
+        clear_payload_cache()
+
+    def test_prompt_is_built_once_and_stays_byte_identical(self):
+        frame = make_frame()
+        registry = ai.resources(sales=ai.resource.dataframe(frame))
+
+        with patch(
+            "streamlit_ai_elements.dataframe_profile._build_profile",
+            side_effect=dataframe_profile._build_profile,
+        ) as build_profile:
+            prompts = [runtime_resources.format_resources_for_prompt(registry) for _ in range(5)]
+            self.assertEqual(build_profile.call_count, 1)
+
+            frame = frame.copy()
+            frame.loc[0, "amount"] = -1.0
+            changed = runtime_resources.format_resources_for_prompt(ai.resources(sales=ai.resource.dataframe(frame)))
+            schema_only = runtime_resources.format_resources_for_prompt(
+                ai.resources(sales=ai.resource.dataframe(frame, ai_access="schema"))
+            )
+
+        self.assertEqual(len(set(prompts)), 1)
+        self.assertEqual(build_profile.call_count, 2)
+        self.assertIn("amount: float64 (min -1;", changed)
+        self.assertNotIn("Sample rows", schema_only)
+        self.assertIn("  - amount: float64\n", schema_only)
+
+    def test_an_edit_to_any_row_of_a_large_frame_rebuilds_the_summary(self):
+        frame = pd.DataFrame({"amount": np.arange(10_000, dtype=float)})
+        registry = ai.resources(sales=ai.resource.dataframe(frame))
+        runtime_resources.format_resources_for_prompt(registry)
+
+        frame = frame.copy()
+        frame.loc[1, "amount"] = -1.0
+        changed = runtime_resources.format_resources_for_prompt(ai.resources(sales=ai.resource.dataframe(frame)))
+
+        self.assertIn("amount: float64 (min -1;", changed)
+
+    def test_a_frame_reused_across_turns_is_hashed_once(self):
+        frame = pd.DataFrame({"amount": np.arange(10_000, dtype=float)})
+        registry = ai.resources(sales=ai.resource.dataframe(frame))
+
+        with patch("pandas.util.hash_pandas_object", wraps=pd.util.hash_pandas_object) as hash_rows:
+            prompts = {runtime_resources.format_resources_for_prompt(registry) for _ in range(5)}
+            full_hashes = [call for call in hash_rows.call_args_list if len(call.args[0]) == len(frame)]
+            self.assertEqual(len(full_hashes), 1)
+
+            frame["extra"] = 1
+            widened = runtime_resources.format_resources_for_prompt(registry)
+
+        self.assertEqual(len(prompts), 1)
+        self.assertIn("  - extra: int64", widened)
+        del frame, registry
+        self.assertEqual(runtime_resources._FRAME_FINGERPRINTS, {})
+
+
+class DataframeProfileTests(unittest.TestCase):
+    def setUp(self):
+        clear_payload_cache()
+
+    def tearDown(self):
+        clear_payload_cache()
+
+    def skewed_frame(self):
+        rng = np.random.default_rng(7)
+        frame = pd.DataFrame(
+            {
+                "segment": np.where(rng.random(5000) < 0.9, "retail", np.where(rng.random(5000) < 0.5, "b2b", "gov")),
+                "revenue": rng.lognormal(size=5000),
+                "units": rng.integers(0, 100, size=5000),
+                "returned": rng.random(5000) < 0.1,
+            }
+        )
+        frame.loc[:9, "units"] = None
+        return frame.sort_values("revenue").reset_index(drop=True)
+
+    def test_summary_describes_every_row_and_samples_each_stratum(self):
+        frame = self.skewed_frame()
+
+        prompt = runtime_resources.format_resources_for_prompt(ai.resources(orders=ai.resource.dataframe(frame)))
+
+        revenue = frame["revenue"]
+        self.assertIn(f"min {revenue.min():.4g}; max {revenue.max():.4g}; p5 {revenue.quantile(0.05):.4g}", prompt)
+        self.assertIn("units: float64 (10 nulls; min 0; max 99", prompt)
+        self.assertIn(f'top "retail" ({(frame["segment"] == "retail").sum()})', prompt)
+        self.assertIn("Sample rows (stratified by segment):", prompt)
+        sampled = [json.loads(line.strip()[2:]) for line in prompt.splitlines() if line.startswith("  - {")]
+        self.assertEqual(len(sampled), 5)
+        self.assertEqual({row["segment"] for row in sampled}, {"retail", "b2b", "gov"})
+
+    def test_frames_with_integer_column_labels_are_stratified_by_position(self):
+        frame = pd.DataFrame({0: range(100), 1: ["a", "b"] * 50})
+
+        prompt = runtime_resources.format_resources_for_prompt(ai.resources(grid=ai.resource.dataframe(frame)))
+
+        self.assertIn("Sample rows (stratified by 1):", prompt)
+        self.assertIn("  - 0: int64 (min 0; max 99", prompt)
+
+    def test_token_budget_keeps_column_names_and_trims_details(self):
+        frame = self.skewed_frame()
+
+        tight = runtime_resources.format_resources_for_prompt(
+            ai.resources(orders=ai.resource.dataframe(frame, summary_tokens=60))
+        )
+        plain = runtime_resources.format_resources_for_prompt(
+            ai.resources(orders=ai.resource.dataframe(frame, summary_tokens=0))
+        )
+
+        block = tight.split("\n\n")[0]
+        self.assertLessEqual(len(block) // 4, 60)
+        for column in frame.columns:
+            self.assertIn(f"  - {column}: ", block)
+        self.assertTrue(block.endswith("  - returned: bool"))
+        self.assertNotIn("Sample rows", block)
+        self.assertIn(f'"revenue": {frame["revenue"].iloc[0]}', plain)
+        self.assertNotIn("distinct", plain)
+
+
+class LazyDataFrameTests(unittest.TestCase):
+    def setUp(self):
+        clear_payload_cache()
+
+    def tearDown(self):
+        clear_payload_cache()
+
+    def build_registry(self, calls, **kwargs):
+        def load():
+            calls.append(1)
+            return make_frame(rows=10)
+
+        return ai.resources(
+            sales=ai.resource.lazy_dataframe(load, **kwargs),
+            broken=ai.resource.lazy_dataframe(lambda: 1 / 0, frontend_access="full"),
+        )
+
+    def test_frames_load_on_first_use_and_are_shared_across_reruns(self):
+        calls = []
+
+        registries = [self.build_registry(calls) for _ in range(3)]
+        self.assertEqual(calls, [])
+        payloads = [resolve_frontend_resources(registry, ["sales"])["sales"] for registry in registries]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(payloads[-1]["row_count"], 10)
+        self.assertEqual(payloads[-1]["rows"][0]["region"], "r0")
+
+    def test_ttl_expires_loaded_frames(self):
+        calls = []
+
+        with patch("streamlit_ai_elements.runtime_resources.time.monotonic", side_effect=[0.0, 5.0, 20.0]):
+            for _ in range(3):
+                resolve_frontend_resources(self.build_registry(calls, ttl=10), ["sales"])
+
+        self.assertEqual(len(calls), 2)
+
+    def test_script_loaders_reload_when_a_global_they_read_changes(self):
+        script = """
+def read_table(name):
+    CALLS.append(name)
+    return FRAMES[name]
+
+def load():
+    return read_table(TABLE)
+"""
+        frames = {"orders": make_frame(rows=2), "customers": make_frame(rows=5)}
+        calls = []
+
+        def rerun(table):
+            namespace = {"TABLE": table, "FRAMES": frames, "CALLS": calls}
+            exec(script, namespace)  # a fresh module namespace, as on every Streamlit rerun
+            return ai.resource.lazy_dataframe(namespace["load"]).payload.load()
+
+        self.assertEqual(len(rerun("orders")), 2)
+        self.assertEqual(len(rerun("customers")), 5)
+        self.assertEqual(len(rerun("customers")), 5)
+        self.assertEqual(calls, ["orders", "customers"])
+
+    def test_files_and_chunked_loaders(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sales.csv")
+            make_frame(rows=4).to_csv(path, index=False)
+            lazy = ai.resource.lazy_dataframe(path)
+            self.assertEqual(len(lazy.payload.load()), 4)
+
+            make_frame(rows=6).to_csv(path, index=False)
+            os.utime(path, ns=(0, 10**18))
+            self.assertEqual(len(lazy.payload.load()), 6)
+
+        chunks = ai.resource.lazy_dataframe(lambda: (make_frame(rows=3, offset=index) for index in range(2)))
+        self.assertEqual(chunks.payload.load()["amount"].tolist(), [0.0, 1.0, 2.0, 1.0, 2.0, 3.0])
+        with self.assertRaises(ValueError):
+            ai.resource.lazy_dataframe("sales.xlsx")
+
+
+class SharedRuntimePayloadTests(unittest.TestCase):
+    def setUp(self):
+        clear_payload_cache()
+
+    def tearDown(self):
+        clear_payload_cache()
+
+    def test_runtime_shares_one_read_only_payload(self):
+        registry = ai.resources(sales=ai.resource.dataframe(make_frame(rows=10)))
+        runtime = runtime_resources.build_javascript_runtime(resolve_frontend_resources(registry, ["sales"]))
+
+        resource = runtime["resources"]["sales"]
+        self.assertIs(runtime["resource"], resource)
+        self.assertIs(runtime["data"], resource)
+        self.assertIs(runtime["rows"], resource["rows"])
+        self.assertEqual(json.loads(json.dumps(runtime))["rows"], resource["rows"])
+
+    def test_renderers_cannot_mutate_the_cached_rows(self):
+        registry = ai.resources(sales=ai.resource.dataframe(make_frame(rows=10)))
+        runtime = runtime_resources.build_javascript_runtime(resolve_frontend_resources(registry, ["sales"]))
+
+        mutations = [
+            lambda: runtime["rows"].append({}),
+            lambda: runtime["rows"].sort(key=lambda row: row["amount"]),
+            lambda: runtime["rows"][0].update(amount=-1.0),
+            lambda: runtime["rows"][0].__setitem__("amount", -1.0),
+            lambda: runtime["resource"]["rows"].pop(),
+            lambda: runtime["data"].__setitem__("rows", []),
+            lambda: runtime["resources"]["sales"]["columns"][0].clear(),
+        ]
+        for mutate in mutations:
+            with self.assertRaises(TypeError):
+                mutate()
+
+        again = resolve_frontend_resources(registry, ["sales"])["sales"]
+        self.assertEqual(payload_cache_info().hits, 1)
+        self.assertEqual(len(again["rows"]), 10)
+        self.assertEqual(again["rows"][0]["amount"], 0.0)
+
+    def test_nested_cell_values_are_read_only_too(self):
+        registry = ai.resources(tags=ai.resource.dataframe(pd.DataFrame({"tags": [["a"], {"k": [1]}]})))
+        rows = resolve_frontend_resources(registry, ["tags"])["tags"]["rows"]
+
+        with self.assertRaises(TypeError):
+            rows[0]["tags"].append("b")
+        with self.assertRaises(TypeError):
+            rows[1]["tags"]["k"].append(2)
+
+    def test_copies_are_ordinary_mutable_values(self):
+        registry = ai.resources(sales=ai.resource.dataframe(make_frame(rows=3)))
+        rows = resolve_frontend_resources(registry, ["sales"])["sales"]["rows"]
+
+        copied = copy.deepcopy(rows)
+        copied[0]["amount"] = 5.0
+        shallow = copy.copy(rows)
+        shallow.append({})
+
+        self.assertIs(type(pickle.loads(pickle.dumps(rows))[0]), dict)
+        self.assertEqual(rows[0]["amount"], 0.0)
+        self.assertEqual(len(rows), 3)
+
+
+class DataframeRecordsTests(unittest.TestCase):
+    def test_column_records_match_the_json_round_trip(self):
+        frame = pd.DataFrame(
+            {
+                "naive": pd.to_datetime(["2024-01-01 01:02:03.123456", None]),
+                "aware": pd.to_datetime(["2024-01-01", "2024-01-02"]).tz_localize("Europe/Berlin"),
+                "float": [0.5, np.nan],
+                "infinite": [np.inf, -np.inf],
+                "int": [1, 2],
+                "flag": [True, False],
+                "nullable": pd.array([1, None], dtype="Int64"),
+                "text": pd.array(["a", None], dtype="string"),
+                "category": pd.Categorical(["x", "y"]),
+                "nested": [{"k": np.int64(1)}, [1, np.nan]],
+                "duration": pd.to_timedelta(["1 day 00:00:01", None]),
+                "python_dates": [datetime.date(2024, 1, 2), datetime.datetime(2024, 1, 2, 3, 4)],
+                7: [1, 2],
+            }
+        )
+
+        records = runtime_resources.dataframe_records(frame)
+
+        self.assertEqual(records, json.loads(frame.to_json(orient="records", date_format="iso")))
+        self.assertIs(type(records[0]["int"]), int)
+        self.assertEqual(records[0]["aware"], "2023-12-31T23:00:00.000Z")
+
+    def test_preview_is_a_slice_of_the_materialized_rows(self):
+        clear_payload_cache()
+        registry = ai.resources(sales=ai.resource.dataframe(make_frame(rows=20), max_rows=10, sample_rows=3))
+
+        payload = resolve_frontend_resources(registry, ["sales"])["sales"]
+
+        self.assertEqual(len(payload["rows"]), 10)
+        self.assertIs(payload["sample_rows"][0], payload["rows"][0])
+        clear_payload_cache()
+
+
+class ColumnarFormatTests(unittest.TestCase):
+    def setUp(self):
+        clear_payload_cache()
+
+    def tearDown(self):
+        clear_payload_cache()
+
+    def decode(self, column):
+        if isinstance(column, list):
+            return column
+        return np.frombuffer(base64.b64decode(column["base64"]), dtype=np.dtype(column["dtype"]).newbyteorder("<")).tolist()
+
+    def test_columns_format_round_trips_to_the_row_format(self):
+        frame = make_frame(rows=50)
+        frame["big"] = [2**40 + index for index in range(50)]
+        frame["small"] = np.arange(50, dtype="int64")
+        frame.loc[3, "amount"] = np.nan
+        columnar = ai.resources(data=ai.resource.dataframe(frame, frontend_format="columns"))
+        row_based = ai.resources(data=ai.resource.dataframe(frame))
+
+        payload = resolve_frontend_resources(columnar, ["data"])["data"]
+        rows = resolve_frontend_resources(row_based, ["data"])["data"]["rows"]
+
+        self.assertEqual(payload["format"], "columns")
+        self.assertNotIn("rows", payload)
+        column_data = payload["column_data"]
+        self.assertEqual(column_data["amount"]["dtype"], "float64")
+        self.assertEqual(column_data["small"]["dtype"], "int32")
+        self.assertEqual(column_data["big"]["dtype"], "float64")
+        self.assertEqual(column_data["region"][:2], ["r0", "r1"])
+        decoded = {name: self.decode(column) for name, column in column_data.items()}
+        rebuilt = [
+            {name: (None if isinstance(values[index], float) and np.isnan(values[index]) else values[index]) for name, values in decoded.items()}
+            for index in range(50)
+        ]
+        self.assertEqual(rebuilt, rows)
+        self.assertEqual(payload["rows_preview"], rows[:5])
+
+    def test_summary_access_and_vega_lite_override(self):
+        frame = make_frame(rows=20)
+        registry = ai.resources(
+            summary=ai.resource.dataframe(frame, frontend_access="summary", frontend_format="columns"),
+            chart=ai.resource.dataframe(frame, frontend_format="columns"),
+        )
+
+        summary = resolve_frontend_resources(registry, ["summary"])["summary"]
+        chart = resolve_frontend_resources(registry, ["chart"], frontend_format="rows")["chart"]
+
+        self.assertNotIn("column_data", summary)
+        self.assertEqual(len(summary["sample_rows"]), 5)
+        self.assertEqual(len(chart["rows"]), 20)
+
+    def test_arrow_format_hoists_a_typed_table_out_of_the_payload(self):
+        import pyarrow as pa
+
+        frame = make_frame(rows=50)
+        frame["small"] = np.arange(50, dtype="int64")
+        frame.loc[3, "amount"] = np.nan
+        arrow = ai.resources(data=ai.resource.dataframe(frame, frontend_format="arrow"))
+        row_based = ai.resources(data=ai.resource.dataframe(frame))
+
+        runtime = runtime_resources.build_javascript_runtime(resolve_frontend_resources(arrow, ["data"]))
+        rows = resolve_frontend_resources(row_based, ["data"])["data"]["rows"]
+
+        payload = runtime["resources"]["data"]
+        self.assertEqual(payload["format"], "arrow")
+        self.assertNotIn("arrow_table", payload)
+        self.assertEqual(runtime["resource"]["arrow_key"], "__arrow__data")
+        self.assertTrue(payload["arrow_version"])
+        table = runtime[payload["arrow_key"]]
+        self.assertIsInstance(table, pa.Table)
+        self.assertEqual(table.schema.field("small").type, pa.int32())
+        self.assertEqual(table.schema.field("day").type, pa.string())
+        self.assertEqual(table.to_pylist(), rows)
+        self.assertEqual(payload["rows_preview"], rows[:5])
+
+    def test_arrow_format_defaults_to_more_rows_and_summaries_drop_the_table(self):
+        frame = make_frame(rows=20)
+        registry = ai.resources(
+            full=ai.resource.dataframe(frame, frontend_format="arrow"),
+            summary=ai.resource.dataframe(frame, frontend_access="summary", frontend_format="arrow"),
+        )
+
+        self.assertEqual(registry["full"].max_rows, 100_000)
+        self.assertEqual(ai.resource.dataframe(frame).max_rows, 1000)
+        summary = resolve_frontend_resources(registry, ["summary"])["summary"]
+        self.assertNotIn("arrow_table", summary)
+        self.assertEqual(len(summary["sample_rows"]), 5)
+
+    def test_unknown_formats_are_rejected(self):
+        with self.assertRaises(ValueError):
+            ai.resource.dataframe(make_frame(rows=1), frontend_format="parquet")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,252 @@
+import gc
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import streamlit_ai_elements as ai
+from streamlit_ai_elements.chat.tools import build_chat_completions_tools, build_responses_tools, execute_tool_call
+from streamlit_ai_elements.runtime_resources import resolve_frontend_resources
+from streamlit_ai_elements import sql_resources
+from streamlit_ai_elements.sql_resources import SQLQueryError, _ConnectionPool, _Statement, run_sql_query
+from streamlit_ai_elements.vega_lite_data import prepare_vega_lite_data
+
+
+class SQLResourceTestCase(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        with sqlite3.connect(self.path) as connection:
+            connection.execute("CREATE TABLE sales (id INTEGER, region TEXT, amount REAL)")
+            connection.execute("CREATE TABLE secrets (token TEXT)")
+            connection.executemany(
+                "INSERT INTO sales VALUES (?, ?, ?)",
+                [(index, ["north", "south"][index % 2], float(index)) for index in range(50)],
+            )
+        connection.close()
+
+    def database(self, **kwargs):
+        kwargs.setdefault("allowed_tables", ["sales"])
+        return ai.resource.sql_database(self.path, **kwargs)
+
+    def query(self, sql, **kwargs):
+        return run_sql_query(self.database(**kwargs), sql, resource_name="warehouse")
+
+
+class SQLQueryTests(SQLResourceTestCase):
+    def test_select_returns_a_frame_registered_as_a_dataframe_resource(self):
+        registry = ai.resources(warehouse=self.database())
+
+        result = run_sql_query(registry["warehouse"], "SELECT region, SUM(amount) AS total FROM sales GROUP BY region")
+
+        self.assertEqual(result.frame.to_dict("records"), [{"region": "north", "total": 600.0}, {"region": "south", "total": 625.0}])
+        self.assertFalse(result.truncated)
+        resolved = resolve_frontend_resources(registry, [result.result_resource])
+        self.assertEqual(resolved[result.result_resource]["row_count"], 2)
+        spec = {"mark": "bar", "encoding": {"x": {"field": "region"}, "y": {"field": "total", "aggregate": "sum"}}}
+        prepared = prepare_vega_lite_data(spec, registry, data_resource=result.result_resource)
+        self.assertEqual(len(prepared["data"]["values"]), 2)
+        with self.assertRaises(ValueError):
+            resolve_frontend_resources(ai.resources(other=ai.resource.dataframe(result.frame)), [result.result_resource])
+
+    def test_results_stay_resolvable_when_a_rerun_passes_a_new_path_string(self):
+        def rerun_registry():
+            path = "".join(list(self.path))  # a new, equal str, as on every Streamlit rerun
+            return ai.resources(warehouse=ai.resource.sql_database(path, allowed_tables=["sales"]))
+
+        first = rerun_registry()
+        result = run_sql_query(first["warehouse"], "SELECT id FROM sales WHERE id < 4")
+        second = rerun_registry()
+
+        self.assertIsNot(second["warehouse"].payload, first["warehouse"].payload)
+        self.assertEqual(resolve_frontend_resources(second, [result.result_resource])[result.result_resource]["row_count"], 4)
+
+    def test_allowed_tables_cover_joins_and_subqueries(self):
+        self.assertEqual(len(self.query("WITH recent AS (SELECT * FROM sales WHERE id > 40) SELECT * FROM recent").frame), 9)
+        self.assertEqual(len(self.query("SELECT s.id FROM main.sales AS s WHERE s.id < 3").frame), 3)
+        for sql in (
+            "SELECT * FROM secrets",
+            "SELECT * FROM sales JOIN secrets ON 1 = 1",
+            "SELECT * FROM sales, secrets",
+            "SELECT * FROM sales WHERE region IN (SELECT token FROM secrets)",
+        ):
+            with self.subTest(sql=sql), self.assertRaisesRegex(SQLQueryError, "secrets"):
+                self.query(sql)
+
+    def test_subqueries_in_any_position_and_shadowing_ctes_are_checked(self):
+        bypasses = (
+            "SELECT CASE WHEN 1 THEN (SELECT token FROM secrets) END FROM sales",
+            "SELECT * FROM sales JOIN (secrets) ON 1",
+            "SELECT id FROM sales ORDER BY (SELECT token FROM secrets)",
+            "WITH secrets AS (SELECT * FROM secrets) SELECT * FROM secrets",
+            "WITH RECURSIVE secrets AS (SELECT * FROM secrets) SELECT * FROM secrets",
+            "SELECT ARRAY(SELECT token FROM secrets) FROM sales",
+            "SELECT * FROM sales, (WITH sales AS (SELECT 1) SELECT * FROM sales) AS inner_sales, sales AS s2 JOIN secrets",
+        )
+        for sql in bypasses:
+            with self.subTest(sql=sql), self.assertRaises(SQLQueryError):
+                self.query(sql)
+
+    def test_backslash_escapes_cannot_hide_tables_from_other_engines(self):
+        sql = "SELECT 'a\\'' , (SELECT * FROM secrets) -- '"
+
+        def connect():
+            return sqlite3.connect(self.path, check_same_thread=False)
+
+        with self.assertRaisesRegex(SQLQueryError, "Backslashes"):
+            run_sql_query(ai.resource.sql_database(connect, allowed_tables=["sales"]), sql)
+        with self.assertRaisesRegex(SQLQueryError, "Backslashes"):
+            run_sql_query(ai.resource.sql_database(connect, allowed_tables=["sales"]), 'SELECT "a\\"" , (SELECT 1) -- "')
+        self.assertEqual(self.query(sql).frame.shape, (1, 1))
+
+    def test_sqlite_authorizer_denies_tables_the_statement_check_missed(self):
+        bypasses = (
+            "SELECT CASE WHEN 1 THEN (SELECT token FROM secrets) END FROM sales",
+            "SELECT * FROM sales JOIN (secrets) ON 1",
+            "WITH sales AS (SELECT token FROM secrets) SELECT * FROM sales",
+        )
+        for sql in bypasses:
+            with self.subTest(sql=sql), patch(
+                "streamlit_ai_elements.sql_resources._parse_statement",
+                return_value=_Statement(sql, sql, False, ("sales",)),
+            ), self.assertRaisesRegex(SQLQueryError, "not authorized|prohibited"):
+                self.query(sql)
+
+    def test_writes_and_multiple_statements_are_rejected_unless_allowed(self):
+        for sql in ("DELETE FROM sales", "SELECT * FROM sales; DROP TABLE sales", "PRAGMA table_info(sales)"):
+            with self.subTest(sql=sql), self.assertRaises(SQLQueryError):
+                self.query(sql)
+        with self.assertRaises(SQLQueryError):
+            self.query("SELECT 'unterminated FROM sales")
+
+        before = self.query("SELECT COUNT(*) AS n FROM sales", allow_write=True)
+        deleted = self.query("DELETE FROM sales WHERE id >= 10", allow_write=True)
+        after = self.query("SELECT COUNT(*) AS n FROM sales", allow_write=True)
+
+        self.assertEqual(deleted.affected_rows, 40)
+        self.assertIsNone(deleted.result_resource)
+        self.assertEqual([before.frame["n"][0], after.frame["n"][0]], [50, 10])
+        self.assertFalse(after.from_cache)
+
+    def test_results_are_capped_and_cached_by_normalized_sql(self):
+        first = self.query("SELECT * FROM sales", max_rows=20)
+        second = self.query("select *\n  from sales -- again\n;", max_rows=20)
+
+        self.assertEqual(len(first.frame), 20)
+        self.assertTrue(first.truncated)
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(first.result_resource, second.result_resource)
+
+    def test_engine_results_are_cached_only_within_cache_ttl(self):
+        def connect():
+            return sqlite3.connect(self.path, check_same_thread=False)
+
+        def query(**kwargs):
+            return run_sql_query(ai.resource.sql_database(connect, allowed_tables=["sales"], **kwargs), "SELECT * FROM sales")
+
+        self.assertEqual([query().from_cache for _ in range(2)], [False, False])
+        self.assertEqual([query(cache_ttl=0.2).from_cache for _ in range(2)], [False, True])
+        time.sleep(0.25)
+        self.assertFalse(query(cache_ttl=0.2).from_cache)
+        self.assertEqual([self.query("SELECT * FROM sales", cache_ttl=0).from_cache for _ in range(2)], [False, False])
+
+    def test_long_queries_are_interrupted(self):
+        sql = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n"
+        started = time.perf_counter()
+
+        with self.assertRaisesRegex(SQLQueryError, "timeout"):
+            self.query(sql, allowed_tables=None, query_timeout=0.2)
+
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertEqual(self.query("SELECT COUNT(*) AS n FROM sales", query_timeout=0.2).frame["n"][0], 50)
+
+    def test_engines_rebuilt_on_every_rerun_do_not_accumulate_pools(self):
+        connections = []
+
+        def rerun():
+            def connect():
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connections.append(connection)
+                return connection
+
+            result = run_sql_query(ai.resource.sql_database(connect, allowed_tables=["sales"]), "SELECT COUNT(*) AS n FROM sales")
+            self.assertEqual(result.frame["n"][0], 50)
+
+        for _ in range(20):
+            rerun()
+        gc.collect()
+
+        self.assertLessEqual(len(sql_resources._ENGINE_DATABASES), 1)
+        open_connections = 0
+        for connection in connections:
+            try:
+                connection.execute("SELECT 1")
+            except sqlite3.ProgrammingError:
+                continue
+            open_connections += 1
+        self.assertLessEqual(open_connections, 1)
+
+    def test_pool_never_opens_more_connections_than_its_size(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+        pool = _ConnectionPool(object, 2)
+
+        def work():
+            with pool.connection(wait=5):
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.pop()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(pool.created, 2)
+
+
+class SQLQueryToolTests(SQLResourceTestCase):
+    def test_sql_query_tool_is_offered_only_with_sql_resources(self):
+        names = lambda tools: [tool["function"]["name"] for tool in tools]
+
+        self.assertNotIn("sql_query", names(build_chat_completions_tools()))
+        frame_only = ai.resources(frame=ai.resource.dataframe(self.query("SELECT 1").frame))
+        self.assertNotIn("sql_query", [tool["name"] for tool in build_responses_tools(frame_only)])
+        self.assertIn("sql_query", names(build_chat_completions_tools(ai.resources(warehouse=self.database()))))
+        self.assertIn("sql_query", [tool["name"] for tool in build_responses_tools(ai.resources(warehouse=self.database()))])
+        hidden = ai.resources(warehouse=self.database(ai_access="none"))
+        self.assertNotIn("sql_query", names(build_chat_completions_tools(hidden)))
+
+    def test_executor_reports_rows_and_errors(self):
+        registry = ai.resources(warehouse=self.database())
+
+        ok = json.loads(
+            execute_tool_call("sql_query", {"resource": "warehouse", "sql": "SELECT id FROM sales ORDER BY id LIMIT 3"}, resources=registry)[
+                "output_text"
+            ]
+        )
+        failed = json.loads(
+            execute_tool_call("sql_query", {"resource": "warehouse", "sql": "SELECT * FROM secrets"}, resources=registry)["output_text"]
+        )
+
+        self.assertEqual(ok["status"], "ok")
+        self.assertEqual(ok["rows"], [{"id": 0}, {"id": 1}, {"id": 2}])
+        self.assertTrue(ok["result_resource"].startswith("sql_result_"))
+        self.assertEqual(failed["status"], "error")
+        self.assertIn("non-empty", execute_tool_call("sql_query", {"resource": "warehouse"}, resources=registry)["output_text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from streamlit_ai_elements.chat.runtime import stream_assistant_turn, stream_chat_turn
+from streamlit_ai_elements.chat.sse_client import SSEChatClient, SSEClientError
+from streamlit_ai_elements.chat.types import ChatBackendConfig, create_session_state
+
+
+def sse(*payloads, done=True, event_names=False):
+    lines = []
+    for payload in payloads:
+        if event_names and isinstance(payload, dict):
+            lines.append(f"event: {payload['type']}")
+        lines.append(f"data: {json.dumps(payload)}")
+        lines.append("")
+    if done:
+        lines += ["data: [DONE]", ""]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class FakeSSEHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.path, dict(self.headers), body))
+        status, stream = self.server.replies.pop(0)
+        self.send_response(status)
+        self.send_header("Content-Type", "text/event-stream" if status < 400 else "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        # Split the body across chunks, mid-line, as real servers do.
+        for start in range(0, len(stream), 7):
+            chunk = stream[start : start + 7]
+            self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+class SSEChatClientTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSSEHandler)
+        self.server.daemon_threads = True
+        self.server.connections = 0
+        self.server.requests = []
+        self.server.replies = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = SSEChatClient("sk-test", base_url=f"http://127.0.0.1:{self.server.server_port}/v1")
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_responses_stream_drives_a_chat_turn_with_plain_dicts(self):
+        self.server.replies.append(
+            (
+                200,
+                sse(
+                    {"type": "response.created", "response": {"id": "resp_1"}},
+                    {"type": "response.output_text.delta", "delta": "Hello"},
+                    {"type": "response.output_text.delta", "delta": " world"},
+                    {"type": "response.completed", "response": {"id": "resp_1"}},
+                    done=False,
+                    event_names=True,
+                ),
+            )
+        )
+
+        session = create_session_state()
+        events = list(stream_chat_turn(self.client, "Hi", state=session, config=ChatBackendConfig(model="test-model")))
+
+        path, headers, body = self.server.requests[0]
+        self.assertEqual(path, "/v1/responses")
+        self.assertEqual(headers["Authorization"], "Bearer sk-test")
+        self.assertEqual((body["model"], body["stream"]), ("test-model", True))
+        self.assertEqual("".join(event.get("delta", "") for event in events if event["type"] == "text_delta"), "Hello world")
+        self.assertEqual(str(session.messages[-1].content), "Hello world")
+
+    def test_chat_completions_tool_cycle_reuses_one_pooled_connection(self):
+        arguments = json.dumps({"js": "container.textContent = 'ok'"})
+        self.server.replies += [
+            (
+                200,
+                sse(
+                    {"choices": [{"delta": {"tool_calls": [{"index": 0, "id": "call_1", "function": {"name": "sandbox"}}]}}]},
+                    {"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"arguments": arguments}}]}}]},
+                    {"choices": [{"delta": {}, "finish_reason": "tool_calls"}]},
+                ),
+            ),
+            (200, sse({"choices": [{"delta": {"content": "Rendered."}}]}, {"choices": [{"delta": {}, "finish_reason": "stop"}]})),
+        ]
+
+        events = list(
+            stream_assistant_turn(
+                self.client,
+                state=create_session_state(),
+                config=ChatBackendConfig(model="test-model", backend="chat_completions"),
+            )
+        )
+
+        self.assertEqual([path for path, _, _ in self.server.requests], ["/v1/chat/completions"] * 2)
+        self.assertEqual(self.server.connections, 1)
+        completed = next(event for event in events if event["type"] == "tool_call_completed")
+        self.assertEqual(completed["arguments"], arguments)
+        self.assertEqual(events[-1]["type"], "message_completed")
+
+    def test_error_status_and_mid_stream_errors_raise(self):
+        self.server.replies += [
+            (401, json.dumps({"error": {"message": "Invalid API key"}}).encode()),
+            (200, sse({"choices": [{"delta": {"content": "Hi"}}]}, {"error": {"message": "Overloaded"}})),
+        ]
+
+        with self.assertRaises(SSEClientError) as rejected:
+            list(self.client.chat.completions.create(model="test-model", messages=[], stream=True))
+        with self.assertRaisesRegex(SSEClientError, "Overloaded"):
+            list(self.client.chat.completions.create(model="test-model", messages=[], stream=True))
+
+        self.assertEqual(rejected.exception.status, 401)
+        self.assertIn("Invalid API key", str(rejected.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
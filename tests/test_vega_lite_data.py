@@ -0,0 +1,205 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import streamlit_ai_elements as ai
+from streamlit_ai_elements.vega_lite_data import prepare_vega_lite_data
+
+
+def make_frame(rows=20_000):
+    rng = np.random.default_rng(3)
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("2024-01-01", periods=rows, freq="h"),
+            "region": np.array(["north", "south", "east"])[np.arange(rows) % 3],
+            "amount": rng.normal(size=rows),
+            "units": rng.integers(0, 50, size=rows),
+        }
+    )
+
+
+def prepare(spec, frame, **kwargs):
+    registry = ai.resources(sales=ai.resource.dataframe(frame))
+    return prepare_vega_lite_data(spec, registry, data_resource="sales", **kwargs)
+
+
+class PreAggregationTests(unittest.TestCase):
+    def test_time_unit_and_mean_are_computed_over_every_row(self):
+        frame = make_frame()
+        spec = {
+            "mark": "line",
+            "encoding": {
+                "x": {"field": "time", "timeUnit": "yearmonth", "type": "temporal"},
+                "y": {"field": "amount", "aggregate": "mean", "type": "quantitative"},
+                "color": {"field": "region", "type": "nominal"},
+            },
+        }
+
+        prepared = prepare(spec, frame)
+
+        self.assertEqual(prepared["encoding"], spec["encoding"])
+        values = {(row["time"], row["region"]): row["amount"] for row in prepared["data"]["values"]}
+        expected = frame.groupby([frame["time"].dt.to_period("M"), "region"])["amount"].mean()
+        self.assertEqual(len(values), len(expected))
+        for (month, region), mean in expected.items():
+            self.assertAlmostEqual(values[(f"{month.start_time:%Y-%m-%d}T00:00:00.000", region)], mean)
+        self.assertNotIn("data", spec)
+
+    def test_non_identity_ops_get_their_own_columns_and_titles(self):
+        spec = {
+            "mark": "bar",
+            "encoding": {
+                "x": {"field": "region", "type": "nominal"},
+                "y": {"aggregate": "count", "type": "quantitative"},
+                "tooltip": [{"field": "units", "aggregate": "max"}, {"field": "units", "aggregate": "distinct"}],
+            },
+        }
+
+        prepared = prepare(spec, make_frame(rows=30))
+
+        encoding = prepared["encoding"]
+        self.assertEqual(encoding["y"], {"field": "__count", "aggregate": "sum", "type": "quantitative", "title": "Count of Records"})
+        self.assertEqual(encoding["tooltip"][0], {"field": "units", "aggregate": "max"})
+        self.assertEqual(encoding["tooltip"][1]["field"], "distinct_units")
+        self.assertEqual(encoding["tooltip"][1]["title"], "Distinct of units")
+        self.assertEqual(sorted(row["__count"] for row in prepared["data"]["values"]), [10, 10, 10])
+
+    def test_bins_follow_vega_and_are_sent_prebinned(self):
+        frame = pd.DataFrame({"score": np.linspace(0, 100, 501)})
+        spec = {
+            "mark": "bar",
+            "encoding": {
+                "x": {"field": "score", "bin": True, "type": "quantitative"},
+                "y": {"aggregate": "count", "type": "quantitative"},
+            },
+        }
+
+        prepared = prepare(spec, frame)
+
+        self.assertEqual(prepared["encoding"]["x"]["bin"], {"binned": True, "step": 10})
+        self.assertEqual(prepared["encoding"]["x2"], {"field": "bin_score_end"})
+        rows = sorted(prepared["data"]["values"], key=lambda row: row["bin_score"])
+        self.assertEqual([row["bin_score"] for row in rows], [float(start) for start in range(0, 100, 10)])
+        self.assertEqual(rows[-1]["__count"], 51)
+        self.assertEqual(sum(row["__count"] for row in rows), 501)
+
+    def test_supported_transforms_are_evaluated_and_others_fall_back(self):
+        frame = make_frame(rows=24 * 90)
+        spec = {
+            "mark": "bar",
+            "transform": [
+                {"timeUnit": "month", "field": "time", "as": "month"},
+                {"aggregate": [{"op": "sum", "field": "units", "as": "total"}], "groupby": ["month"]},
+            ],
+            "encoding": {
+                "x": {"field": "month", "timeUnit": "month", "type": "ordinal"},
+                "y": {"field": "total", "type": "quantitative"},
+            },
+        }
+
+        prepared = prepare(spec, frame)
+
+        self.assertNotIn("transform", prepared)
+        months = {row["month"]: row["total"] for row in prepared["data"]["values"]}
+        self.assertEqual(list(months), ["2012-01-01T00:00:00.000", "2012-02-01T00:00:00.000", "2012-03-01T00:00:00.000"])
+        self.assertEqual(sum(months.values()), int(frame["units"].sum()))
+
+        filtered = dict(spec, transform=[{"filter": "datum.units > 3"}])
+        self.assertIsNone(prepare(filtered, frame))
+        self.assertIsNone(prepare(dict(spec, layer=[]), frame))
+
+    def test_specs_without_anything_to_reduce_are_left_alone(self):
+        spec = {"mark": "line", "encoding": {"x": {"field": "time", "type": "temporal"}, "y": {"field": "amount", "type": "quantitative"}}}
+        frame = make_frame(rows=100)
+
+        self.assertIsNone(prepare(spec, frame))
+        registry = ai.resources(sales=ai.resource.dataframe(frame, frontend_access="summary"))
+        aggregated = {"mark": "bar", "encoding": {"y": {"aggregate": "count"}}}
+        self.assertIsNone(prepare_vega_lite_data(aggregated, registry, data_resource="sales"))
+
+    def test_aggregating_by_an_id_like_field_is_held_to_max_points(self):
+        frame = make_frame()
+        frame["order_id"] = np.arange(len(frame))
+        line = {
+            "mark": "line",
+            "encoding": {
+                "x": {"field": "order_id", "type": "quantitative"},
+                "y": {"field": "amount", "aggregate": "mean", "type": "quantitative"},
+            },
+        }
+        bar = {
+            "mark": "bar",
+            "encoding": {
+                "x": {"field": "order_id", "type": "nominal"},
+                "y": {"aggregate": "count", "type": "quantitative"},
+            },
+        }
+
+        line_values = prepare(line, frame, max_points=500)["data"]["values"]
+        bar_values = prepare(bar, frame, max_points=500, downsample=None)["data"]["values"]
+
+        self.assertLessEqual(len(line_values), 500)
+        self.assertEqual([line_values[0]["order_id"], line_values[-1]["order_id"]], [0, len(frame) - 1])
+        self.assertEqual(len(bar_values), 500)
+        self.assertEqual({row["__count"] for row in bar_values}, {1})
+
+
+class DownsamplingTests(unittest.TestCase):
+    spec = {
+        "mark": "line",
+        "encoding": {
+            "x": {"field": "time", "type": "temporal"},
+            "y": {"field": "amount", "type": "quantitative"},
+            "color": {"field": "region", "type": "nominal"},
+        },
+    }
+
+    def test_lttb_keeps_each_series_endpoints_within_the_budget(self):
+        frame = make_frame()
+
+        prepared = prepare(self.spec, frame, max_points=600)
+
+        values = prepared["data"]["values"]
+        self.assertLessEqual(len(values), 600)
+        self.assertGreater(len(values), 500)
+        for region, group in frame.groupby("region"):
+            times = [row["time"] for row in values if row["region"] == region]
+            self.assertEqual(times, sorted(times))
+            self.assertEqual(times[0], f"{group['time'].iloc[0]:%Y-%m-%dT%H:%M:%S}.000")
+            self.assertEqual(times[-1], f"{group['time'].iloc[-1]:%Y-%m-%dT%H:%M:%S}.000")
+
+    def test_minmax_keeps_the_extremes(self):
+        frame = make_frame()
+
+        prepared = prepare(self.spec, frame, downsample="minmax", max_points=300)
+
+        amounts = [row["amount"] for row in prepared["data"]["values"]]
+        self.assertLessEqual(len(amounts), 300)
+        self.assertEqual(max(amounts), frame["amount"].max())
+        self.assertEqual(min(amounts), frame["amount"].min())
+
+    def test_downsampling_can_be_disabled(self):
+        self.assertIsNone(prepare(self.spec, make_frame(), downsample=None))
+        with self.assertRaises(ValueError):
+            prepare(self.spec, make_frame(rows=10), downsample="average")
+
+
+class VegaLiteRenderTests(unittest.TestCase):
+    def test_vega_lite_sends_aggregated_rows_and_falls_back_to_resource_rows(self):
+        registry = ai.resources(sales=ai.resource.dataframe(make_frame(rows=5000)))
+        aggregated = {"mark": "bar", "encoding": {"x": {"field": "region"}, "y": {"field": "units", "aggregate": "sum"}}}
+        filtered = dict(aggregated, transform=[{"filter": "datum.units > 3"}])
+
+        with patch("streamlit_ai_elements.st.vega_lite_chart") as chart:
+            ai.vega_lite(aggregated, data_resource="sales", resources=registry)
+            ai.vega_lite(filtered, data_resource="sales", resources=registry)
+            ai.vega_lite(aggregated, data_resource="sales", resources=registry, preaggregate=False)
+
+        sizes = [len(call.kwargs["spec"]["data"]["values"]) for call in chart.call_args_list]
+        self.assertEqual(sizes, [3, 1000, 1000])
+
+
+if __name__ == "__main__":
+    unittest.main()